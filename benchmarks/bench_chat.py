@@ -0,0 +1,148 @@
+"""Exercise the chatbot backend against a local mock Inference API endpoint (no network)
+
+The mock streams server-sent-event tokens with a configurable first-token
+and per-token latency and counts TCP connections. Compares a one-off
+requests.post per question (the old code path) with the pooled, streaming,
+cached ChatBackend.
+
+Usage: python benchmarks/bench_chat.py [--questions 10] [--first-token 0.3] [--token-delay 0.01]
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chatbot import ChatBackend  # noqa: E402
+
+ANSWER = "P/E is the share price divided by earnings per share; lower can mean cheaper."
+
+
+class MockEndpoint(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, first_token, token_delay):
+        super().__init__(("127.0.0.1", 0), MockHandler)
+        self.first_token = first_token
+        self.token_delay = token_delay
+        self.connections = 0
+        self.requests = 0
+        self.prompt_bytes = 0
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/models/mock"
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, so pooled clients reuse the socket
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.requests += 1
+        self.server.prompt_bytes += len(body)
+        payload = json.loads(body)
+        time.sleep(self.server.first_token)
+        tokens = [w + " " for w in ANSWER.split()]
+        if payload.get("stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for token in tokens:
+                event = f"data: {json.dumps({'token': {'text': token, 'special': False}})}\n\n".encode()
+                self.wfile.write(f"{len(event):x}\r\n".encode() + event + b"\r\n")
+                self.wfile.flush()
+                time.sleep(self.server.token_delay)
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            time.sleep(self.server.token_delay * len(tokens))
+            data = json.dumps([{"generated_text": ANSWER}]).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+
+def conversation(n):
+    """n distinct questions, then the first one again (an FAQ repeat)"""
+    questions = [f"What does metric number {i} mean?" for i in range(n)]
+    return questions + questions[:1]
+
+
+def run_oneoff(url, questions):
+    """Old code path: new connection, full history, blocking until the whole reply arrives"""
+    history, first, blocked = [], [], 0.0
+    for q in questions:
+        history.append({"role": "user", "content": q})
+        payload = {"inputs": {"past_user_inputs": [m["content"] for m in history if m["role"] == "user"],
+                              "generated_responses": [m["content"] for m in history if m["role"] == "assistant"],
+                              "text": q}}
+        start = time.perf_counter()
+        r = requests.post(url, json=payload, timeout=30, headers={"Connection": "close"})
+        elapsed = time.perf_counter() - start
+        first.append(elapsed)
+        blocked += elapsed
+        history.append({"role": "assistant", "content": r.json()[0]["generated_text"]})
+    return first, blocked
+
+
+def run_backend(url, questions):
+    backend = ChatBackend(url=url)
+    history, first, blocked = [], [], 0.0
+    for q in questions:
+        history.append({"role": "user", "content": q})
+        start = time.perf_counter()
+        job = backend.submit(history)
+        blocked += time.perf_counter() - start      # what the Streamlit rerun waits for
+        while job.first_token_at is None and not job.done:
+            time.sleep(0.001)
+        first.append((job.first_token_at or time.time()) - job.started_at)
+        job.wait()
+        history.append({"role": "assistant", "content": job.reply})
+    return first, blocked, backend.cache
+
+
+def report(name, server, first, blocked):
+    print(f"{name:<10} connections {server.connections:3d}   prompt bytes {server.prompt_bytes:7d}   "
+          f"first token median {sorted(first)[len(first) // 2] * 1e3:7.1f} ms   "
+          f"repeat {first[-1] * 1e3:7.1f} ms   UI blocked {blocked * 1e3:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--first-token", type=float, default=0.3, help="seconds before the first token")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="seconds between tokens")
+    args = parser.parse_args()
+    questions = conversation(args.questions)
+
+    for name in ("one-off", "backend"):
+        server = MockEndpoint(args.first_token, args.token_delay)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        if name == "one-off":
+            first, blocked = run_oneoff(server.url, questions)
+        else:
+            first, blocked, cache = run_backend(server.url, questions)
+        server.shutdown()
+        report(name, server, first, blocked)
+    print(f"backend FAQ cache: {cache.hits} hits / {cache.misses} misses")
+    assert cache.hits == 1, "the repeated question should be served from the cache"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Measure fetch_many throughput against a local fake data provider (no network)
+
+Usage: python benchmarks/bench_fetch.py --tickers 503 --latency 0.05 --workers 1 8 16 32
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fetch_engine import fetch_many  # noqa: E402
+
+
+class FakeProvider:
+    """Stand-in for fetch_stock_data with configurable latency, failures and hangs"""
+
+    def __init__(self, latency=0.05, jitter=0.02, fail_rate=0.0, hang_rate=0.0, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.fail_rate = fail_rate
+        self.hang_rate = hang_rate
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def __call__(self, ticker):
+        with self._lock:
+            self.calls += 1
+            roll = self._rng.random()
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+        if roll < self.hang_rate:
+            time.sleep(delay * 50)
+        else:
+            time.sleep(delay)
+        if roll < self.hang_rate + self.fail_rate:
+            raise RuntimeError(f"simulated upstream error for {ticker}")
+        return {'Ticker': ticker, 'Current_Price': 100.0, 'PE_Ratio': 15.0}
+
+
+def run(n_tickers, workers, provider, timeout, retries, backoff):
+    tickers = [f"T{i:05d}" for i in range(n_tickers)]
+    start = time.perf_counter()
+    ok = 0
+    for _, data in fetch_many(tickers, provider, workers=workers, timeout=timeout,
+                              retries=retries, backoff=backoff):
+        if data:
+            ok += 1
+    elapsed = time.perf_counter() - start
+    return ok, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickers", type=int, default=503)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8, 16, 32, 64])
+    parser.add_argument("--latency", type=float, default=0.05, help="mean seconds per fake request")
+    parser.add_argument("--fail-rate", type=float, default=0.02)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=1.0)
+    parser.add_argument("--retries", type=int, default=2)
+    parser.add_argument("--backoff", type=float, default=0.01)
+    args = parser.parse_args()
+
+    print(f"{'workers':>8} {'rows':>6} {'calls':>6} {'seconds':>8} {'rows/s':>8}")
+    for workers in args.workers:
+        provider = FakeProvider(args.latency, fail_rate=args.fail_rate, hang_rate=args.hang_rate)
+        ok, elapsed = run(args.tickers, workers, provider, args.timeout, args.retries, args.backoff)
+        print(f"{workers:>8} {ok:>6} {provider.calls:>6} {elapsed:>8.2f} {ok / elapsed:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
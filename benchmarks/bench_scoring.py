@@ -0,0 +1,84 @@
+"""Compare row-wise calculate_valuation_score against the vectorized score_valuation_frame
+
+Checks that both produce identical scores on synthetic fundamentals (with
+missing and non-positive values mixed in), then times each.
+
+Usage: python benchmarks/bench_scoring.py --rows 500 10000 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scoring import VALUATION_METRICS, calculate_valuation_score, score_valuation_frame  # noqa: E402
+
+
+def synthetic_fundamentals(n, seed=0, missing=0.15):
+    """Random fundamentals in realistic ranges, with NaNs and negatives sprinkled in"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'Ticker': [f"T{i:06d}" for i in range(n)],
+        'PE_Ratio': rng.lognormal(3.0, 0.6, n) * rng.choice([1, -1], n, p=[0.9, 0.1]),
+        'PB_Ratio': rng.lognormal(1.0, 0.8, n),
+        'PS_Ratio': rng.lognormal(1.0, 0.9, n),
+        'ROE': rng.normal(15, 15, n),
+        'Profit_Margin': rng.normal(10, 12, n),
+        'Dividend_Yield': np.where(rng.random(n) < 0.4, 0.0, rng.gamma(2.0, 1.2, n)),
+    })
+    for col in VALUATION_METRICS:
+        df.loc[rng.random(n) < missing, col] = np.nan
+    return df
+
+
+def check_equivalence(df):
+    expected = df.apply(calculate_valuation_score, axis=1).to_numpy(dtype=float)
+    actual = score_valuation_frame(df).to_numpy()
+    if not np.array_equal(expected, actual):
+        worst = np.nanmax(np.abs(expected - actual))
+        raise AssertionError(f"vectorized scores differ from calculate_valuation_score (max abs diff {worst})")
+    # Edge cases: every metric missing, every metric non-positive, a single metric present
+    edge = pd.DataFrame([
+        dict.fromkeys(VALUATION_METRICS, np.nan),
+        dict.fromkeys(VALUATION_METRICS, 0.0),
+        dict(dict.fromkeys(VALUATION_METRICS, -1.0), ROE=12.0),
+        dict(dict.fromkeys(VALUATION_METRICS, np.nan), Dividend_Yield=8.0),
+    ])
+    expected = edge.apply(calculate_valuation_score, axis=1).to_numpy(dtype=float)
+    assert np.array_equal(expected, score_valuation_frame(edge).to_numpy()), "edge cases differ"
+    # Custom weights: doubling every weight must not change the renormalized score
+    doubled = [2 * w for w in (0.25, 0.20, 0.15, 0.20, 0.10, 0.10)]
+    assert np.allclose(score_valuation_frame(df, doubled), score_valuation_frame(df)), "weight scaling changed scores"
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[500, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'apply (ms)':>11} {'vector (ms)':>12} {'speedup':>8}")
+    for n in args.rows:
+        df = synthetic_fundamentals(n)
+        check_equivalence(df)
+        slow = best_of(lambda: df.apply(calculate_valuation_score, axis=1), args.repeat)
+        fast = best_of(lambda: score_valuation_frame(df), args.repeat)
+        print(f"{n:>8} {slow * 1e3:>11.1f} {fast * 1e3:>12.2f} {slow / fast:>7.0f}x")
+    print("equivalence: OK")
+
+
+if __name__ == "__main__":
+    main()
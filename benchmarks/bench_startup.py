@@ -0,0 +1,73 @@
+"""Measure Streamlit cold-start and rerun latency of the app script (no network)
+
+Each measurement runs in a fresh interpreter using streamlit.testing's
+AppTest, so the cold run includes importing everything the script needs.
+Reruns reuse the loaded modules, as a live server does.
+
+Usage: python benchmarks/bench_startup.py [--app stock_analysis_app.py] [--reruns 10]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ('matplotlib', 'yfinance', 'requests', 'lxml')
+
+_CHILD = r"""
+import json, sys, time
+sys.path.insert(0, {root!r})
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=120)
+start = time.perf_counter()
+at.run()
+cold = time.perf_counter() - start
+loaded = [m for m in {heavy!r} if m in sys.modules]
+modes = at.sidebar.radio[0].options if at.sidebar.radio else []
+reruns = {{}}
+for mode in modes or [None]:
+    if mode is not None:
+        at.sidebar.radio[0].set_value(mode).run()
+    times = []
+    for _ in range({reruns}):
+        start = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - start)
+    reruns[mode or 'default'] = times
+print(json.dumps({{'cold': cold, 'loaded': loaded, 'reruns': reruns,
+                  'exception': [str(e.value) for e in at.exception]}}))
+"""
+
+
+def measure(app, reruns):
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, SCAN_SCHEDULE_INTERVAL="0",
+                   FUNDAMENTALS_CACHE_PATH=os.path.join(tmp, "fundamentals.sqlite"),
+                   HISTORY_PANEL_PATH=os.path.join(tmp, "panel.npz"),
+                   SNAPSHOT_DIR=os.path.join(tmp, "snapshots"), SCAN_STORE_DIR=os.path.join(tmp, "scans"),
+                   FRAMEWORK_INDEX_PATH=os.path.join(tmp, "framework_index.npz"))
+        code = _CHILD.format(root=ROOT, app=os.path.abspath(app), heavy=HEAVY_MODULES, reruns=reruns)
+        out = subprocess.run([sys.executable, "-c", code], env=env, cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default=os.path.join(ROOT, "stock_analysis_app.py"))
+    parser.add_argument("--reruns", type=int, default=10)
+    args = parser.parse_args()
+
+    result = measure(args.app, args.reruns)
+    if result['exception']:
+        print(f"script raised: {result['exception']}")
+    print(f"cold start: {result['cold'] * 1e3:8.1f} ms   heavy modules loaded: {', '.join(result['loaded']) or 'none'}")
+    for mode, times in result['reruns'].items():
+        print(f"rerun [{mode}]: median {statistics.median(times) * 1e3:7.1f} ms   min {min(times) * 1e3:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""Stage-by-stage benchmark of the scan pipeline at several universe sizes (no network)
+
+Each scenario runs against a synthetic data provider (or a recording via
+--replay) and measures, separately: constituent loading (cold and from the
+local copy), fetch_stock_data throughput through fetch_universe at each
+--workers level, valuation and framework scoring, sort/top-N ranking, the
+Styler.background_gradient table, CSV export and chart rendering. Every
+stage reports its best wall time over --repeat runs and its peak traced
+memory, and is compared with the stored baseline; a stage slower than
+the baseline by more than --tolerance is flagged and the exit code is 1.
+
+Usage:
+    python benchmarks/bench_suite.py                          # 500, 5k, 50k vs baseline.json
+    python benchmarks/bench_suite.py --sizes 500 --workers 8 32
+    python benchmarks/bench_suite.py --replay rec/ --latency 20
+    python benchmarks/bench_suite.py --save-baseline          # accept the current numbers
+"""
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Keep every cache the pipeline touches out of the repository's .cache
+_TMP = tempfile.mkdtemp(prefix="bench_suite_")
+os.environ.update(FUNDAMENTALS_CACHE_PATH=os.path.join(_TMP, "fundamentals.sqlite"),
+                  HISTORY_PANEL_PATH=os.path.join(_TMP, "panel.npz"),
+                  CONSTITUENTS_DIR=os.path.join(_TMP, "constituents"))
+
+import charts  # noqa: E402
+import pipeline  # noqa: E402
+from constituents import load_constituents  # noqa: E402
+from providers import DataProvider, ReplayProvider, set_provider  # noqa: E402
+from scoring import framework_scores, score_valuation_frame  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DISPLAY_COLS = ['Ticker', 'Name', 'Sector', 'Current_Price', 'PE_Ratio', 'PB_Ratio', 'ROE', 'Profit_Margin',
+                'Dividend_Yield', 'Valuation_Score', 'Framework_Score']
+MIN_DELTA = 0.005   # seconds; smaller differences are never reported as regressions
+
+
+class SyntheticProvider(DataProvider):
+    """Deterministic fundamentals and prices for ``n`` made-up tickers, with optional latency"""
+
+    label = "synthetic"
+
+    def __init__(self, n, latency=0.0, jitter=0.0, seed=0):
+        rng = np.random.default_rng(seed)
+        self.tickers = [f"S{i:06d}" for i in range(n)]
+        self.latency = latency
+        self.jitter = jitter
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        sign = rng.choice([1, -1], n, p=[0.9, 0.1])
+        columns = {
+            'currentPrice': rng.lognormal(4, 0.8, n), 'trailingPE': rng.lognormal(3.0, 0.6, n) * sign,
+            'priceToBook': rng.lognormal(1.0, 0.8, n), 'priceToSalesTrailing12Months': rng.lognormal(1.0, 0.9, n),
+            'dividendYield': np.where(rng.random(n) < 0.4, 0.0, rng.gamma(2.0, 0.012, n)),
+            'returnOnEquity': rng.normal(0.15, 0.15, n), 'profitMargins': rng.normal(0.10, 0.12, n),
+            'grossMargins': rng.uniform(0.1, 0.7, n), 'operatingMargins': rng.normal(0.15, 0.1, n),
+            'revenueGrowth': rng.normal(0.08, 0.12, n), 'trailingEps': rng.lognormal(1, 0.7, n),
+            'beta': rng.uniform(0.4, 2.2, n), 'marketCap': rng.lognormal(23, 1.5, n),
+            'freeCashflow': rng.lognormal(20, 1.5, n), 'sharesOutstanding': rng.lognormal(19, 1, n),
+            'totalCash': rng.lognormal(20, 1, n), 'totalDebt': rng.lognormal(20.5, 1, n),
+            'dividendRate': rng.gamma(1.5, 1.0, n),
+        }
+        sectors = rng.choice(['Technology', 'Energy', 'Industrials', 'Health Care', 'Financials'], n)
+        self._info = {
+            t: {'longName': f"Synthetic {t}", 'sector': sectors[i], **{k: float(v[i]) for k, v in columns.items()}}
+            for i, t in enumerate(self.tickers)
+        }
+
+    def _delay(self):
+        if self.latency or self.jitter:
+            with self._lock:
+                delay = self.latency + self._rng.uniform(0, self.jitter)
+            time.sleep(delay)
+
+    def info(self, ticker):
+        self._delay()
+        return dict(self._info[ticker])
+
+    def download(self, tickers, period="2y", start=None, **kwargs):
+        self._delay()
+        tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        index = pd.bdate_range(end="2026-01-02", periods=2520)
+        if start is not None:
+            index = index[index >= pd.Timestamp(start)]
+        rng = np.random.default_rng(len(tickers))
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (len(index), len(tickers))), axis=0))
+        return pd.concat({'Close': pd.DataFrame(close, index=index, columns=tickers)}, axis=1)
+
+    def constituents(self, universe):
+        return pd.DataFrame({'Ticker': self.tickers, 'Name': [self._info[t]['longName'] for t in self.tickers],
+                             'Sector': [self._info[t]['sector'] for t in self.tickers], 'Sub_Industry': 'N/A'})
+
+
+class ReplayUniverse(ReplayProvider):
+    """ReplayProvider whose universe is the first ``n`` recorded tickers, cycled to reach ``n``"""
+
+    def __init__(self, directory, n, latency=0.0, jitter=0.0):
+        super().__init__(directory, latency, jitter, seed=0)
+        recorded = sorted(name[:-len(".json.gz")] for name in os.listdir(os.path.join(directory, "info")))
+        if not recorded:
+            raise SystemExit(f"no recorded info under {directory}")
+        self.tickers = [recorded[i % len(recorded)] for i in range(n)]
+
+    def constituents(self, universe):
+        return pd.DataFrame({'Ticker': self.tickers, 'Name': 'N/A', 'Sector': 'N/A', 'Sub_Industry': 'N/A'})
+
+
+def measure(fn, repeat):
+    """(best seconds over ``repeat`` untraced runs, peak traced MB of one more run, last result)"""
+    tracemalloc.start()
+    try:
+        result = fn()
+        peak = tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, peak, result
+
+
+def fetch_stage(tickers, workers):
+    """fetch_universe; non-live providers bypass the fundamentals cache, so every ticker hits the provider"""
+    def run():
+        return pipeline.fetch_universe(tickers, workers=workers, retry_passes=0)
+    return run
+
+
+def charts_stage(top, history):
+    def run():
+        charts._cache = charts.ChartCache()   # render every time, never serve from the cache
+        charts.bar_chart_png(top['Ticker'], top['Valuation_Score'], 'Valuation Score', 'Top 10')
+        return charts.price_history_png('BENCH', history, '10y', 'Price history')
+    return run
+
+
+def run_scenario(provider, n, args):
+    """{stage: {'seconds', 'peak_mb', ...}} for one universe size"""
+    set_provider(provider)
+    results = {}
+
+    def record(stage, fn, repeat=args.repeat, **extra):
+        seconds, peak, result = measure(fn, repeat)
+        results[stage] = {'seconds': seconds, 'peak_mb': peak, **extra}
+        return result
+
+    store = os.path.join(_TMP, f"constituents_{n}")
+    record('constituents.cold', lambda: load_constituents('sp500', store_dir=tempfile.mkdtemp(dir=_TMP)), 1)
+    load_constituents('sp500', store_dir=store)
+    tickers = record('constituents.warm', lambda: load_constituents('sp500', store_dir=store))['Ticker'].tolist()
+
+    df = None
+    for workers in args.workers:
+        df = record(f'fetch.w{workers}', fetch_stage(tickers, workers), 1)
+        results[f'fetch.w{workers}']['rows_per_s'] = len(df) / results[f'fetch.w{workers}']['seconds']
+
+    weights = pipeline.weights
+    df['Valuation_Score'] = record('score.valuation', lambda: score_valuation_frame(df))
+    df['Framework_Score'] = record('score.framework', lambda: framework_scores(df, weights))['Framework_Score']
+    record('rank.sort', lambda: df[df['Valuation_Score'] > 0].sort_values('Valuation_Score', ascending=False).head(10))
+    top = record('rank.nlargest', lambda: df.nlargest(10, 'Valuation_Score'))
+    shown = df.nlargest(args.style_rows, 'Valuation_Score')[DISPLAY_COLS]
+    record('display.gradient', lambda: shown.style.format(precision=2)
+           .background_gradient(subset=['Valuation_Score'], cmap='RdYlGn').to_html())
+    record('export.csv', lambda: df.to_csv(io.StringIO(), index=False))
+    history = provider.download(tickers[:1]).xs(tickers[0], axis=1, level=1) \
+        if isinstance(provider, SyntheticProvider) else pipeline.load_history(tickers[0], '2y')
+    record('chart.render', charts_stage(top, history))
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Print every stage next to its baseline; returns the regressed (size, stage) pairs"""
+    regressions = []
+    print(f"{'size':>7} {'stage':<20} {'ms':>10} {'base ms':>10} {'ratio':>6} {'peak MB':>9} {'':>6}")
+    for size, stages in results.items():
+        for stage, m in stages.items():
+            base = baseline.get(size, {}).get(stage)
+            ratio = m['seconds'] / base['seconds'] if base and base['seconds'] else np.nan
+            slow = base is not None and m['seconds'] > base['seconds'] * (1 + tolerance) \
+                and m['seconds'] - base['seconds'] > MIN_DELTA
+            if slow:
+                regressions.append((size, stage))
+            extra = f"  {m['rows_per_s']:.0f} rows/s" if 'rows_per_s' in m else ""
+            print(f"{size:>7} {stage:<20} {m['seconds'] * 1e3:>10.1f} "
+                  f"{base['seconds'] * 1e3 if base else np.nan:>10.1f} {ratio:>6.2f} {m['peak_mb']:>9.1f} "
+                  f"{'SLOWER' if slow else '':>6}{extra}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter,
+                                     epilog="\n".join(__doc__.splitlines()[2:]))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 5_000, 50_000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[8, 32], help="fetch concurrency levels")
+    parser.add_argument("--latency", type=float, default=2.0, help="synthetic provider latency per call (ms)")
+    parser.add_argument("--jitter", type=float, default=2.0, help="extra uniform latency per call (ms)")
+    parser.add_argument("--replay", metavar="DIR", help="use recorded fundamentals instead of synthetic ones")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per in-memory stage (best is kept)")
+    parser.add_argument("--style-rows", type=int, default=500, help="rows in the background_gradient table")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    results = {}
+    for n in args.sizes:
+        if args.replay:
+            provider = ReplayUniverse(args.replay, n, args.latency / 1000, args.jitter / 1000)
+        else:
+            provider = SyntheticProvider(n, args.latency / 1000, args.jitter / 1000)
+        print(f"running {n} tickers ({provider.label})...", file=sys.stderr)
+        results[str(n)] = run_scenario(provider, n, args)
+
+    try:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        baseline = {}
+    regressions = compare(results, baseline, args.tolerance)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({**baseline, **results}, f, indent=2, sort_keys=True)
+        print(f"baseline saved to {args.baseline}", file=sys.stderr)
+        return 0
+    if regressions:
+        print(f"{len(regressions)} stages slower than baseline by more than {args.tolerance:.0%}: "
+              + ", ".join(f"{stage}@{size}" for size, stage in regressions), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
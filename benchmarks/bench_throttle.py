@@ -0,0 +1,97 @@
+"""Compare unthrottled vs throttled fetching against a fake rate-limited upstream (no network)
+
+The fake upstream accepts at most --capacity requests per second and
+answers the rest with a 429 error. The unthrottled run is the plain
+fetch_many retry loop; the throttled run is pipeline.fetch_universe with
+the adaptive limiter, circuit breaker and retry queue.
+
+Usage: python benchmarks/bench_throttle.py --tickers 500 --capacity 20 --workers 32
+"""
+import argparse
+import collections
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pipeline  # noqa: E402
+from fetch_engine import fetch_many  # noqa: E402
+from throttle import AdaptiveRateLimiter, CircuitBreaker, Throttle  # noqa: E402
+
+
+class RateLimitedUpstream:
+    """Accepts ``capacity`` requests per sliding second, rejects the rest with a 429"""
+
+    def __init__(self, capacity, latency):
+        self.capacity = capacity
+        self.latency = latency
+        self.accepted = 0
+        self.rejected = 0
+        self._window = collections.deque()
+        self._lock = threading.Lock()
+
+    def __call__(self, ticker):
+        with self._lock:
+            now = time.monotonic()
+            while self._window and now - self._window[0] > 1.0:
+                self._window.popleft()
+            if len(self._window) >= self.capacity:
+                self.rejected += 1
+                raise RuntimeError("429 Client Error: Too Many Requests")
+            self._window.append(now)
+            self.accepted += 1
+        time.sleep(self.latency)
+        return {'Ticker': ticker, 'Current_Price': 100.0, 'PE_Ratio': 15.0}
+
+
+def quiet(fn):
+    """fetch_stock_data semantics: any error becomes None"""
+    def fetch(ticker):
+        try:
+            return fn(ticker)
+        except Exception:
+            return None
+    return fetch
+
+
+def run_unthrottled(tickers, upstream, workers):
+    start = time.perf_counter()
+    ok = sum(1 for _, data in fetch_many(tickers, quiet(upstream), workers=workers) if data)
+    return ok, time.perf_counter() - start, {}
+
+
+def run_throttled(tickers, upstream, workers, cooldown):
+    throttle = Throttle(AdaptiveRateLimiter(), CircuitBreaker(cooldown=cooldown))
+    pipeline._throttle = throttle
+    pipeline.fetch_stock_data = quiet(throttle.wrap(upstream))
+    start = time.perf_counter()
+    df = pipeline.fetch_universe(tickers, workers=workers)
+    return len(df), time.perf_counter() - start, throttle.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--capacity", type=int, default=20, help="upstream requests per second")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--cooldown", type=float, default=2.0, help="circuit breaker cooldown (seconds)")
+    args = parser.parse_args()
+    tickers = [f"T{i:05d}" for i in range(args.tickers)]
+
+    print(f"{'mode':<12} {'rows':>6} {'dropped':>8} {'429s':>6} {'seconds':>8} {'rows/s':>7}")
+    for name in ("unthrottled", "throttled"):
+        upstream = RateLimitedUpstream(args.capacity, args.latency)
+        if name == "unthrottled":
+            ok, elapsed, stats = run_unthrottled(tickers, upstream, args.workers)
+        else:
+            ok, elapsed, stats = run_throttled(tickers, upstream, args.workers, args.cooldown)
+        print(f"{name:<12} {ok:>6} {len(tickers) - ok:>8} {upstream.rejected:>6} {elapsed:>8.1f} {ok / elapsed:>7.1f}")
+    print("throttle stats: " + ", ".join(f"{k}={v:.1f}" if isinstance(v, float) else f"{k}={v}"
+                                         for k, v in stats.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Measure what-if re-ranking latency of WeightTuner against rescoring the frame from scratch
+
+Times one slider change (scores + top 10 + histogram) at each size; that
+the tuner's scores match score_valuation_frame and framework_scores is
+checked in tests/test_scoring.py.
+
+Usage: python benchmarks/bench_tuning.py --rows 500 5000 50000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_scoring import synthetic_fundamentals  # noqa: E402
+from pipeline import weights as FRAMEWORK_WEIGHTS  # noqa: E402
+from scoring import (FRAMEWORK_FACTORS, VALUATION_METRICS, WeightTuner, framework_scores,  # noqa: E402
+                     score_valuation_frame, top_positions)
+
+
+def with_framework_columns(df, seed=0):
+    rng = np.random.default_rng(seed)
+    n = len(df)
+    return df.assign(Gross_Margin=rng.uniform(10, 70, n), Operating_Margin=rng.normal(15, 10, n),
+                     Revenue_Growth=rng.normal(8, 12, n), Beta=rng.uniform(0.4, 2.2, n),
+                     Sector=rng.choice(['Tech', 'Energy', 'Industrials'], n))
+
+
+def one_change(tuner, kind, w):
+    scores = tuner.scores(kind, w)
+    top_positions(scores, 10)
+    np.histogram(scores[scores > 0], bins=40, range=(0, 100))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[500, 5_000, 50_000])
+    parser.add_argument("--changes", type=int, default=50, help="slider changes timed per size")
+    args = parser.parse_args()
+    rng = np.random.default_rng(1)
+
+    print(f"{'rows':>8} {'build (ms)':>11} {'valuation p50/max (ms)':>23} {'framework p50/max (ms)':>23} "
+          f"{'rescore (ms)':>13}")
+    for n in args.rows:
+        df = with_framework_columns(synthetic_fundamentals(n))
+        start = time.perf_counter()
+        tuner = WeightTuner(df, FRAMEWORK_WEIGHTS)
+        build = time.perf_counter() - start
+        timings = {}
+        for kind, names in (('Valuation_Score', VALUATION_METRICS), ('Framework_Score', FRAMEWORK_FACTORS)):
+            times = []
+            for _ in range(args.changes):
+                w = dict(zip(names, rng.uniform(0, 1, len(names))))
+                start = time.perf_counter()
+                one_change(tuner, kind, w)
+                times.append(time.perf_counter() - start)
+            timings[kind] = (np.median(times) * 1e3, max(times) * 1e3)
+        start = time.perf_counter()
+        score_valuation_frame(df).sort_values(ascending=False)
+        framework_scores(df, FRAMEWORK_WEIGHTS)
+        rescore = time.perf_counter() - start
+        (vp, vm), (fp, fm) = timings['Valuation_Score'], timings['Framework_Score']
+        print(f"{n:>8} {build * 1e3:>11.1f} {vp:>14.2f} / {vm:>6.2f} {fp:>14.2f} / {fm:>6.2f} {rescore * 1e3:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# --------------------------
+# CAPM required return
+# --------------------------
+# r = rf + beta * (rm - rf), with beta estimated for the whole universe at
+# once from a returns panel against a benchmark index. Missing bars are
+# handled with masks, so every ticker is regressed on its own overlapping
+# observations without a per-ticker loop. With a beta window set, the
+# estimate is the beta of the most recent window (from the rolling series)
+# instead of one regression over the whole lookback.
+
+BENCHMARK = os.getenv("CAPM_BENCHMARK", "^GSPC")
+RISK_FREE_RATE = float(os.getenv("CAPM_RISK_FREE_RATE", "0.04"))
+MARKET_RISK_PREMIUM = float(os.getenv("CAPM_MARKET_RISK_PREMIUM", "0.05"))  # the framework's 4-6% range
+DEFAULT_LOOKBACK = 252   # trading days (~1 year)
+MIN_OBSERVATIONS = 60
+BETA_WINDOW = int(os.getenv("CAPM_BETA_WINDOW", "0"))   # trading days; 0 regresses over the whole lookback
+
+
+def daily_returns(closes):
+    """Simple daily returns from a dates x tickers close frame (NaN where either bar is missing)"""
+    values = np.asarray(closes, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return values[1:] / values[:-1] - 1
+
+
+def estimate_betas(returns, market, min_obs=MIN_OBSERVATIONS):
+    """OLS betas of every column of ``returns`` (T x N) against ``market`` (T,)
+
+    One masked moment computation for all columns; columns with fewer than
+    ``min_obs`` overlapping observations get NaN.
+    """
+    returns = np.asarray(returns, dtype=float)
+    market = np.asarray(market, dtype=float)
+    mask = np.isfinite(returns) & np.isfinite(market)[:, None]
+    n = mask.sum(axis=0)
+    r = np.where(mask, returns, 0.0)
+    m = np.where(mask, market[:, None], 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_r = r.sum(axis=0) / n
+        mean_m = m.sum(axis=0) / n
+        dm = np.where(mask, m - mean_m, 0.0)
+        cov = (np.where(mask, r - mean_r, 0.0) * dm).sum(axis=0)
+        var = (dm * dm).sum(axis=0)
+        beta = cov / var
+    return np.where((n >= min_obs) & (var > 0), beta, np.nan)
+
+
+def rolling_betas(returns, market, window=63, min_obs=None):
+    """Rolling-window betas (T x N) from cumulative sums, no per-window loop"""
+    returns = np.asarray(returns, dtype=float)
+    market = np.asarray(market, dtype=float)
+    min_obs = window // 2 if min_obs is None else min_obs
+    mask = np.isfinite(returns) & np.isfinite(market)[:, None]
+    r = np.where(mask, returns, 0.0)
+    m = np.where(mask, market[:, None], 0.0)
+
+    def window_sum(x):
+        c = np.cumsum(np.vstack([np.zeros((1, x.shape[1])), x]), axis=0)
+        return c[window:] - c[:-window]
+
+    n, sr, sm = window_sum(mask.astype(float)), window_sum(r), window_sum(m)
+    srm, smm = window_sum(r * m), window_sum(m * m)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = (n * srm - sr * sm) / (n * smm - sm * sm)
+    beta = np.where(n >= min_obs, beta, np.nan)
+    # Align to the input rows: the first window-1 rows have no full window
+    return np.vstack([np.full((window - 1, returns.shape[1]), np.nan), beta])
+
+
+def required_return(beta, risk_free=RISK_FREE_RATE, premium=MARKET_RISK_PREMIUM):
+    """CAPM: r = rf + beta * (rm - rf)"""
+    return risk_free + np.asarray(beta, dtype=float) * premium
+
+
+def capm_table(closes, benchmark=BENCHMARK, lookback=DEFAULT_LOOKBACK, min_obs=MIN_OBSERVATIONS,
+               risk_free=RISK_FREE_RATE, premium=MARKET_RISK_PREMIUM, window=BETA_WINDOW):
+    """Per-ticker Beta_Est and Required_Return from a dates x tickers close frame
+
+    ``closes`` must include the benchmark column; only the last ``lookback``
+    returns are used. With ``window`` > 0, Beta_Est is the latest rolling
+    ``window``-day beta, falling back to the lookback beta where that
+    window has too few observations.
+    """
+    closes = closes.iloc[-(lookback + 1):]
+    tickers = [c for c in closes.columns if c != benchmark]
+    returns = daily_returns(closes[tickers])
+    market = daily_returns(closes[[benchmark]])[:, 0]
+    beta = estimate_betas(returns, market, min_obs)
+    if window and len(returns) >= window:
+        latest = rolling_betas(returns, market, window)[-1]
+        beta = np.where(np.isfinite(latest), latest, beta)
+    return pd.DataFrame({'Beta_Est': beta, 'Required_Return': required_return(beta, risk_free, premium)},
+                        index=pd.Index(tickers, name='Ticker'))
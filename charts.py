@@ -0,0 +1,178 @@
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from metrics import registry, timed
+
+# --------------------------
+# Chart rendering
+# --------------------------
+# Charts are drawn on standalone matplotlib Figures (never registered with
+# pyplot, so nothing accumulates in its global figure list), rasterized
+# once to PNG and cleared. The bytes go into a process-wide LRU bounded by
+# size, keyed by what the chart shows, e.g. (ticker, period, last bar), so
+# a repeated view is a dictionary lookup and memory stays flat over long
+# uptimes. Long price histories are reduced with largest-triangle-three-
+# buckets (LTTB) before plotting. matplotlib is imported on first render.
+
+CHART_CACHE_BYTES = int(float(os.getenv("CHART_CACHE_MB", "64")) * 1024 * 1024)
+MAX_POINTS = 800   # points per line after LTTB, more than a chart is wide in pixels
+DPI = 100
+
+
+def lttb(x, y, n_out=MAX_POINTS):
+    """Indices of the ``n_out`` points LTTB keeps from the series (x, y); first and last always kept"""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)   # n_out - 2 buckets between the endpoints
+    keep = np.empty(n_out, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    prev = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        # Average of the next bucket (the last point for the final bucket)
+        nlo, nhi = hi, edges[b + 2] if b + 2 < len(edges) else n
+        ax, ay = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        px, py = x[prev], y[prev]
+        area = np.abs((px - ax) * (y[lo:hi] - py) - (px - x[lo:hi]) * (ay - py))
+        prev = lo + int(np.nanargmax(area)) if np.isfinite(area).any() else lo
+        keep[b + 1] = prev
+    return keep
+
+
+def downsample(series, n_out=MAX_POINTS):
+    """LTTB-reduced copy of a date-indexed Series (NaNs dropped first)"""
+    series = series.dropna()
+    if len(series) <= n_out:
+        return series
+    x = series.index.asi8 if hasattr(series.index, 'asi8') else np.arange(len(series))
+    return series.iloc[lttb(x, series.to_numpy(dtype=float), n_out)]
+
+
+class ChartCache:
+    """Thread-safe LRU of rendered image bytes, bounded by total size"""
+
+    def __init__(self, max_bytes=CHART_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key, data):
+        with self._lock:
+            if key in self._entries:
+                self._size -= len(self._entries.pop(key))
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                self._size -= len(self._entries.popitem(last=False)[1])
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hits / total if total else 0.0,
+                    'entries': len(self._entries), 'bytes': self._size}
+
+
+_cache = ChartCache()
+registry.add_collector('chart_cache', _cache.stats)
+
+
+def get_chart_cache():
+    """Process-wide rendered-chart cache, shared by every session"""
+    return _cache
+
+
+@timed('chart.render')
+def render_png(draw, figsize=(12, 6), dpi=DPI):
+    """Draw on a fresh standalone Figure via ``draw(ax)`` and return PNG bytes; the figure is released"""
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=figsize, dpi=dpi)
+    try:
+        draw(fig.add_subplot())
+        fig.tight_layout()
+        buf = io.BytesIO()
+        fig.savefig(buf, format='png')
+        return buf.getvalue()
+    finally:
+        fig.clear()
+
+
+def cached_png(key, draw, figsize=(12, 6), dpi=DPI, cache=None):
+    """PNG bytes for ``key``, rendering with ``draw(ax)`` only on a cache miss"""
+    cache = cache or _cache
+    key = (key, figsize, dpi)
+    data = cache.get(key)
+    if data is None:
+        data = render_png(draw, figsize, dpi)
+        cache.put(key, data)
+    return data
+
+
+def data_key(*arrays):
+    """Short digest of array contents, for charts not keyed by (ticker, period, last bar)"""
+    h = hashlib.blake2b(digest_size=16)
+    for a in arrays:
+        h.update(np.ascontiguousarray(np.asarray(a, dtype=float)).tobytes())
+    return h.hexdigest()
+
+
+def price_history_png(ticker, hist, period, title, figsize=(12, 6), max_points=MAX_POINTS, **line):
+    """Close-price line chart, downsampled and cached by (ticker, period, last bar)"""
+    close = hist['Close']
+    key = ('price', ticker, period, str(close.index[-1]), float(close.iloc[-1]), len(close), title)
+
+    def draw(ax):
+        points = downsample(close, max_points)
+        ax.plot(points.index, points.to_numpy(), **{'color': 'steelblue', 'linewidth': 2, **line})
+        ax.set_xlabel('Date')
+        ax.set_ylabel('Price ($)')
+        ax.set_title(title)
+        ax.grid(True, alpha=0.3)
+
+    return cached_png(key, draw, figsize)
+
+
+def bar_chart_png(labels, values, xlabel, title, figsize=(12, 6)):
+    """Horizontal bar chart, first label on top"""
+    labels = [str(label) for label in labels]
+    key = ('bar', tuple(labels), data_key(values), xlabel, title)
+
+    def draw(ax):
+        ax.barh(labels, values, color='steelblue')
+        ax.set_xlabel(xlabel)
+        ax.set_title(title)
+        ax.invert_yaxis()
+
+    return cached_png(key, draw, figsize)
+
+
+def histogram_png(key, values, xlabel, marker=None, marker_label=None, bins=100, figsize=(12, 4)):
+    """Histogram of ``values`` clipped to the 0.5-99.5 percentile range, with an optional vertical marker"""
+    def draw(ax):
+        ax.hist(np.clip(values, *np.percentile(values, [0.5, 99.5])), bins=bins, color='steelblue', alpha=0.8)
+        if marker is not None:
+            ax.axvline(marker, color='crimson', linestyle='--', label=marker_label)
+            ax.legend()
+        ax.set_xlabel(xlabel)
+
+    return cached_png(('hist', key, xlabel, marker, bins), draw, figsize)
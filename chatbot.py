@@ -0,0 +1,270 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import registry
+
+# --------------------------
+# Support chatbot backend (Hugging Face Inference API - free endpoint)
+# --------------------------
+# One pooled requests.Session per process (keep-alive, no TCP/TLS handshake
+# per question), a trimmed prompt (system prompt + the last few turns),
+# streamed tokens, and a background worker so a slow endpoint never blocks
+# a Streamlit rerun. Answers to repeated FAQ-style questions come from an
+# in-memory LRU cache. requests is imported lazily, on the first question.
+
+HF_CHAT_MODEL = "mistralai/Mixtral-8x7B-Instruct-v0.1"  # good free-chat model via HF Inference API
+HF_API_URL = os.getenv("HF_API_URL", f"https://api-inference.huggingface.co/models/{HF_CHAT_MODEL}")
+HF_API_TOKEN = os.getenv("HF_API_TOKEN", "")  # optional; public/free tier often works without token
+
+SYSTEM_PROMPT = (
+    "You are a helpful support assistant for a Streamlit stock analysis app. "
+    "Answer user questions about using the app, understanding metrics (P/E, P/B, ROE), "
+    "data sources, and general app troubleshooting. Keep answers concise."
+)
+
+HISTORY_TURNS = 3          # previous user/assistant exchanges sent with each question
+CONNECT_TIMEOUT = 5.0
+READ_TIMEOUT = 30.0        # per chunk while streaming
+CACHE_SIZE = 256
+CACHE_TTL = 24 * 3600
+MIN_CACHE_WORDS = 3
+FALLBACK_REPLY = "Sorry, I couldn't generate a response right now. Please try again."
+
+
+def normalize_question(text):
+    """Cache key for a question: lower case, punctuation and extra whitespace removed"""
+    return " ".join(re.sub(r"[^\w/%&+-]+", " ", text.lower()).split())
+
+
+def build_prompt(messages, history_turns=HISTORY_TURNS, system_prompt=SYSTEM_PROMPT, context=None):
+    """Mixtral-instruct prompt from the system prompt and the last ``history_turns`` exchanges
+
+    ``context`` passages (e.g. from the framework guide index) are appended
+    to the system prompt to ground the answer.
+    """
+    if context:
+        system_prompt += "\n\nRelevant excerpts from the app's framework guide:\n" + "\n---\n".join(context)
+    convo = [m for m in messages if m["role"] in ("user", "assistant")]
+    question = convo[-1]["content"] if convo and convo[-1]["role"] == "user" else "Hello"
+    previous = convo[:-1] if convo and convo[-1]["role"] == "user" else convo
+    previous = previous[-2 * history_turns:] if history_turns else []
+    prompt, first = "<s>", True
+    for m in previous + [{"role": "user", "content": question}]:
+        if m["role"] == "user":
+            text = f"{system_prompt}\n\n{m['content']}" if first else m["content"]
+            prompt += f"[INST] {text} [/INST]"
+            first = False
+        else:
+            prompt += f" {m['content']}</s>"
+    return prompt
+
+
+def parse_reply(data):
+    """Generated text from any of the response shapes the Inference API returns"""
+    # HF conversation models may return dict with 'generated_text' or a list
+    if isinstance(data, dict) and "generated_text" in data:
+        return data["generated_text"].strip()
+    if isinstance(data, list) and len(data) and isinstance(data[0], dict):
+        # some endpoints return [{'generated_text': '...'}]
+        gt = data[0].get("generated_text") or data[0].get("summary_text")
+        if gt:
+            return gt.strip()
+    if isinstance(data, dict) and "conversation" in data:
+        conv = data["conversation"]
+        if isinstance(conv, dict) and "generated_responses" in conv and conv["generated_responses"]:
+            return conv["generated_responses"][-1].strip()
+    return None
+
+
+class ResponseCache:
+    """Thread-safe LRU of question -> answer with a TTL"""
+
+    def __init__(self, max_entries=CACHE_SIZE, ttl=CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.time() - entry[1] > self.ttl:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, answer):
+        with self._lock:
+            self._entries[key] = (answer, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class ChatJob:
+    """A question being answered in the background; ``text`` grows as tokens stream in"""
+
+    def __init__(self):
+        self.text = ""
+        self.done = False
+        self.error = None
+        self.cached = False
+        self.started_at = time.time()
+        self.first_token_at = None
+        self._event = threading.Event()
+
+    def append(self, chunk):
+        if self.first_token_at is None:
+            self.first_token_at = time.time()
+        self.text += chunk
+
+    def finish(self, error=None):
+        self.error = error
+        self.done = True
+        self._event.set()
+
+    def wait(self, timeout=None):
+        """Block until the answer is complete; returns ``done``"""
+        self._event.wait(timeout)
+        return self.done
+
+    @property
+    def reply(self):
+        """Final text to show once done"""
+        if self.error is not None:
+            return f"Chat service error: {self.error}"
+        return self.text.strip() or FALLBACK_REPLY
+
+
+class ChatBackend:
+    """Pooled, streaming, cached client for the Inference API text-generation endpoint"""
+
+    def __init__(self, url=HF_API_URL, token=HF_API_TOKEN, history_turns=HISTORY_TURNS,
+                 timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), cache=None, workers=4):
+        self.url = url
+        self.token = token
+        self.history_turns = history_turns
+        self.timeout = timeout
+        self.cache = cache if cache is not None else ResponseCache()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="chat")
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                session = requests.Session()
+                session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=8))
+                session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=8))
+                session.headers["Accept"] = "text/event-stream, application/json"
+                if self.token:
+                    session.headers["Authorization"] = f"Bearer {self.token}"
+                self._session = session
+            return self._session
+
+    def _payload(self, messages, max_new_tokens, temperature, stream, context=None):
+        return {
+            "inputs": build_prompt(messages, self.history_turns, context=context),
+            "parameters": {"max_new_tokens": max_new_tokens, "temperature": temperature,
+                           "return_full_text": False},
+            "stream": stream,
+        }
+
+    def _cache_key(self, messages):
+        # Keyed on the question alone, so FAQs hit whatever came before them. Very short
+        # questions ("why?", "and P/B?") are follow-ups whose answer depends on context.
+        user_turns = [m for m in messages if m["role"] == "user"]
+        key = normalize_question(user_turns[-1]["content"]) if user_turns else ""
+        return key if len(key.split()) >= MIN_CACHE_WORDS else None
+
+    def stream(self, messages, max_new_tokens=256, temperature=0.2, use_cache=True, context=None):
+        """Yield reply text chunks as the endpoint produces them"""
+        key = self._cache_key(messages)
+        cached = self.cache.get(key) if key and use_cache else None
+        if cached is not None:
+            yield cached
+            return
+        payload = self._payload(messages, max_new_tokens, temperature, stream=True, context=context)
+        parts = []
+        with self.session.post(self.url, json=payload, timeout=self.timeout, stream=True) as r:
+            r.raise_for_status()
+            if r.headers.get("Content-Type", "").startswith("text/event-stream"):
+                for line in r.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data:"):
+                        continue
+                    event = json.loads(line[5:])
+                    token = event.get("token", {})
+                    if token.get("special"):
+                        continue
+                    if token.get("text"):
+                        parts.append(token["text"])
+                        yield token["text"]
+            else:
+                text = parse_reply(r.json())
+                if text:
+                    parts.append(text)
+                    yield text
+        answer = "".join(parts).strip()
+        if key and answer:
+            self.cache.put(key, answer)
+
+    def complete(self, messages, max_new_tokens=256, temperature=0.2, context=None):
+        """Blocking call returning the whole reply (errors are returned as text)"""
+        return self._run(ChatJob(), messages, max_new_tokens, temperature, True, context).reply
+
+    def submit(self, messages, max_new_tokens=256, temperature=0.2, context=None):
+        """Start answering in the background and return a ChatJob to poll"""
+        job = ChatJob()
+        key = self._cache_key(messages)
+        cached = self.cache.get(key) if key else None
+        if cached is not None:
+            registry.count('chat.cache_hits')
+            job.cached = True
+            job.append(cached)
+            job.finish()
+            return job
+        self._executor.submit(self._run, job, list(messages), max_new_tokens, temperature, False, context)
+        return job
+
+    def _run(self, job, messages, max_new_tokens, temperature, use_cache=True, context=None):
+        try:
+            with registry.timer('chat.request'):
+                for chunk in self.stream(messages, max_new_tokens, temperature, use_cache, context):
+                    job.append(chunk)
+            job.finish()
+        except Exception as e:
+            registry.count('chat.errors')
+            job.finish(e)
+        if job.first_token_at is not None:
+            registry.observe('chat.first_token', job.first_token_at - job.started_at)
+        return job
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_chat_backend():
+    """Process-wide chat backend, shared by every session"""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = ChatBackend()
+        return _backend
+
+
+def hf_chat_completion(messages: list[dict], max_new_tokens: int = 256, temperature: float = 0.2) -> str:
+    return get_chat_backend().complete(messages, max_new_tokens, temperature)
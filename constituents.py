@@ -0,0 +1,159 @@
+import io
+import os
+import threading
+import time
+
+import pandas as pd
+
+from metrics import timed
+from providers import get_provider, provider_dir
+
+# --------------------------
+# Constituent index
+# --------------------------
+# Index membership changes a few times a year, so the parsed constituent
+# tables are stored locally as small CSVs and only re-scraped from Wikipedia
+# once they are older than the refresh interval. A stale list is served
+# immediately and refreshed in the background. Seed copies of every named
+# universe ship in resources/constituents, so a fresh or offline deployment
+# starts from those instead of waiting on Wikipedia; the first successful
+# background refresh replaces them with the current membership.
+
+DEFAULT_DIR = os.getenv(
+    "CONSTITUENTS_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "constituents"),
+)
+SEED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources", "constituents")
+DEFAULT_MAX_AGE = 7 * 24 * 3600  # seconds
+COLUMNS = ['Ticker', 'Name', 'Sector', 'Sub_Industry']
+
+UNIVERSES = {
+    'sp500': {
+        'label': 'S&P 500',
+        'url': 'https://en.wikipedia.org/wiki/List_of_S%26P_500_companies',
+        'columns': {'Symbol': 'Ticker', 'Security': 'Name', 'GICS Sector': 'Sector',
+                    'GICS Sub-Industry': 'Sub_Industry'},
+    },
+    'nasdaq100': {
+        'label': 'Nasdaq-100',
+        'url': 'https://en.wikipedia.org/wiki/Nasdaq-100',
+        'columns': {'Ticker': 'Ticker', 'Company': 'Name', 'GICS Sector': 'Sector',
+                    'GICS Sub-Industry': 'Sub_Industry'},
+    },
+    'dow': {
+        'label': 'Dow Jones Industrial Average',
+        'url': 'https://en.wikipedia.org/wiki/Dow_Jones_Industrial_Average',
+        'columns': {'Symbol': 'Ticker', 'Company': 'Name', 'Industry': 'Sector'},
+    },
+}
+
+_refreshing = set()
+_refresh_lock = threading.Lock()
+
+
+def _store_path(universe, store_dir):
+    return os.path.join(store_dir, f"{universe}.csv")
+
+
+def normalize_constituents(table, columns=None):
+    """Rename to the standard columns and clean tickers for Yahoo Finance"""
+    if columns:
+        table = table.rename(columns=columns)
+    elif 'Ticker' not in table.columns:
+        # User CSVs: accept common header spellings case-insensitively
+        aliases = {'symbol': 'Ticker', 'ticker': 'Ticker', 'name': 'Name', 'company': 'Name',
+                   'security': 'Name', 'sector': 'Sector', 'sub_industry': 'Sub_Industry',
+                   'sub-industry': 'Sub_Industry', 'industry': 'Sub_Industry'}
+        table = table.rename(columns=lambda c: aliases.get(str(c).strip().lower(), c))
+    if 'Ticker' not in table.columns:
+        raise ValueError("constituent table has no Ticker/Symbol column")
+    table = table.reindex(columns=COLUMNS)
+    table = table[table['Ticker'].notna()].copy()
+    table['Ticker'] = table['Ticker'].astype(str).str.strip().str.upper().str.replace('.', '-', regex=False)
+    table = table[table['Ticker'].ne('')]
+    return table.drop_duplicates('Ticker').fillna('N/A').reset_index(drop=True)
+
+
+@timed('constituents.scrape')
+def scrape_constituents(universe):
+    """Download and parse a universe's constituent table from Wikipedia"""
+    import requests
+    spec = UNIVERSES[universe]
+    resp = requests.get(spec['url'], headers={'User-Agent': 'Mozilla/5.0'}, timeout=30)
+    resp.raise_for_status()
+    ticker_col = next(src for src, dst in spec['columns'].items() if dst == 'Ticker')
+    tables = pd.read_html(io.StringIO(resp.text), match=ticker_col)
+    table = next(t for t in tables if ticker_col in t.columns)
+    return normalize_constituents(table, spec['columns'])
+
+
+def refresh_constituents(universe, store_dir=None):
+    """Fetch a universe from the data provider and atomically replace its local copy"""
+    store_dir = store_dir or provider_dir(DEFAULT_DIR)
+    table = get_provider().constituents(universe)
+    os.makedirs(store_dir, exist_ok=True)
+    path = _store_path(universe, store_dir)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    table.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+    return table
+
+
+def _refresh_in_background(universe, store_dir):
+    """Start a background refresh unless one is in flight; returns the thread (None if skipped)"""
+    key = (universe, store_dir)
+    with _refresh_lock:
+        if key in _refreshing:
+            return None
+        _refreshing.add(key)
+
+    def refresh():
+        try:
+            refresh_constituents(universe, store_dir)
+        except Exception:
+            pass  # keep serving the stored copy; retried on the next stale read
+        finally:
+            with _refresh_lock:
+                _refreshing.discard(key)
+
+    thread = threading.Thread(target=refresh, name=f"constituents-{universe}", daemon=True)
+    thread.start()
+    return thread
+
+
+@timed('constituents.load')
+def load_constituents(universe='sp500', max_age=DEFAULT_MAX_AGE, store_dir=None):
+    """Return the constituent table (Ticker, Name, Sector, Sub_Industry) for a universe
+
+    Reads the local copy when there is one, scheduling a background refresh
+    once it is older than ``max_age`` seconds. With no local copy yet, a live
+    provider serves the bundled seed list and refreshes in the background;
+    only non-live providers (record/replay) load synchronously, since their
+    membership has to come from the recording. Copies are kept per provider
+    (see providers.provider_dir).
+    """
+    if universe not in UNIVERSES:
+        raise ValueError(f"unknown universe {universe!r}; expected one of {', '.join(UNIVERSES)}")
+    store_dir = store_dir or provider_dir(DEFAULT_DIR)
+    path = _store_path(universe, store_dir)
+    if not os.path.exists(path):
+        seed = _store_path(universe, SEED_DIR)
+        if get_provider().live and os.path.exists(seed):
+            _refresh_in_background(universe, store_dir)
+            return pd.read_csv(seed, keep_default_na=False)
+        return refresh_constituents(universe, store_dir)
+    if time.time() - os.path.getmtime(path) > max_age:
+        _refresh_in_background(universe, store_dir)
+    return pd.read_csv(path, keep_default_na=False)
+
+
+def load_csv_universe(source):
+    """Load a user-supplied constituent CSV (path or file-like) with at least a Ticker/Symbol column"""
+    return normalize_constituents(pd.read_csv(source, keep_default_na=False, na_values=['']))
+
+
+def get_tickers(universe='sp500', **kwargs):
+    """Ticker list for a named universe or a path to a CSV file"""
+    if universe not in UNIVERSES and os.path.exists(universe):
+        return load_csv_universe(universe)['Ticker'].tolist()
+    return load_constituents(universe, **kwargs)['Ticker'].tolist()
@@ -0,0 +1,118 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+
+# --------------------------
+# Concurrent fetch engine
+# --------------------------
+# Runs a per-ticker fetch function (e.g. fetch_stock_data) on a bounded
+# thread pool and yields results as they complete, so the caller can drive
+# a progress bar while the scan is still running. Yahoo calls are I/O bound,
+# so threads give near-linear speedups up to the upstream rate limit. The
+# per-attempt timeout only counts time spent talking to upstream: a fetch
+# that waits for a rate-limit token does so inside ``untimed()``.
+
+DEFAULT_WORKERS = 16
+DEFAULT_TIMEOUT = 20.0   # seconds per attempt
+DEFAULT_RETRIES = 2      # extra attempts after the first one
+DEFAULT_BACKOFF = 0.5    # seconds, doubled on each retry
+POLL_INTERVAL = 0.1
+WINDOW_PER_WORKER = 2    # futures kept queued per worker; the rest wait in a plain deque
+
+
+_local = threading.local()
+
+
+@contextmanager
+def untimed():
+    """Pause the current attempt's timeout clock (e.g. while waiting for a rate-limit token)
+
+    A no-op outside fetch_many. The clock restarts from zero on exit, so the
+    timeout bounds the upstream call that follows, not the time queued.
+    """
+    started = getattr(_local, 'started', None)
+    if started is None:
+        yield
+        return
+    started[0] = None
+    try:
+        yield
+    finally:
+        started[0] = time.monotonic()
+
+
+def _attempt(fetch, ticker, delay, started):
+    """Run one fetch attempt, sleeping first when it is a retry"""
+    if delay:
+        time.sleep(delay)
+    started[0] = time.monotonic()
+    _local.started = started
+    try:
+        return fetch(ticker)
+    finally:
+        _local.started = None
+
+
+def fetch_many(tickers, fetch, workers=DEFAULT_WORKERS, timeout=DEFAULT_TIMEOUT,
+               retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF):
+    """Fetch many tickers concurrently, yielding (ticker, result) as each one completes
+
+    A result of None (or an exception) counts as a failure and is retried with
+    exponential backoff. An attempt that runs longer than ``timeout`` is
+    abandoned and retried; Python threads cannot be killed, so the stuck call
+    finishes in the background and its result is discarded. Time spent
+    inside ``untimed()`` (rate-limit waits) does not count towards it. Tickers that
+    exhaust their retries are yielded with a result of None.
+    """
+    tickers = list(tickers)
+    if not tickers:
+        return
+    workers = max(1, int(workers))
+    pool = ThreadPoolExecutor(max_workers=workers)
+    pending = {}
+    # wait() walks every pending future, so only a bounded window is submitted
+    # at a time; submitting the whole universe up front is quadratic in its size
+    queue = deque(tickers)
+    window = workers * WINDOW_PER_WORKER
+
+    def submit(ticker, attempt):
+        delay = backoff * (2 ** (attempt - 1)) if attempt else 0
+        started = [None]   # attempt start; None while backing off or inside untimed()
+        future = pool.submit(_attempt, fetch, ticker, delay, started)
+        pending[future] = (ticker, attempt, started)
+
+    def settle(ticker, attempt, result):
+        """Return True when the ticker is finished, otherwise schedule a retry"""
+        if result is not None or attempt >= retries:
+            return True
+        submit(ticker, attempt + 1)
+        return False
+
+    def fill():
+        while queue and len(pending) < window:
+            submit(queue.popleft(), 0)
+
+    try:
+        fill()
+        while pending:
+            done, _ = wait(list(pending), timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            for future in done:
+                ticker, attempt, _ = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception:
+                    result = None
+                if settle(ticker, attempt, result):
+                    yield ticker, result
+            now = time.monotonic()
+            for future, (ticker, attempt, started) in list(pending.items()):
+                since = started[0]
+                if since is not None and now - since > timeout:
+                    del pending[future]
+                    if settle(ticker, attempt, None):
+                        yield ticker, None
+            fill()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
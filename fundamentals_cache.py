@@ -0,0 +1,221 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# --------------------------
+# Persistent fundamentals cache
+# --------------------------
+# Shared on-disk cache for yfinance ``.info`` dicts. Entries are keyed by
+# (ticker, field set): price-dependent fields go stale quickly, slow-moving
+# fundamentals are kept much longer. SQLite gives us cross-process locking,
+# so every Streamlit session and worker on the host shares one cache file.
+
+DEFAULT_PATH = os.getenv(
+    "FUNDAMENTALS_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "fundamentals.sqlite"),
+)
+
+PRICE_FIELDS = (
+    'currentPrice', 'regularMarketPrice', 'previousClose', 'marketCap',
+    'trailingPE', 'forwardPE', 'priceToBook', 'priceToSalesTrailing12Months',
+    'dividendYield',
+)
+FUNDAMENTAL_FIELDS = (
+    'longName', 'shortName', 'sector', 'industry', 'quoteType', 'currency',
+    'returnOnEquity', 'profitMargins', 'grossMargins', 'operatingMargins',
+    'revenueGrowth', 'earningsGrowth', 'trailingEps', 'forwardEps', 'beta',
+    'bookValue', 'totalRevenue', 'freeCashflow', 'operatingCashflow',
+    'totalDebt', 'totalCash', 'sharesOutstanding', 'dividendRate', 'payoutRatio',
+)
+FIELD_SETS = {
+    'price': PRICE_FIELDS,
+    'fundamentals': FUNDAMENTAL_FIELDS,
+}
+
+# Seconds an entry is fresh, and how much longer a stale entry may still be
+# served while it is refreshed in the background.
+DEFAULT_TTLS = {'price': 15 * 60, 'fundamentals': 24 * 3600}
+DEFAULT_STALE_TTLS = {'price': 60 * 60, 'fundamentals': 7 * 24 * 3600}
+DEFAULT_MAX_ENTRIES = 20000
+EVICT_EVERY = 64   # puts between LRU size checks (COUNT(*) scans the whole table)
+REFRESH_WORKERS = int(os.getenv("FUNDAMENTALS_REFRESH_WORKERS", "4"))   # background revalidations at once
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS info (
+    ticker TEXT NOT NULL,
+    field_set TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (ticker, field_set)
+)
+"""
+_INDEX = "CREATE INDEX IF NOT EXISTS info_accessed_at ON info (accessed_at)"
+
+# One small pool shared by every cache instance: a scan over a stale universe
+# queues its revalidations here instead of starting a thread per ticker.
+_refresh_pool = None
+_refresh_pool_lock = threading.Lock()
+
+
+def _get_refresh_pool():
+    """Return the process-wide background refresh executor, creating it once"""
+    global _refresh_pool
+    with _refresh_pool_lock:
+        if _refresh_pool is None:
+            _refresh_pool = ThreadPoolExecutor(max_workers=REFRESH_WORKERS, thread_name_prefix="fundamentals-refresh")
+        return _refresh_pool
+
+
+class FundamentalsCache:
+    """SQLite-backed TTL + LRU cache for ticker info with stale-while-revalidate"""
+
+    def __init__(self, path=DEFAULT_PATH, ttls=None, stale_ttls=None, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.stale_ttls = {**DEFAULT_STALE_TTLS, **(stale_ttls or {})}
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._puts = 0
+        self._counters = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'refreshes': 0, 'errors': 0}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(_SCHEMA)
+            conn.execute(_INDEX)
+            (self._entries,) = conn.execute("SELECT COUNT(*) FROM info").fetchone()
+
+    def _connect(self):
+        """Return this thread's connection (sqlite connections are not thread-safe)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self._counters[name] += n
+
+    def stats(self):
+        """Return hit/miss counters for this process plus the current entry count
+
+        The entry count is kept running by put/evict/clear (and re-synced on
+        every LRU size check), so this is cheap enough for every rerun.
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats['entries'] = self._entries
+        lookups = stats['hits'] + stats['stale_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['hits'] + stats['stale_hits']) / lookups if lookups else 0.0
+        return stats
+
+    def clear(self):
+        """Drop every cached entry"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM info")
+        with self._lock:
+            self._entries = 0
+
+    def _read(self, ticker):
+        rows = self._connect().execute(
+            "SELECT field_set, payload, fetched_at FROM info WHERE ticker = ?", (ticker,)
+        ).fetchall()
+        return {field_set: (json.loads(payload), fetched_at) for field_set, payload, fetched_at in rows}
+
+    def _touch(self, ticker, now):
+        with self._connect() as conn:
+            conn.execute("UPDATE info SET accessed_at = ? WHERE ticker = ?", (now, ticker))
+
+    def put(self, ticker, info, field_sets=None):
+        """Store the cached field sets extracted from a raw ``.info`` dict"""
+        now = time.time()
+        rows = []
+        for field_set in field_sets or FIELD_SETS:
+            payload = {k: info[k] for k in FIELD_SETS[field_set] if k in info}
+            rows.append((ticker, field_set, json.dumps(payload), now, now))
+        with self._lock:
+            self._puts += 1
+            check = self._puts % EVICT_EVERY == 0
+        with self._connect() as conn:
+            (existing,) = conn.execute(
+                "SELECT COUNT(*) FROM info WHERE ticker = ? AND field_set IN (%s)" % ",".join("?" * len(rows)),
+                (ticker, *(row[1] for row in rows)),
+            ).fetchone()
+            conn.executemany("INSERT OR REPLACE INTO info VALUES (?, ?, ?, ?, ?)", rows)
+            with self._lock:
+                self._entries += len(rows) - existing
+            if check:
+                self._evict(conn)
+
+    def _evict(self, conn):
+        """Drop least-recently-used entries beyond max_entries"""
+        # The full count also re-syncs the running total with other processes' writes
+        (count,) = conn.execute("SELECT COUNT(*) FROM info").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            count -= conn.execute(
+                "DELETE FROM info WHERE rowid IN (SELECT rowid FROM info ORDER BY accessed_at LIMIT ?)",
+                (excess,),
+            ).rowcount
+        with self._lock:
+            self._entries = count
+
+    def get_info(self, ticker, loader):
+        """Return cached info for ticker, calling ``loader(ticker)`` only when needed
+
+        Fresh entries are served directly. Stale entries still inside their
+        stale window are served immediately and refreshed on the shared
+        background pool. Anything missing or too old triggers one synchronous load.
+        """
+        now = time.time()
+        cached = self._read(ticker)
+        merged, stale = {}, False
+        for field_set in FIELD_SETS:
+            entry = cached.get(field_set)
+            age = now - entry[1] if entry else None
+            if entry is None or age > self.ttls[field_set] + self.stale_ttls[field_set]:
+                break
+            stale = stale or age > self.ttls[field_set]
+            merged.update(entry[0])
+        else:
+            self._touch(ticker, now)
+            if stale:
+                self._count('stale_hits')
+                self._refresh_in_background(ticker, loader)
+            else:
+                self._count('hits')
+            return merged
+
+        self._count('misses')
+        info = loader(ticker)
+        if not info:
+            return {}
+        self.put(ticker, info)
+        return {k: info[k] for fields in FIELD_SETS.values() for k in fields if k in info}
+
+    def _refresh_in_background(self, ticker, loader):
+        with self._lock:
+            if ticker in self._refreshing:
+                return
+            self._refreshing.add(ticker)
+
+        def refresh():
+            try:
+                info = loader(ticker)
+                if info:
+                    self.put(ticker, info)
+                    self._count('refreshes')
+            except Exception:
+                self._count('errors')
+            finally:
+                with self._lock:
+                    self._refreshing.discard(ticker)
+
+        _get_refresh_pool().submit(refresh)
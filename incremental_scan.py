@@ -0,0 +1,117 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from providers import provider_dir
+
+# --------------------------
+# Incremental re-scan
+# --------------------------
+# Fundamentals change at most quarterly, so a refresh of the universe scan
+# reuses the last scan's rows. Only price-dependent columns are recomputed
+# from a fresh (batched) price quote; tickers whose fundamentals are older
+# than the TTL, or that are new to the universe, are re-fetched in full.
+
+DEFAULT_DIR = os.getenv(
+    "SCAN_STORE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "scans"),
+)
+FUNDAMENTALS_TTL = 24 * 3600  # seconds
+
+# Columns that move proportionally with price, and inversely with it
+PRICE_SCALED = ('PE_Ratio', 'PB_Ratio', 'PS_Ratio', 'Market_Cap')
+PRICE_INVERSE = ('Dividend_Yield',)
+# Columns computed from the old price that cannot be rescaled: Monte Carlo
+# bands (MC_P5..MC_Prob_Undervalued) and the scores. Repricing drops them so
+# they are recomputed instead of being shown as current.
+PRICE_DERIVED = ('Valuation_Score', 'Framework_Score')
+PRICE_DERIVED_PREFIXES = ('MC_',)
+
+
+def _scan_path(universe, store_dir):
+    return os.path.join(store_dir, f"{universe}.pkl")
+
+
+def save_scan(df, universe, store_dir=None):
+    """Persist a scan's result rows so the next refresh can be incremental
+
+    Saved per provider (see providers.provider_dir), so an incremental live
+    scan never starts from replayed rows.
+    """
+    store_dir = store_dir or provider_dir(DEFAULT_DIR)
+    os.makedirs(store_dir, exist_ok=True)
+    path = _scan_path(universe, store_dir)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    df.to_pickle(tmp)
+    os.replace(tmp, path)
+
+
+def load_scan(universe, store_dir=None):
+    """Return the last saved scan for a universe from the current provider, or None"""
+    try:
+        return pd.read_pickle(_scan_path(universe, store_dir or provider_dir(DEFAULT_DIR)))
+    except (OSError, ValueError, EOFError):
+        return None
+
+
+def stamp(df, now=None):
+    """Record when each row's fundamentals were fetched"""
+    df = df.copy()
+    df['Fetched_At'] = time.time() if now is None else now
+    return df
+
+
+def reprice(df, prices):
+    """Return a copy of df with Current_Price replaced and price-derived ratios rescaled
+
+    ``prices`` maps ticker to latest price; rows without a usable new or old
+    price keep their values. Columns that cannot be rescaled (see
+    PRICE_DERIVED) are dropped for every row.
+    """
+    stale = [c for c in df.columns if c in PRICE_DERIVED or str(c).startswith(PRICE_DERIVED_PREFIXES)]
+    df = df.drop(columns=stale)
+    new = pd.to_numeric(df['Ticker'].map(prices), errors='coerce').to_numpy(dtype=float)
+    old = df['Current_Price'].to_numpy(dtype=float)
+    ok = np.isfinite(new) & np.isfinite(old) & (old > 0) & (new > 0)
+    ratio = np.where(ok, new / np.where(ok, old, 1.0), 1.0)
+    for col in PRICE_SCALED:
+        if col in df:
+            df[col] = df[col].to_numpy(dtype=float) * ratio
+    for col in PRICE_INVERSE:
+        if col in df:
+            df[col] = df[col].to_numpy(dtype=float) / ratio
+    df['Current_Price'] = np.where(ok, new, old)
+    return df
+
+
+def incremental_rescan(previous, tickers, fetch_prices, fetch_rows, ttl=FUNDAMENTALS_TTL, now=None):
+    """Refresh a previous scan for the given universe
+
+    ``fetch_prices(tickers)`` returns a ticker -> latest price mapping (one
+    batched call); ``fetch_rows(tickers)`` returns a DataFrame of full
+    fetch_stock_data rows for tickers that need new fundamentals. Tickers
+    that left the universe are dropped. Returns the merged, unscored frame.
+    """
+    now = time.time() if now is None else now
+    tickers = list(dict.fromkeys(tickers))
+    previous = previous[previous['Ticker'].isin(tickers)]
+    fetched_at = previous['Fetched_At'] if 'Fetched_At' in previous else pd.Series(0.0, index=previous.index)
+    fresh = previous[now - fetched_at <= ttl]
+    known = set(fresh['Ticker'])
+    refetch = [t for t in tickers if t not in known]
+
+    parts, refetched = [], set()
+    if refetch:
+        rows = fetch_rows(refetch)
+        if rows is not None and len(rows):
+            parts.append(stamp(rows, now))
+            refetched = set(rows['Ticker'])
+    # Fresh rows, plus stale rows that could not be re-fetched, are repriced
+    reuse = previous[~previous['Ticker'].isin(refetched)]
+    if len(reuse):
+        parts.insert(0, reprice(reuse, fetch_prices(reuse['Ticker'].tolist())))
+    if not parts:
+        return previous.iloc[0:0].copy()
+    return pd.concat(parts, ignore_index=True)
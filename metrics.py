@@ -0,0 +1,156 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+# --------------------------
+# Stage timing metrics
+# --------------------------
+# Process-wide timers for the pipeline stages (constituent load, per-ticker
+# fetch, scoring, chat, chart rendering, ...). Each stage keeps a count,
+# a running sum and a bounded reservoir of recent durations for p50/p95/p99.
+# Collectors add gauges from other components (throttle, caches). Exported
+# as Prometheus text or JSON lines: the app's debug panel offers both as
+# downloads, and scan.py --metrics writes them after each run (appending
+# JSON lines to METRICS_JSONL_PATH by default).
+
+RESERVOIR = 2048            # most recent samples kept per stage
+QUANTILES = (0.5, 0.95, 0.99)
+JSONL_PATH = os.getenv("METRICS_JSONL_PATH", "")
+
+
+class StageTimer:
+    """Count, sum, max and a reservoir of recent durations for one stage"""
+
+    def __init__(self, reservoir=RESERVOIR):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=reservoir)
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.samples.append(seconds)
+
+    def summary(self):
+        q = np.quantile(np.fromiter(self.samples, float), QUANTILES) if self.samples else [np.nan] * len(QUANTILES)
+        out = {'count': self.count, 'sum': self.total, 'max': self.max}
+        out.update({f"p{int(p * 100)}": float(v) for p, v in zip(QUANTILES, q)})
+        return out
+
+
+class MetricsRegistry:
+    """Thread-safe registry of stage timers, event counters and gauge collectors"""
+
+    def __init__(self):
+        self._stages = {}
+        self._counters = {}
+        self._collectors = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            timer = self._stages.get(stage)
+            if timer is None:
+                timer = self._stages[stage] = StageTimer()
+            timer.observe(seconds)
+
+    def count(self, name, n=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    @contextmanager
+    def timer(self, stage):
+        """Time the enclosed block as one ``stage`` sample (also on exceptions)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def timed(self, stage):
+        """Decorator form of timer()"""
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.timer(stage):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def add_collector(self, prefix, collect):
+        """Register ``collect() -> dict`` whose numeric values are exported as gauges"""
+        with self._lock:
+            self._collectors[prefix] = collect
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+    def snapshot(self):
+        """{'stages': {stage: summary}, 'counters': {...}, 'gauges': {...}}"""
+        with self._lock:
+            stages = {name: timer.summary() for name, timer in sorted(self._stages.items())}
+            counters = dict(sorted(self._counters.items()))
+            collectors = list(self._collectors.items())
+        gauges = {}
+        for prefix, collect in collectors:
+            try:
+                values = collect()
+            except Exception:
+                continue
+            gauges.update({f"{prefix}.{k}": float(v) for k, v in values.items()
+                           if isinstance(v, (int, float)) and not isinstance(v, bool)})
+        return {'stages': stages, 'counters': counters, 'gauges': gauges}
+
+    def to_prometheus(self):
+        """Prometheus text exposition format"""
+        snap = self.snapshot()
+        lines = ["# HELP stage_seconds Pipeline stage durations", "# TYPE stage_seconds summary"]
+        for stage, s in snap['stages'].items():
+            for p in QUANTILES:
+                lines.append(f'stage_seconds{{stage="{stage}",quantile="{p}"}} {s[f"p{int(p * 100)}"]:.6g}')
+            lines.append(f'stage_seconds_sum{{stage="{stage}"}} {s["sum"]:.6g}')
+            lines.append(f'stage_seconds_count{{stage="{stage}"}} {s["count"]}')
+        lines += ["# HELP events_total Pipeline event counters", "# TYPE events_total counter"]
+        lines += [f'events_total{{name="{name}"}} {value}' for name, value in snap['counters'].items()]
+        lines += ["# HELP component_value Gauges from throttle and caches", "# TYPE component_value gauge"]
+        lines += [f'component_value{{name="{name}"}} {value:.6g}' for name, value in snap['gauges'].items()]
+        return "\n".join(lines) + "\n"
+
+    def to_jsonl(self):
+        """One JSON object per stage / counter / gauge, stamped with the current time"""
+        now = time.time()
+        snap = self.snapshot()
+        rows = [{'ts': now, 'type': 'stage', 'name': k, **v} for k, v in snap['stages'].items()]
+        rows += [{'ts': now, 'type': 'counter', 'name': k, 'value': v} for k, v in snap['counters'].items()]
+        rows += [{'ts': now, 'type': 'gauge', 'name': k, 'value': v} for k, v in snap['gauges'].items()]
+        return "".join(json.dumps(row, allow_nan=False, default=str) + "\n" for row in _finite(rows))
+
+    def write(self, path):
+        """Write Prometheus text (.prom/.txt) or append JSON lines (anything else)"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if path.endswith((".prom", ".txt")):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(self.to_prometheus())
+        else:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(self.to_jsonl())
+
+
+def _finite(rows):
+    for row in rows:
+        yield {k: (None if isinstance(v, float) and not np.isfinite(v) else v) for k, v in row.items()}
+
+
+registry = MetricsRegistry()
+timer = registry.timer
+timed = registry.timed
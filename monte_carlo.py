@@ -0,0 +1,89 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from valuation_models import DEFAULT_TERMINAL_GROWTH, DEFAULT_YEARS, _per_share
+
+# --------------------------
+# Monte Carlo intrinsic value
+# --------------------------
+# Instead of one grid of hand-picked scenarios, sample stage-one growth,
+# free-cash-flow margin and the discount rate per path and report
+# percentile bands of the two-stage DCF value. Paths x tickers are
+# evaluated as one broadcast (closed-form geometric sum, no year loop).
+# Every ticker sees the same standard-normal draws (common random
+# numbers), so results are reproducible for a seed, comparable across
+# tickers and independent of how the work is chunked. Chunking over
+# tickers bounds memory to ``chunk_elements`` values at a time.
+
+DEFAULT_PATHS = int(os.getenv("MONTE_CARLO_PATHS", "10000"))
+PERCENTILES = (5, 25, 50, 75, 95)
+CHUNK_ELEMENTS = 2_000_000   # ~16 MB of float64 per intermediate array
+
+GROWTH_MEAN = 0.05           # used when a ticker has no revenue growth
+GROWTH_BOUNDS = (-0.05, 0.15)
+GROWTH_SD = 0.04
+MARGIN_SD = 0.20             # log-normal shock to free cash flow per share
+RATE_MEAN = 0.06             # used when a ticker has no CAPM required return
+RATE_SD = 0.01
+MIN_RATE_SPREAD = 0.01       # sampled rates stay at least this far above terminal growth
+
+
+def draw_shocks(paths=DEFAULT_PATHS, seed=None):
+    """Standard-normal (growth, margin, rate) shocks, shape (3, paths)"""
+    return np.random.default_rng(seed).standard_normal((3, paths))
+
+
+def simulation_inputs(df):
+    """Per-ticker distribution parameters: FCF/share, net cash/share, price, growth and rate means"""
+    _, fcf, net_cash, price = _per_share(df)
+    growth = pd.to_numeric(df.get('Revenue_Growth', pd.Series(np.nan, index=df.index)), errors='coerce') / 100
+    rate = pd.to_numeric(df.get('Required_Return', pd.Series(np.nan, index=df.index)), errors='coerce')
+    growth = growth.fillna(GROWTH_MEAN).clip(*GROWTH_BOUNDS).to_numpy(dtype=float)
+    rate = rate.fillna(RATE_MEAN).to_numpy(dtype=float)
+    return fcf, net_cash, price, growth, rate
+
+
+def _dcf_paths(fcf, net_cash, growth, rate, shocks, years, terminal_growth):
+    """DCF value per share for k tickers x paths"""
+    g = growth[:, None] + GROWTH_SD * shocks[0]
+    margin = np.exp(MARGIN_SD * shocks[1] - MARGIN_SD ** 2 / 2)   # mean-one multiplier
+    r = np.maximum(rate[:, None] + RATE_SD * shocks[2], terminal_growth + MIN_RATE_SPREAD)
+    q = (1 + g) / (1 + r)
+    qn = q ** years
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stage_one = np.where(np.isclose(q, 1.0), years, q * (1 - qn) / (1 - q))
+    terminal = qn * (1 + terminal_growth) / (r - terminal_growth)
+    return fcf[:, None] * margin * (stage_one + terminal) + net_cash[:, None]
+
+
+def simulate_paths(row, paths=DEFAULT_PATHS, seed=None, years=DEFAULT_YEARS,
+                   terminal_growth=DEFAULT_TERMINAL_GROWTH):
+    """Simulated DCF values per share for one row (Series or dict), shape (paths,)"""
+    fcf, net_cash, _, growth, rate = simulation_inputs(pd.DataFrame([dict(row)]))
+    return _dcf_paths(fcf, net_cash, growth, rate, draw_shocks(paths, seed), years, terminal_growth)[0]
+
+
+def monte_carlo_bands(df, paths=DEFAULT_PATHS, seed=None, percentiles=PERCENTILES, years=DEFAULT_YEARS,
+                      terminal_growth=DEFAULT_TERMINAL_GROWTH, chunk_elements=CHUNK_ELEMENTS):
+    """Percentile bands of simulated DCF value for every row
+
+    Returns a DataFrame indexed like ``df`` with MC_P<p> columns and
+    MC_Prob_Undervalued (share of paths above the current price, in %).
+    Rows without positive free cash flow are NaN.
+    """
+    fcf, net_cash, price, growth, rate = simulation_inputs(df)
+    shocks = draw_shocks(paths, seed)
+    bands = np.full((len(df), len(percentiles)), np.nan)
+    prob = np.full(len(df), np.nan)
+    valid = np.flatnonzero(np.isfinite(fcf))
+    step = max(1, chunk_elements // max(paths, 1))
+    for start in range(0, len(valid), step):
+        rows = valid[start:start + step]
+        values = _dcf_paths(fcf[rows], net_cash[rows], growth[rows], rate[rows], shocks, years, terminal_growth)
+        bands[rows] = np.percentile(values, percentiles, axis=1).T
+        prob[rows] = (values > price[rows, None]).mean(axis=1) * 100
+    out = pd.DataFrame(bands, index=df.index, columns=[f'MC_P{p}' for p in percentiles])
+    out['MC_Prob_Undervalued'] = np.where(price > 0, prob, np.nan)
+    return out
@@ -0,0 +1,317 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from capm import BENCHMARK, BETA_WINDOW, DEFAULT_LOOKBACK, capm_table, required_return
+from fetch_engine import DEFAULT_TIMEOUT, DEFAULT_WORKERS, fetch_many
+from fundamentals_cache import FundamentalsCache
+from incremental_scan import FUNDAMENTALS_TTL, incremental_rescan, stamp
+from metrics import registry, timed
+from monte_carlo import DEFAULT_PATHS, monte_carlo_bands
+from price_history import HistoryStore
+from providers import get_provider
+from scoring import framework_factors, framework_scores, score_valuation_frame
+from throttle import Throttle
+
+# --------------------------
+# Valuation pipeline (library)
+# --------------------------
+# Everything needed to fetch, score and rank a universe without Streamlit:
+# the app, the background scheduler and the ``scan`` CLI all call into this
+# module. Market data comes from the process-wide provider (providers.py:
+# live Yahoo by default, or a recording / offline replay); yfinance is
+# imported lazily, on the first live fetch. The fundamentals cache and the
+# persisted price panel hold live data only: other providers are called
+# directly, with an in-memory panel per provider.
+
+# Static weights for the six-factor framework score
+weights = {
+    'Customer_Value': 0.10,
+    'Unit_Economics': 0.15,
+    'TAM': 0.10,
+    'Competition': 0.10,
+    'Risks': 0.15,
+    'Valuation_Score': 0.40
+}
+
+MONTE_CARLO_SEED = int(os.getenv("MONTE_CARLO_SEED", "42"))
+RETRY_PASSES = 2         # extra passes over tickers that failed every attempt
+RETRY_MAX_WAIT = 60.0    # seconds to wait for an open circuit before a retry pass
+
+_lock = threading.Lock()
+_fundamentals_cache = None
+_history_store = None
+_offline_history = (None, None)   # (provider, in-memory HistoryStore) for a non-live provider
+_throttle = Throttle()
+registry.add_collector('yahoo', _throttle.stats)
+registry.add_collector('fundamentals_cache',
+                       lambda: _fundamentals_cache.stats() if _fundamentals_cache is not None else {})
+
+
+def get_throttle():
+    """Process-wide Yahoo rate limiter / circuit breaker, shared by every session and scan"""
+    return _throttle
+
+
+def get_fundamentals_cache():
+    """Process-wide on-disk .info cache, shared by every session and scan"""
+    global _fundamentals_cache
+    with _lock:
+        if _fundamentals_cache is None:
+            _fundamentals_cache = FundamentalsCache()
+        return _fundamentals_cache
+
+
+def get_history_store():
+    """Process-wide float32 price panel, downloaded in batches and topped up incrementally
+
+    The persisted panel is only used for the live provider; any other
+    provider gets a panel of its own that lives in memory.
+    """
+    global _history_store, _offline_history
+    provider = get_provider()
+    with _lock:
+        if not provider.live:
+            if _offline_history[0] is not provider:
+                _offline_history = (provider, HistoryStore(path=None, downloader=download_history))
+            return _offline_history[1]
+        if _history_store is None:
+            _history_store = HistoryStore(downloader=download_history)
+        return _history_store
+
+
+def _upstream(method, *args, **kwargs):
+    """Call a provider method, through the shared throttle when the provider is rate-limited"""
+    if get_provider().rate_limited:
+        return _throttle.call(method, *args, **kwargs)
+    return method(*args, **kwargs)
+
+
+@timed('provider.info')
+def load_info(ticker):
+    """Fetch the raw .info dict from the data provider (uncached)"""
+    return _upstream(get_provider().info, ticker)
+
+
+@timed('provider.history')
+def download_history(tickers, **kwargs):
+    """Batched daily OHLCV from the data provider, for the history panel"""
+    return _upstream(get_provider().download, tickers, **kwargs)
+
+
+def fetch_info(ticker):
+    """Fetch .info through the shared fundamentals cache (non-live providers are called directly)"""
+    if not get_provider().live:
+        return load_info(ticker)
+    return get_fundamentals_cache().get_info(ticker, load_info)
+
+
+def load_history(ticker, period):
+    """Fetch OHLCV price history through the shared history panel"""
+    return get_history_store().get_history(ticker, period)
+
+
+def fetch_latest_prices(tickers):
+    """Latest close per ticker from the batched history panel"""
+    closes = get_history_store().get_panel(tickers).frame('Close')
+    return closes.ffill().iloc[-1] if len(closes) else {}
+
+
+@timed('provider.quote')
+def fetch_current_price(ticker, info=None):
+    """Latest price from the provider's quote; the ``.info`` price only when the quote fails"""
+    try:
+        price = _upstream(get_provider().quote, ticker)
+        if price is not None and pd.notna(price):
+            return price
+    except Exception:
+        pass
+    try:
+        if info is None:
+            info = fetch_info(ticker)
+        return info.get('regularMarketPrice')
+    except Exception:
+        return None
+
+
+def estimate_capm(tickers, lookback=DEFAULT_LOOKBACK, benchmark=BENCHMARK, window=BETA_WINDOW):
+    """Beta_Est and Required_Return per ticker, regressed on the shared price panel (see capm_table)"""
+    tickers = list(tickers)
+    closes = get_history_store().get_panel(tickers + [benchmark]).frame('Close')
+    if benchmark not in closes:
+        return pd.DataFrame(np.nan, index=pd.Index(tickers, name='Ticker'), columns=['Beta_Est', 'Required_Return'])
+    return capm_table(closes, benchmark, lookback, window=window).reindex(tickers)
+
+
+def estimate_beta(ticker, lookback=DEFAULT_LOOKBACK, window=BETA_WINDOW):
+    """Estimated beta of a single ticker vs the benchmark (NaN when history is short)"""
+    try:
+        return float(estimate_capm([ticker], lookback, window=window).loc[ticker, 'Beta_Est'])
+    except Exception:
+        return np.nan
+
+
+@timed('scan.capm')
+def add_capm(df, lookback=DEFAULT_LOOKBACK, window=BETA_WINDOW):
+    """Add Beta_Est and Required_Return columns to a scan frame
+
+    Missing Yahoo betas are filled from the estimate. The required return
+    uses the estimated beta, falling back to Yahoo's. ``window`` > 0 uses
+    the latest rolling-window beta (see capm_table).
+    """
+    table = estimate_capm(df['Ticker'], lookback, window=window)
+    df = df.drop(columns=['Beta_Est', 'Required_Return'], errors='ignore')
+    df['Beta_Est'] = df['Ticker'].map(table['Beta_Est']).astype(float)
+    beta = pd.to_numeric(df['Beta'], errors='coerce') if 'Beta' in df else pd.Series(np.nan, index=df.index)
+    df['Beta'] = beta.fillna(df['Beta_Est'])
+    df['Required_Return'] = required_return(df['Beta_Est'].fillna(beta))
+    return df
+
+
+@timed('scan.monte_carlo')
+def add_monte_carlo(df, paths=DEFAULT_PATHS, seed=MONTE_CARLO_SEED):
+    """Add Monte Carlo DCF percentile columns (MC_P5..MC_P95, MC_Prob_Undervalued)"""
+    bands = monte_carlo_bands(df, paths, seed)
+    return df.drop(columns=list(bands.columns), errors='ignore').join(bands)
+
+
+def score_factors_auto(ticker, info=None, beta_estimate=None):
+    """Six framework factor scores (rounded) for one ticker, exactly as a scan scores its row
+
+    Builds the fetch_stock_data row and scores it with
+    scoring.framework_factors in absolute mode; ``beta_estimate`` stands in
+    for a missing reported beta.
+    """
+    if info is None:
+        info = fetch_info(ticker)
+    row = fetch_stock_data(ticker, info) or {}
+    if beta_estimate is not None and pd.isna(row.get('Beta', np.nan)):
+        row['Beta'] = beta_estimate
+    factors = framework_factors(pd.DataFrame([row]))
+    return {factor: round(float(score), 1) for factor, score in factors.iloc[0].items()}
+
+
+@timed('fetch.stock_data')
+def fetch_stock_data(ticker, info=None):
+    """Fetch stock price and financial data from the data provider"""
+    try:
+        if info is None:
+            info = fetch_info(ticker)
+        if not info:
+            return None
+
+        data = {
+            'Ticker': ticker,
+            'Name': info.get('longName', 'N/A'),
+            'Current_Price': info.get('currentPrice', np.nan),
+            'PE_Ratio': info.get('trailingPE', np.nan),
+            'PB_Ratio': info.get('priceToBook', np.nan),
+            'PS_Ratio': info.get('priceToSalesTrailing12Months', np.nan),
+            'Dividend_Yield': info.get('dividendYield', 0) * 100 if info.get('dividendYield') else 0,
+            'ROE': info.get('returnOnEquity', np.nan) * 100 if info.get('returnOnEquity') else np.nan,
+            'Profit_Margin': info.get('profitMargins', np.nan) * 100 if info.get('profitMargins') else np.nan,
+            'Gross_Margin': info.get('grossMargins', np.nan) * 100 if info.get('grossMargins') else np.nan,
+            'Operating_Margin': info.get('operatingMargins', np.nan) * 100 if info.get('operatingMargins') else np.nan,
+            'Revenue_Growth': info.get('revenueGrowth', np.nan) * 100 if info.get('revenueGrowth') else np.nan,
+            'EPS': info.get('trailingEps', np.nan),
+            'Beta': info.get('beta', np.nan),
+            'Market_Cap': info.get('marketCap', np.nan),
+            'Sector': info.get('sector', 'N/A'),
+            # DCF / DDM inputs
+            'Dividend_Rate': info.get('dividendRate', np.nan),
+            'FCF': info.get('freeCashflow', np.nan),
+            'Shares_Outstanding': info.get('sharesOutstanding', np.nan),
+            'Total_Cash': info.get('totalCash', np.nan),
+            'Total_Debt': info.get('totalDebt', np.nan),
+        }
+        return data
+    except Exception:
+        return None
+
+
+@timed('fetch.universe')
+def fetch_universe(tickers, workers=DEFAULT_WORKERS, timeout=DEFAULT_TIMEOUT, on_result=None,
+                   retry_passes=RETRY_PASSES, on_row=None):
+    """Fetch fetch_stock_data rows for many tickers concurrently
+
+    ``on_result(done, total, ticker)`` is called as each ticker completes
+    its first pass, e.g. to drive a progress bar, and ``on_row(row)`` with
+    every fetched row as it arrives, e.g. to feed a scoring.Leaderboard.
+    Tickers that fail every attempt go to a retry queue that is re-run, up
+    to ``retry_passes`` times, once the circuit breaker admits requests
+    again. Tickers still failing are counted as dropped and listed in
+    ``df.attrs['failed']``.
+    """
+    tickers = list(tickers)
+    results, failed = [], []
+    for idx, (ticker, data) in enumerate(fetch_many(tickers, fetch_stock_data, workers=workers, timeout=timeout)):
+        if data:
+            results.append(data)
+            if on_row is not None:
+                on_row(data)
+        else:
+            failed.append(ticker)
+        if on_result is not None:
+            on_result(idx + 1, len(tickers), ticker)
+    for _ in range(retry_passes):
+        if not failed:
+            break
+        _throttle.count('retried', len(failed))
+        _throttle.wait_for_circuit(RETRY_MAX_WAIT)
+        queue, failed = failed, []
+        for ticker, data in fetch_many(queue, fetch_stock_data, workers=workers, timeout=timeout):
+            if data:
+                results.append(data)
+                if on_row is not None:
+                    on_row(data)
+            else:
+                failed.append(ticker)
+    if failed:
+        _throttle.count('dropped', len(failed))
+    df = pd.DataFrame(results)
+    df.attrs['failed'] = failed
+    return df
+
+
+@timed('scan.total')
+def run_scan(tickers, previous=None, workers=DEFAULT_WORKERS, timeout=DEFAULT_TIMEOUT,
+             ttl=FUNDAMENTALS_TTL, on_result=None, capm=True, monte_carlo_paths=DEFAULT_PATHS,
+             beta_window=BETA_WINDOW):
+    """Fetch and score a universe; incremental when a previous scan is given
+
+    Returns every fetched row with a Valuation_Score column, sorted best
+    first. With ``capm``, betas are estimated from the price panel and a
+    Required_Return column is added (see add_capm; ``beta_window`` > 0
+    uses the latest rolling-window beta). ``monte_carlo_paths``
+    > 0 adds simulated intrinsic-value bands for every row. The six-factor
+    Framework_Score (absolute bands) is added alongside Valuation_Score.
+    Tickers that could not be fetched are listed in ``df.attrs['failed']``.
+    """
+    failed = []
+
+    def fetch_rows(batch):
+        rows = fetch_universe(batch, workers=workers, timeout=timeout, on_result=on_result)
+        failed.extend(rows.attrs.get('failed', []))
+        return rows
+
+    if previous is not None:
+        df = incremental_rescan(previous, tickers, fetch_latest_prices, fetch_rows, ttl)
+    else:
+        df = stamp(fetch_rows(tickers))
+    if not len(df):
+        df.attrs['failed'] = failed
+        return df
+    if capm:
+        try:
+            df = add_capm(df, window=beta_window)
+        except Exception:
+            pass  # price history unavailable: keep Yahoo's betas, no required return
+    if monte_carlo_paths:
+        df = add_monte_carlo(df, monte_carlo_paths)
+    df['Valuation_Score'] = score_valuation_frame(df)
+    df['Framework_Score'] = framework_scores(df, weights)['Framework_Score']
+    df = df.sort_values('Valuation_Score', ascending=False, ignore_index=True)
+    df.attrs['failed'] = failed
+    return df
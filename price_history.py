@@ -0,0 +1,261 @@
+import os
+import re
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+# --------------------------
+# Bulk price history
+# --------------------------
+# Daily OHLCV for many tickers is downloaded in batched yf.download calls and
+# kept as one float32 panel (field x date x ticker) on a shared
+# DatetimeIndex. The panel is persisted to disk and topped up incrementally:
+# later calls only fetch bars newer than each requested ticker's last cached
+# bar. Downloads run outside the store lock, so one session topping up its
+# tickers never blocks another session reading the panel.
+
+FIELDS = ('Open', 'High', 'Low', 'Close', 'Volume')
+DEFAULT_PATH = os.getenv(
+    "HISTORY_PANEL_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "history", "panel.npz"),
+)
+DEFAULT_LOOKBACK = "2y"
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_REFRESH_INTERVAL = 15 * 60  # seconds between top-up checks (and retries of empty downloads) per ticker
+
+
+def yf_download(tickers, **kwargs):
+    """Batched daily download through yfinance (one HTTP round-trip per batch)"""
+    import yfinance as yf
+    return yf.download(tickers, interval="1d", group_by="column", auto_adjust=True,
+                       progress=False, threads=True, **kwargs)
+
+
+def period_start(period, now=None):
+    """Translate a yfinance period string ('90d', '6mo', '1y', 'ytd', 'max') to a start date"""
+    now = pd.Timestamp(now or pd.Timestamp.now()).normalize()
+    if period == 'max':
+        return pd.Timestamp.min
+    if period == 'ytd':
+        return now.replace(month=1, day=1)
+    match = re.fullmatch(r"(\d+)(d|wk|mo|y)", period)
+    if not match:
+        raise ValueError(f"unsupported period {period!r}")
+    n, unit = int(match.group(1)), match.group(2)
+    offsets = {'d': pd.DateOffset(days=n), 'wk': pd.DateOffset(weeks=n),
+               'mo': pd.DateOffset(months=n), 'y': pd.DateOffset(years=n)}
+    return now - offsets[unit]
+
+
+class PricePanel:
+    """Float32 OHLCV for many tickers on one shared DatetimeIndex
+
+    ``values`` has shape (len(FIELDS), len(index), len(tickers)); missing
+    bars are NaN.
+    """
+
+    def __init__(self, index, tickers, values):
+        self.index = pd.DatetimeIndex(index)
+        self.tickers = list(tickers)
+        self.values = np.asarray(values, dtype=np.float32)
+        self._pos = {t: i for i, t in enumerate(self.tickers)}
+
+    @classmethod
+    def empty(cls):
+        return cls(pd.DatetimeIndex([]), [], np.empty((len(FIELDS), 0, 0), dtype=np.float32))
+
+    @classmethod
+    def from_download(cls, frame, tickers):
+        """Build a panel from a yf.download frame (columns: field x ticker)"""
+        tickers = list(tickers)
+        if frame is None or frame.empty:
+            return cls.empty()
+        if not isinstance(frame.columns, pd.MultiIndex):
+            frame = pd.concat({tickers[0]: frame}, axis=1).swaplevel(axis=1)
+        index = pd.DatetimeIndex(frame.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        values = np.stack([
+            frame[field].reindex(columns=tickers).to_numpy(dtype=np.float32, na_value=np.nan)
+            if field in frame.columns.get_level_values(0)
+            else np.full((len(index), len(tickers)), np.nan, dtype=np.float32)
+            for field in FIELDS
+        ])
+        return cls(index.normalize(), tickers, values)
+
+    def __contains__(self, ticker):
+        return ticker in self._pos
+
+    def __len__(self):
+        return len(self.tickers)
+
+    @property
+    def last_date(self):
+        return self.index[-1] if len(self.index) else None
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes
+
+    def frame(self, field='Close'):
+        """Dates x tickers DataFrame for one field (a view, no copy)"""
+        return pd.DataFrame(self.values[FIELDS.index(field)], index=self.index, columns=self.tickers, copy=False)
+
+    def history(self, ticker, start=None):
+        """Per-ticker OHLCV DataFrame shaped like yf.Ticker(...).history()"""
+        j = self._pos[ticker]
+        hist = pd.DataFrame(self.values[:, :, j].T, index=self.index, columns=list(FIELDS))
+        if start is not None:
+            hist = hist[hist.index >= start]
+        return hist.dropna(subset=['Close'])
+
+    def last_bars(self, tickers):
+        """Date of each ticker's last bar with a Close (None when it has none)"""
+        if not tickers:
+            return {}
+        closes = self.values[FIELDS.index('Close')][:, [self._pos[t] for t in tickers]]
+        valid = ~np.isnan(closes)
+        last = len(self.index) - 1 - np.argmax(valid[::-1], axis=0)
+        return {t: self.index[i] if valid[:, k].any() else None for k, (t, i) in enumerate(zip(tickers, last))}
+
+    def select(self, tickers):
+        """Sub-panel with only the given tickers (unknown tickers are NaN)"""
+        tickers = list(tickers)
+        cols = [self._pos.get(t, -1) for t in tickers]
+        values = np.full((len(FIELDS), len(self.index), len(tickers)), np.nan, dtype=np.float32)
+        for k, j in enumerate(cols):
+            if j >= 0:
+                values[:, :, k] = self.values[:, :, j]
+        return PricePanel(self.index, tickers, values)
+
+    def combine(self, other):
+        """Union of both panels; bars present in ``other`` overwrite this panel's"""
+        if not len(other.index) or not other.tickers:
+            return self
+        if not len(self.index) or not self.tickers:
+            return other
+        index = self.index.union(other.index)
+        tickers = self.tickers + [t for t in other.tickers if t not in self._pos]
+        values = np.full((len(FIELDS), len(index), len(tickers)), np.nan, dtype=np.float32)
+        rows = index.get_indexer(self.index)
+        values[:, rows, :len(self.tickers)] = self.values
+        rows = index.get_indexer(other.index)
+        cols = [tickers.index(t) for t in other.tickers]
+        incoming = values[:, rows][:, :, cols]
+        values[np.ix_(np.arange(len(FIELDS)), rows, cols)] = np.where(np.isnan(other.values), incoming, other.values)
+        return PricePanel(index, tickers, values)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp, index=self.index.to_numpy(dtype='datetime64[ns]'), tickers=np.array(self.tickers, dtype=str), values=self.values)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(pd.DatetimeIndex(data['index']), data['tickers'].tolist(), data['values'])
+
+
+class HistoryStore:
+    """Persistent price panel with batched downloads and incremental top-up (in memory only when ``path`` is None)
+
+    Only the requested tickers are downloaded or topped up, each at most once
+    per ``refresh_interval``. Tickers whose download comes back empty are
+    remembered for the same interval instead of being re-requested every call.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, lookback=DEFAULT_LOOKBACK, batch_size=DEFAULT_BATCH_SIZE,
+                 refresh_interval=DEFAULT_REFRESH_INTERVAL, downloader=yf_download):
+        self.path = path
+        self.lookback = lookback
+        self.batch_size = batch_size
+        self.refresh_interval = refresh_interval
+        self.downloader = downloader
+        self._lock = threading.Lock()        # guards the panel and the bookkeeping below, never held over I/O
+        self._save_lock = threading.Lock()
+        self._checked = {}                   # ticker -> time of its last download or top-up
+        self._empty = {}                     # ticker -> time its download last came back empty
+        self._inflight = {}                  # ticker -> Event set once its download is merged
+        self._version = self._saved = 0
+        try:
+            self.panel = PricePanel.load(path) if path else PricePanel.empty()
+        except (OSError, KeyError, ValueError):
+            self.panel = PricePanel.empty()
+
+    def _download(self, tickers, **kwargs):
+        panel = PricePanel.empty()
+        for i in range(0, len(tickers), self.batch_size):
+            batch = tickers[i:i + self.batch_size]
+            panel = panel.combine(PricePanel.from_download(self.downloader(batch, **kwargs), batch))
+        return panel
+
+    def _fetch(self, panel, missing, due):
+        """Download new tickers over the lookback and top up due ones from their last cached bar"""
+        incoming = self._download(missing, period=self.lookback) if missing else PricePanel.empty()
+        groups = {}
+        for ticker, last in panel.last_bars(due).items():
+            groups.setdefault(last, []).append(ticker)
+        for last, group in groups.items():
+            # Re-fetch from the last cached bar so a partial intraday bar is replaced
+            kwargs = {'start': last.strftime("%Y-%m-%d")} if last is not None else {'period': self.lookback}
+            incoming = incoming.combine(self._download(group, **kwargs))
+        return incoming
+
+    def _save(self, panel, version):
+        """Persist a panel snapshot unless a newer one has already been written"""
+        with self._save_lock:
+            if version > self._saved:
+                panel.save(self.path)
+                self._saved = version
+
+    def get_panel(self, tickers, refresh=True):
+        """Panel for the given tickers, downloading new names and topping up stale bars"""
+        tickers = list(dict.fromkeys(tickers))
+        now = time.time()
+        recent = now - self.refresh_interval
+        with self._lock:
+            panel = self.panel
+            waits = {self._inflight[t] for t in tickers if t in self._inflight and t not in panel}
+            todo = [t for t in tickers if t not in self._inflight]
+            missing = [t for t in todo if t not in panel and self._empty.get(t, 0) < recent]
+            due = [t for t in todo if t in panel and self._checked.get(t, 0) < recent] if refresh else []
+            done = threading.Event()
+            for t in missing + due:
+                self._inflight[t] = done
+
+        incoming, snapshot = None, None
+        try:
+            if missing or due:
+                incoming = self._fetch(panel, missing, due)
+        finally:
+            if missing or due:
+                with self._lock:
+                    for t in missing + due:
+                        self._inflight.pop(t, None)
+                    if incoming is not None:
+                        self._checked.update(dict.fromkeys(missing + due, now))
+                        got = incoming.last_bars(incoming.tickers)
+                        self._empty.update((t, now) for t in missing if got.get(t) is None)
+                        kept = [t for t in incoming.tickers if got[t] is not None]
+                        if kept:
+                            self.panel = self.panel.combine(incoming.select(kept))
+                            self._version += 1
+                            snapshot = (self.panel, self._version)
+                done.set()
+        if snapshot and self.path:
+            self._save(*snapshot)
+        for event in waits:
+            event.wait()   # another caller is downloading a ticker we have no bars for yet
+        with self._lock:
+            return self.panel.select(tickers)
+
+    def get_history(self, ticker, period):
+        """Per-ticker OHLCV for a yfinance period string, served from the panel"""
+        start = period_start(period)
+        if start < period_start(self.lookback):
+            panel = self._download([ticker], period=period)
+            return panel.history(ticker) if ticker in panel else pd.DataFrame(columns=list(FIELDS))
+        return self.get_panel([ticker]).history(ticker, start=start)
@@ -0,0 +1,286 @@
+import gzip
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+
+import pandas as pd
+
+from price_history import FIELDS, period_start, yf_download
+
+# --------------------------
+# Market data providers
+# --------------------------
+# Quotes, fundamentals (.info dicts), daily history and index constituents
+# all come from one DataProvider, so the pipeline never talks to yfinance
+# directly. YahooProvider is the live feed. RecordingProvider wraps another
+# provider and saves every response as gzip files under a recordings
+# directory; ReplayProvider serves those files back with configurable
+# synthetic latency, so scans and benchmarks run offline and
+# deterministically. Another feed plugs in by subclassing DataProvider and
+# calling set_provider() (or adding it to PROVIDERS for DATA_PROVIDER).
+# Only a live provider reads and writes the app's fundamentals cache and
+# price panel, and saves scans, snapshots and constituents where the app
+# looks for them. Any other provider bypasses the caches, so every request
+# reaches it (a recording is complete, a replay pays its latency), and keeps
+# its scans, snapshots and constituents in a subdirectory of its own.
+
+RECORDING_DIR = os.getenv(
+    "DATA_RECORDING_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "recordings"),
+)
+REPLAY_LATENCY = float(os.getenv("REPLAY_LATENCY_MS", "0")) / 1000   # seconds per replayed call
+REPLAY_JITTER = float(os.getenv("REPLAY_JITTER_MS", "0")) / 1000     # uniform extra, 0..jitter
+
+_SAFE_RE = re.compile(r"[^A-Za-z0-9._^=-]")
+
+
+class RecordingNotFound(LookupError):
+    """Raised by ReplayProvider for a request that was never recorded"""
+
+
+class DataProvider:
+    """Interface every market data source implements"""
+
+    label = "custom provider"
+    rate_limited = False   # route calls through the shared upstream throttle
+    live = False           # the app's live feed: shares the on-disk caches, saved scans and snapshots
+    namespace = None       # subdirectory for a non-live provider's data (default: the class name)
+
+    def info(self, ticker):
+        """yfinance-style ``.info`` dict (fundamentals and latest quote fields)"""
+        raise NotImplementedError
+
+    def quote(self, ticker):
+        """Latest price; providers with a cheaper quote endpoint override this"""
+        info = self.info(ticker)
+        return info.get('regularMarketPrice', info.get('currentPrice'))
+
+    def download(self, tickers, **kwargs):
+        """Daily OHLCV for several tickers, shaped like ``yf.download`` (columns: field x ticker)
+
+        Accepts ``period=`` (a yfinance period string) or ``start=`` (a date).
+        """
+        raise NotImplementedError
+
+    def constituents(self, universe):
+        """Normalized constituent table (Ticker, Name, Sector, Sub_Industry) for a named universe"""
+        raise NotImplementedError
+
+
+class YahooProvider(DataProvider):
+    """Live Yahoo Finance data via yfinance; constituents scraped from Wikipedia"""
+
+    label = "Yahoo Finance via yfinance"
+    rate_limited = True
+    live = True
+
+    def info(self, ticker):
+        import yfinance as yf
+        return yf.Ticker(ticker).info
+
+    def quote(self, ticker):
+        import yfinance as yf
+        return yf.Ticker(ticker).fast_info['lastPrice']
+
+    def download(self, tickers, **kwargs):
+        return yf_download(tickers, **kwargs)
+
+    def constituents(self, universe):
+        from constituents import scrape_constituents
+        return scrape_constituents(universe)
+
+
+class _RecordingFiles:
+    """Layout of a recordings directory: info/, history/ and constituents/ gzip files"""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def path(self, kind, name, ext):
+        return os.path.join(self.directory, kind, f"{_SAFE_RE.sub('_', name)}.{ext}.gz")
+
+    def write_text(self, kind, name, ext, write):
+        path = self.path(kind, name, ext)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        write(tmp)
+        os.replace(tmp, path)
+
+    def read_history(self, ticker):
+        path = self.path('history', ticker, 'csv')
+        if not os.path.exists(path):
+            return None
+        return pd.read_csv(path, index_col=0, parse_dates=True, compression='gzip')
+
+
+class RecordingProvider(DataProvider):
+    """Pass-through to ``inner`` that saves every response under ``directory``"""
+
+    def __init__(self, inner, directory=RECORDING_DIR):
+        self.inner = inner
+        self.files = _RecordingFiles(directory)
+        self.label = f"{inner.label} (recording to {directory})"
+        self.rate_limited = inner.rate_limited
+        self.namespace = f"record-{_digest(directory)}"
+        self._lock = threading.Lock()
+
+    def info(self, ticker):
+        info = self.inner.info(ticker)
+        self.files.write_text('info', ticker, 'json', lambda tmp: _write_json(tmp, info))
+        return info
+
+    def download(self, tickers, **kwargs):
+        frame = self.inner.download(tickers, **kwargs)
+        if frame is None or frame.empty:
+            return frame
+        tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        with self._lock:   # read-merge-write per ticker; batches may overlap
+            for ticker, hist in _split_download(frame, tickers).items():
+                previous = self.files.read_history(ticker)
+                if previous is not None:
+                    hist = hist.combine_first(previous)
+                self.files.write_text('history', ticker, 'csv',
+                                      lambda tmp, hist=hist: hist.to_csv(tmp, compression='gzip'))
+        return frame
+
+    def constituents(self, universe):
+        table = self.inner.constituents(universe)
+        self.files.write_text('constituents', universe, 'csv',
+                              lambda tmp: table.to_csv(tmp, index=False, compression='gzip'))
+        return table
+
+
+class ReplayProvider(DataProvider):
+    """Serves a recordings directory, sleeping ``latency`` (+ up to ``jitter``) seconds per call
+
+    History periods are measured back from the newest recorded bar rather
+    than from today, so a replay gives the same panel on any date.
+    """
+
+    def __init__(self, directory=RECORDING_DIR, latency=REPLAY_LATENCY, jitter=REPLAY_JITTER, seed=None):
+        self.files = _RecordingFiles(directory)
+        self.latency = latency
+        self.jitter = jitter
+        self.label = f"replay of {directory}"
+        self.namespace = f"replay-{_digest(directory)}"
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._history = {}
+        self._history_lock = threading.Lock()
+
+    def _delay(self):
+        delay = self.latency
+        if self.jitter:
+            with self._rng_lock:
+                delay += self._rng.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def info(self, ticker):
+        self._delay()
+        path = self.files.path('info', ticker, 'json')
+        try:
+            return _read_json(path)
+        except FileNotFoundError:
+            raise RecordingNotFound(f"no recorded info for {ticker}") from None
+
+    def _load_history(self, ticker):
+        with self._history_lock:
+            if ticker not in self._history:
+                self._history[ticker] = self.files.read_history(ticker)
+            return self._history[ticker]
+
+    def download(self, tickers, period=None, start=None, **kwargs):
+        self._delay()
+        tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        frames = {t: h for t in tickers if (h := self._load_history(t)) is not None and len(h)}
+        if not frames:
+            return pd.DataFrame()
+        if start is None and period is not None:
+            start = period_start(period, now=max(h.index[-1] for h in frames.values()))
+        if start is not None:
+            frames = {t: h[h.index >= pd.Timestamp(start)] for t, h in frames.items()}
+        return pd.concat(frames, axis=1).swaplevel(axis=1).sort_index(axis=1)
+
+    def constituents(self, universe):
+        self._delay()
+        path = self.files.path('constituents', universe, 'csv')
+        try:
+            return pd.read_csv(path, keep_default_na=False, compression='gzip')
+        except FileNotFoundError:
+            raise RecordingNotFound(f"no recorded constituents for {universe}") from None
+
+
+def _digest(directory):
+    return hashlib.sha1(os.path.abspath(directory).encode("utf-8")).hexdigest()[:10]
+
+
+def _write_json(path, obj):
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(obj, f, default=str)
+
+
+def _read_json(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _split_download(frame, tickers):
+    """{ticker: OHLCV DataFrame} from a yf.download frame, dropping tickers without bars"""
+    if not isinstance(frame.columns, pd.MultiIndex):
+        frame = pd.concat({tickers[0]: frame}, axis=1).swaplevel(axis=1)
+    fields = [f for f in FIELDS if f in frame.columns.get_level_values(0)]
+    out = {}
+    for ticker in tickers:
+        if ticker not in frame.columns.get_level_values(1):
+            continue
+        hist = frame.xs(ticker, axis=1, level=1)[fields].dropna(how='all').copy()
+        if len(hist):
+            index = pd.DatetimeIndex(hist.index)
+            if index.tz is not None:
+                index = index.tz_localize(None)
+            hist.index = index.normalize().rename('Date')
+            out[ticker] = hist
+    return out
+
+
+PROVIDERS = {
+    'yahoo': YahooProvider,
+    'record': lambda: RecordingProvider(YahooProvider()),
+    'replay': ReplayProvider,
+}
+
+_provider = None
+_lock = threading.Lock()
+
+
+def set_provider(provider):
+    """Install the process-wide provider (returns the previous one)"""
+    global _provider
+    with _lock:
+        previous, _provider = _provider, provider
+        return previous
+
+
+def get_provider():
+    """Process-wide provider, chosen by DATA_PROVIDER (yahoo, record or replay) on first use"""
+    global _provider
+    with _lock:
+        if _provider is None:
+            name = os.getenv("DATA_PROVIDER", "yahoo")
+            if name not in PROVIDERS:
+                raise ValueError(f"unknown DATA_PROVIDER {name!r}; expected one of {', '.join(PROVIDERS)}")
+            _provider = PROVIDERS[name]()
+        return _provider
+
+
+def provider_dir(directory, provider=None):
+    """``directory`` for the live provider, else the provider's own subdirectory of it"""
+    provider = provider or get_provider()
+    if provider.live:
+        return directory
+    return os.path.join(directory, provider.namespace or type(provider).__name__.lower())
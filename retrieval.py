@@ -0,0 +1,229 @@
+import hashlib
+import os
+import re
+
+import numpy as np
+
+from metrics import timed
+
+# --------------------------
+# Framework guide retrieval (BM25)
+# --------------------------
+# The framework book is split into passages of a few paragraphs, each
+# tagged with its chapter, and indexed with Okapi BM25 as term -> posting
+# arrays. The index is persisted next to the other caches and rebuilt only
+# when the book text changes. A question is answered locally only when the
+# best passage both covers most of the question's (idf-weighted) terms and
+# has a strong absolute BM25 score, and the question is about the book at
+# all: questions about the app itself, live market data or buy/sell advice
+# always go to the remote chatbot, with the top passages as grounding.
+
+INDEX_PATH = os.getenv(
+    "FRAMEWORK_INDEX_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "framework_index.npz"),
+)
+INDEX_VERSION = 1
+PASSAGE_WORDS = 150
+K1 = 1.2
+B = 0.75
+CONFIDENCE_THRESHOLD = float(os.getenv("RETRIEVAL_CONFIDENCE", "0.6"))
+MIN_SCORE = float(os.getenv("RETRIEVAL_MIN_SCORE", "4.0"))   # BM25; one or two common words score ~1-3.5
+ANSWER_SENTENCES = 3
+
+SECTION_RE = re.compile(r"^(Introduction|Chapter [A-Z][a-z]+: .+|The Algorithm|Bibliography|Acknowledgments|About the Author)$")
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:/[a-z0-9]+)?")
+SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+# Questions the book cannot answer however well their words match a passage:
+# how the app works, live data about a company, and buy/sell advice
+REMOTE_ONLY_RE = re.compile(
+    r"\b(?:app|scan|screener|sidebar|button|slider|tab|mode|export|download|csv|chart|"
+    r"valuation score|framework score|weights?|calculated|computed|"
+    r"price of|quote|ticker|today|latest|news|ceo|"
+    r"buy|sell|should i)\b",
+    re.IGNORECASE,
+)
+STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be because been before being below between both but by
+can could did do does doing down during each few for from further had has have having he her here hers him his how
+i if in into is it its itself just me more most my no nor not now of off on once only or other our out over own same
+she should so some such than that the their them then there these they this those through to too under until up
+very was we were what when where which while who whom why will with would you your yours mean means tell explain
+""".split())
+
+
+def tokenize(text):
+    """Lower-case word tokens without stopwords, with a light plural strip ("margins" -> "margin")"""
+    tokens = []
+    for token in TOKEN_RE.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def split_passages(text, passage_words=PASSAGE_WORDS):
+    """(section, passage) pairs: consecutive paragraphs of one section, ~passage_words each"""
+    passages, section, buffer, words = [], "Introduction", [], 0
+    in_contents = False
+
+    def flush():
+        if buffer:
+            passages.append((section, "\n".join(buffer)))
+        buffer.clear()
+
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line == "Table of Contents":
+            in_contents = True
+            continue
+        if SECTION_RE.match(line):
+            in_contents = False
+            flush()
+            section, words = line, 0
+            continue
+        if in_contents or "\t" in line and line.rsplit("\t", 1)[-1].isdigit():
+            continue  # table-of-contents entries
+        buffer.append(line)
+        words += len(line.split())
+        if words >= passage_words:
+            flush()
+            words = 0
+    flush()
+    return passages
+
+
+class FrameworkIndex:
+    """BM25 index over framework passages, stored as CSR postings (term -> docs, tfs)"""
+
+    def __init__(self, sections, passages, vocab, indptr, doc_ids, tfs, doc_len, source_hash):
+        self.sections = list(sections)
+        self.passages = list(passages)
+        self.vocab = {term: i for i, term in enumerate(vocab)}
+        self.indptr = indptr
+        self.doc_ids = doc_ids
+        self.tfs = tfs
+        self.doc_len = doc_len
+        self.source_hash = source_hash
+        n = len(self.passages)
+        df = np.diff(indptr)
+        self.idf = np.log(1 + (n - df + 0.5) / (df + 0.5))
+        self.max_idf = float(np.log(1 + (n + 0.5) / 0.5))  # a term that occurs nowhere
+        self.avg_len = float(doc_len.mean()) if n else 0.0
+
+    @classmethod
+    def build(cls, text, source_hash=None):
+        pairs = split_passages(text)
+        postings = {}
+        doc_len = np.zeros(len(pairs), dtype=np.float32)
+        for doc, (section, passage) in enumerate(pairs):
+            tokens = tokenize(f"{section} {passage}")
+            doc_len[doc] = len(tokens)
+            for term in tokens:
+                counts = postings.setdefault(term, {})
+                counts[doc] = counts.get(doc, 0) + 1
+        vocab = sorted(postings)
+        indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(postings[t]) for t in vocab])
+        doc_ids = np.fromiter((d for t in vocab for d in postings[t]), dtype=np.int32, count=indptr[-1])
+        tfs = np.fromiter((c for t in vocab for c in postings[t].values()), dtype=np.float32, count=indptr[-1])
+        return cls([s for s, _ in pairs], [p for _, p in pairs], vocab, indptr, doc_ids, tfs, doc_len,
+                   source_hash or _hash(text))
+
+    def save(self, path=INDEX_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez_compressed(tmp, sections=np.array(self.sections), passages=np.array(self.passages),
+                            vocab=np.array(sorted(self.vocab, key=self.vocab.get)), indptr=self.indptr,
+                            doc_ids=self.doc_ids, tfs=self.tfs, doc_len=self.doc_len,
+                            meta=np.array([self.source_hash, str(INDEX_VERSION)]))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=INDEX_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            source_hash, version = data['meta']
+            if int(version) != INDEX_VERSION:
+                raise ValueError("index version mismatch")
+            return cls(data['sections'], data['passages'], data['vocab'], data['indptr'], data['doc_ids'],
+                       data['tfs'], data['doc_len'], str(source_hash))
+
+    @classmethod
+    def load_or_build(cls, source_path, path=INDEX_PATH):
+        """Load the persisted index if it matches the source text, else rebuild and save it"""
+        with open(source_path, encoding="utf-8") as f:
+            text = f.read()
+        source_hash = _hash(text)
+        try:
+            index = cls.load(path)
+            if index.source_hash == source_hash:
+                return index
+        except (OSError, ValueError, KeyError):
+            pass
+        index = cls.build(text, source_hash)
+        try:
+            index.save(path)
+        except OSError:
+            pass  # read-only deployment: keep the in-memory index
+        return index
+
+    def _terms(self, question):
+        terms = list(dict.fromkeys(tokenize(question)))
+        ids = [self.vocab.get(t) for t in terms]
+        weights = np.array([self.idf[i] if i is not None else self.max_idf for i in ids])
+        return terms, ids, weights
+
+    def scores(self, question):
+        """BM25 score of every passage for ``question``"""
+        scores = np.zeros(len(self.passages))
+        norm = K1 * (1 - B + B * self.doc_len / max(self.avg_len, 1e-9))
+        for i in self._terms(question)[1]:
+            if i is None:
+                continue
+            docs = self.doc_ids[self.indptr[i]:self.indptr[i + 1]]
+            tf = self.tfs[self.indptr[i]:self.indptr[i + 1]]
+            scores[docs] += self.idf[i] * tf * (K1 + 1) / (tf + norm[docs])
+        return scores
+
+    def search(self, question, k=3):
+        """Top ``k`` passages as dicts with section, text, score and confidence
+
+        Confidence is the idf-weighted share of the question's terms that
+        appear in the passage (unknown terms count with the maximum idf).
+        """
+        terms, ids, weights = self._terms(question)
+        if not terms or not self.passages:
+            return []
+        scores = self.scores(question)
+        top = np.argsort(-scores, kind='stable')[:k]
+        hits = []
+        for doc in top:
+            if scores[doc] <= 0:
+                break
+            present = np.array([i is not None and doc in self._docs(i) for i in ids])
+            hits.append({'section': self.sections[doc], 'text': self.passages[doc], 'score': float(scores[doc]),
+                         'confidence': float(weights[present].sum() / weights.sum())})
+        return hits
+
+    def _docs(self, term_id):
+        return set(self.doc_ids[self.indptr[term_id]:self.indptr[term_id + 1]].tolist())
+
+    @timed('chat.retrieval')
+    def answer(self, question, threshold=CONFIDENCE_THRESHOLD, sentences=ANSWER_SENTENCES, min_score=MIN_SCORE):
+        """``(answer, passages)``: a local answer when confident (else None) plus the top passages"""
+        hits = self.search(question)
+        if (not hits or REMOTE_ONLY_RE.search(question)
+                or hits[0]['confidence'] < threshold or hits[0]['score'] < min_score):
+            return None, hits
+        terms = set(tokenize(question))
+        best = SENTENCE_RE.split(hits[0]['text'].replace("\n", " "))
+        ranked = sorted(range(len(best)), key=lambda j: -len(terms.intersection(tokenize(best[j]))))[:sentences]
+        excerpt = " ".join(best[j] for j in sorted(ranked))
+        return f"📖 From the framework guide ({hits[0]['section']}): {excerpt}", hits
+
+
+def _hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
@@ -0,0 +1,160 @@
+"""Headless universe scan: fetch, score and rank without starting the Streamlit UI
+
+Examples:
+    python scan.py --universe sp500 --workers 32 --out results.parquet
+    python scan.py --universe my_watchlist.csv --top 20
+    python scan.py --universe sp500 --incremental --publish
+    python scan.py --universe sp500 --every 3600      # run as the background scan worker
+    python scan.py --universe sp500 --metrics stages.prom
+    python scan.py --universe sp500 --incremental --where "PE_Ratio < 15 and ROE > 20 and Sector == 'Industrials'"
+    python scan.py --universe sp500 --provider record --recordings rec/   # capture live responses
+    python scan.py --universe sp500 --provider replay --recordings rec/ --replay-latency 50
+"""
+import argparse
+import os
+import sys
+import time
+
+from capm import BETA_WINDOW
+from constituents import UNIVERSES, get_tickers
+from fetch_engine import DEFAULT_TIMEOUT, DEFAULT_WORKERS
+from incremental_scan import load_scan, save_scan
+from metrics import JSONL_PATH, registry
+from monte_carlo import DEFAULT_PATHS
+from pipeline import get_throttle, run_scan
+from providers import (PROVIDERS, RECORDING_DIR, REPLAY_JITTER, REPLAY_LATENCY, RecordingProvider,
+                       ReplayProvider, YahooProvider, get_provider, set_provider)
+from scheduler import ScanScheduler, SnapshotStore
+from screener import ScreenerIndex, parse_query
+
+SUMMARY_COLS = ['Ticker', 'Name', 'Sector', 'Current_Price', 'PE_Ratio', 'PB_Ratio', 'ROE', 'MC_P50', 'Valuation_Score',
+               'Framework_Score']
+
+
+def write_results(df, path):
+    """Write results, picking the format from the file extension"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.parquet':
+        df.to_parquet(path, index=False)  # requires pyarrow or fastparquet
+    elif ext == '.csv':
+        df.to_csv(path, index=False)
+    elif ext == '.json':
+        df.to_json(path, orient='records', indent=2)
+    else:
+        raise ValueError(f"unsupported output format {ext!r} (use .parquet, .csv or .json)")
+
+
+def _store_key(universe):
+    """Key used for saved scans: the universe name, or the CSV file's base name"""
+    return universe if universe in UNIVERSES else os.path.splitext(os.path.basename(universe))[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter,
+                                     epilog="\n".join(__doc__.splitlines()[2:]))
+    parser.add_argument("--universe", default="sp500",
+                        help=f"one of {', '.join(UNIVERSES)} or a path to a CSV with a Ticker column")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="concurrent Yahoo requests")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds per ticker attempt")
+    parser.add_argument("--mc-paths", type=int, default=DEFAULT_PATHS,
+                        help="Monte Carlo paths per ticker for intrinsic-value bands (0 to disable)")
+    parser.add_argument("--beta-window", type=int, default=BETA_WINDOW, metavar="DAYS",
+                        help="estimate CAPM betas over the latest DAYS-day rolling window "
+                             "(default: $CAPM_BETA_WINDOW, 0 = the whole one-year lookback)")
+    parser.add_argument("--out", help="write all scored rows to .parquet, .csv or .json")
+    parser.add_argument("--top", type=int, default=10, help="print the top N rows (0 to disable)")
+    parser.add_argument("--where", metavar="QUERY",
+                        help="only print rows matching a screener filter, e.g. \"PE_Ratio < 15 and ROE > 20\"")
+    parser.add_argument("--incremental", action="store_true",
+                        help="reprice the last saved scan and only refetch expired fundamentals")
+    parser.add_argument("--publish", action="store_true",
+                        help="publish the result as the snapshot the app shows (live data only)")
+    parser.add_argument("--every", type=float, metavar="SECONDS",
+                        help="keep running and re-publish a snapshot every SECONDS (worker mode)")
+    parser.add_argument("--metrics", default=JSONL_PATH or None, metavar="PATH",
+                        help="after each run, write stage timings as Prometheus text (.prom/.txt) "
+                             "or append them as JSON lines (default: $METRICS_JSONL_PATH)")
+    parser.add_argument("--provider", choices=list(PROVIDERS),
+                        help="data source: live yahoo, record (live, saving responses) or offline replay "
+                             "(default: $DATA_PROVIDER or yahoo)")
+    parser.add_argument("--recordings", default=RECORDING_DIR, metavar="DIR",
+                        help="recordings directory for --provider record/replay")
+    parser.add_argument("--replay-latency", type=float, default=REPLAY_LATENCY * 1000, metavar="MS",
+                        help="synthetic latency per replayed call")
+    parser.add_argument("--replay-jitter", type=float, default=REPLAY_JITTER * 1000, metavar="MS",
+                        help="extra uniform random latency per replayed call")
+    args = parser.parse_args(argv)
+    if args.where:
+        try:
+            parse_query(args.where)
+        except ValueError as e:
+            parser.error(f"--where: {e}")
+
+    if args.provider == 'yahoo':
+        set_provider(YahooProvider())
+    elif args.provider == 'record':
+        set_provider(RecordingProvider(YahooProvider(), args.recordings))
+    elif args.provider == 'replay':
+        set_provider(ReplayProvider(args.recordings, args.replay_latency / 1000, args.replay_jitter / 1000))
+    if args.publish and not get_provider().live:
+        parser.error(f"--publish only publishes live data, not {get_provider().label}; use --out instead")
+
+    if args.every:
+        if args.universe not in UNIVERSES:
+            parser.error("--every needs a named universe")
+
+        def job(universe, previous):
+            return run_scan(get_tickers(universe), previous, workers=args.workers, timeout=args.timeout,
+                            monte_carlo_paths=args.mc_paths, beta_window=args.beta_window)
+
+        scheduler = ScanScheduler(job, [args.universe], SnapshotStore(), interval=args.every)
+        print(f"Publishing {args.universe} snapshots every {args.every:.0f}s (Ctrl+C to stop)", file=sys.stderr)
+        try:
+            while True:
+                meta = scheduler.run_once(args.universe)
+                if meta:
+                    print(f"published {meta['rows']} rows in {meta['duration']:.1f}s", file=sys.stderr)
+                    if args.metrics:
+                        registry.write(args.metrics)
+                time.sleep(min(30, args.every))
+        except KeyboardInterrupt:
+            return 0
+
+    key = _store_key(args.universe)
+    tickers = get_tickers(args.universe)
+    previous = load_scan(key) if args.incremental else None
+    start = time.perf_counter()
+    df = run_scan(tickers, previous, workers=args.workers, timeout=args.timeout, monte_carlo_paths=args.mc_paths,
+                  beta_window=args.beta_window)
+    elapsed = time.perf_counter() - start
+    print(f"{len(df)}/{len(tickers)} tickers scored in {elapsed:.1f}s "
+          f"({len(df) / elapsed if elapsed else 0:.1f} rows/s)", file=sys.stderr)
+    failed = df.attrs.get('failed', [])
+    if failed:
+        stats = get_throttle().stats()
+        print(f"{len(failed)} tickers could not be fetched ({stats['throttled']} throttled responses, "
+              f"{stats['retried']} retried): {' '.join(failed)}", file=sys.stderr)
+    if args.metrics:
+        registry.write(args.metrics)
+    if not len(df):
+        return 1
+
+    save_scan(df, key)
+    if args.publish and args.universe in UNIVERSES:
+        SnapshotStore().publish(args.universe, df, source="cli", duration=elapsed)
+    if args.out:
+        write_results(df, args.out)
+    if args.top:
+        try:
+            shown = ScreenerIndex(df).query(args.where, 'Valuation_Score', ascending=False) if args.where else df
+        except ValueError as e:
+            print(f"--where: {e}", file=sys.stderr)
+            return 2
+        cols = [c for c in SUMMARY_COLS if c in shown]
+        print(shown[cols].head(args.top).to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+from providers import provider_dir
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process coordination only
+    fcntl = None
+
+# --------------------------
+# Background scan scheduler
+# --------------------------
+# A universe scan is computed periodically outside the request path and
+# published as an immutable, timestamped snapshot. The UI just reads the
+# latest snapshot. A lock file makes sure only one process on the host runs
+# the scan per interval, however many Streamlit sessions or workers exist.
+
+DEFAULT_DIR = os.getenv(
+    "SNAPSHOT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "snapshots"),
+)
+DEFAULT_INTERVAL = 3600  # seconds
+KEEP_SNAPSHOTS = 5
+
+
+class SnapshotStore:
+    """Immutable scan snapshots on disk with a 'latest' pointer per universe
+
+    Without an explicit ``root``, snapshots of a non-live provider go to its
+    own subdirectory (see providers.provider_dir), never where the app
+    reads live snapshots from.
+    """
+
+    def __init__(self, root=None, keep=KEEP_SNAPSHOTS):
+        self.root = root or provider_dir(DEFAULT_DIR)
+        self.keep = keep
+        self._lock = threading.Lock()
+        self._loaded = {}  # universe -> (path, df, meta)
+
+    def _dir(self, universe):
+        return os.path.join(self.root, universe)
+
+    def publish(self, universe, df, **meta):
+        """Write a new snapshot and atomically point 'latest' at it"""
+        directory = self._dir(universe)
+        os.makedirs(directory, exist_ok=True)
+        created_at = time.time()
+        name = f"{int(created_at * 1000)}.pkl"
+        tmp = os.path.join(directory, f".{name}.{os.getpid()}.tmp")
+        df.to_pickle(tmp)
+        os.replace(tmp, os.path.join(directory, name))
+        meta = {**meta, 'universe': universe, 'file': name, 'created_at': created_at, 'rows': len(df)}
+        pointer = os.path.join(directory, "latest.json")
+        with open(f"{pointer}.{os.getpid()}.tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(f"{pointer}.{os.getpid()}.tmp", pointer)
+        self._prune(directory)
+        return meta
+
+    def _prune(self, directory):
+        snapshots = sorted(n for n in os.listdir(directory) if n.endswith(".pkl") and not n.startswith("."))
+        for name in snapshots[:-self.keep]:
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+
+    def latest_meta(self, universe):
+        try:
+            with open(os.path.join(self._dir(universe), "latest.json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def latest(self, universe):
+        """Return (df, meta) for the newest snapshot, or (None, None)
+
+        The frame is shared between callers and must be treated as read-only.
+        """
+        meta = self.latest_meta(universe)
+        if meta is None:
+            return None, None
+        path = os.path.join(self._dir(universe), meta['file'])
+        with self._lock:
+            cached = self._loaded.get(universe)
+            if cached and cached[0] == path:
+                return cached[1], cached[2]
+        try:
+            df = pd.read_pickle(path)
+        except (OSError, ValueError, EOFError):
+            return None, None
+        with self._lock:
+            self._loaded[universe] = (path, df, meta)
+        return df, meta
+
+
+class _FileLock:
+    """Non-blocking exclusive lock on a file; acquired is False if another process holds it"""
+
+    def __init__(self, path):
+        self.path = path
+        self.acquired = False
+        self._f = None
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._f = open(self.path, "a")
+        if fcntl is None:
+            self.acquired = True
+            return self
+        try:
+            fcntl.flock(self._f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            self.acquired = True
+        except OSError:
+            self.acquired = False
+        return self
+
+    def __exit__(self, *exc):
+        if self.acquired and fcntl is not None:
+            fcntl.flock(self._f, fcntl.LOCK_UN)
+        self._f.close()
+
+
+class ScanScheduler:
+    """Runs ``job(universe, previous_df)`` every ``interval`` seconds and publishes the result
+
+    ``job`` returns the scored DataFrame for the universe; ``previous_df`` is
+    the last published snapshot (or None), so the job can refresh
+    incrementally.
+    """
+
+    def __init__(self, job, universes, store, interval=DEFAULT_INTERVAL, poll=30):
+        self.job = job
+        self.universes = list(universes)
+        self.store = store
+        self.interval = interval
+        self.poll = poll
+        self.last_error = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def due(self, universe):
+        meta = self.store.latest_meta(universe)
+        return meta is None or time.time() - meta['created_at'] >= self.interval
+
+    def run_once(self, universe, force=False):
+        """Scan and publish one universe unless it is fresh or another process is scanning"""
+        if not force and not self.due(universe):
+            return None
+        lock_path = os.path.join(self.store.root, f"{universe}.lock")
+        with _FileLock(lock_path) as lock:
+            if not lock.acquired or (not force and not self.due(universe)):
+                return None
+            previous, _ = self.store.latest(universe)
+            started = time.time()
+            df = self.job(universe, previous)
+            if df is None or not len(df):
+                return None
+            return self.store.publish(universe, df, duration=time.time() - started)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            for universe in self.universes:
+                try:
+                    self.run_once(universe)
+                    self.last_error = None
+                except Exception as e:
+                    self.last_error = e
+            self._stop.wait(min(self.poll, self.interval))
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="scan-scheduler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,319 @@
+import heapq
+
+import numpy as np
+import pandas as pd
+
+from metrics import timed
+
+# --------------------------
+# Valuation scoring
+# --------------------------
+# Composite valuation score from P/E, P/B, P/S, ROE, Profit Margin and
+# Dividend Yield. Each metric maps to a 0-100 sub-score and the composite is
+# the weighted mean over whichever metrics are present (non-NaN and > 0).
+
+VALUATION_METRICS = ('PE_Ratio', 'PB_Ratio', 'PS_Ratio', 'ROE', 'Profit_Margin', 'Dividend_Yield')
+
+VALUATION_WEIGHTS = {
+    'PE_Ratio': 0.25,
+    'PB_Ratio': 0.20,
+    'PS_Ratio': 0.15,
+    'ROE': 0.20,
+    'Profit_Margin': 0.10,
+    'Dividend_Yield': 0.10,
+}
+
+
+def calculate_valuation_score(row):
+    """Calculate a composite valuation score based on multiple factors"""
+    score = 0
+    weight_total = 0
+    # Lower P/E is better
+    if pd.notna(row['PE_Ratio']) and row['PE_Ratio'] > 0:
+        pe_score = max(0, 100 - (row['PE_Ratio'] - 10) * 2)
+        score += pe_score * 0.25
+        weight_total += 0.25
+    # Lower P/B is better
+    if pd.notna(row['PB_Ratio']) and row['PB_Ratio'] > 0:
+        pb_score = max(0, 100 - (row['PB_Ratio'] - 1) * 20)
+        score += pb_score * 0.20
+        weight_total += 0.20
+    # Lower P/S is better
+    if pd.notna(row['PS_Ratio']) and row['PS_Ratio'] > 0:
+        ps_score = max(0, 100 - (row['PS_Ratio'] - 1) * 15)
+        score += ps_score * 0.15
+        weight_total += 0.15
+    # Higher ROE is better
+    if pd.notna(row['ROE']) and row['ROE'] > 0:
+        roe_score = min(100, row['ROE'] * 5)
+        score += roe_score * 0.20
+        weight_total += 0.20
+    # Higher Profit Margin is better
+    if pd.notna(row['Profit_Margin']) and row['Profit_Margin'] > 0:
+        margin_score = min(100, row['Profit_Margin'] * 5)
+        score += margin_score * 0.10
+        weight_total += 0.10
+    # Higher Dividend Yield is better (bonus)
+    if pd.notna(row['Dividend_Yield']) and row['Dividend_Yield'] > 0:
+        div_score = min(100, row['Dividend_Yield'] * 20)
+        score += div_score * 0.10
+        weight_total += 0.10
+    if weight_total > 0:
+        return score / weight_total
+    return 0
+
+
+def valuation_subscores(df):
+    """Return an (n_rows, 6) array of 0-100 sub-scores, NaN where a metric is missing or <= 0
+
+    Columns follow VALUATION_METRICS.
+    """
+    raw = df.reindex(columns=list(VALUATION_METRICS)).to_numpy(dtype=float, na_value=np.nan)
+    pe, pb, ps, roe, margin, div = raw.T
+    sub = np.column_stack([
+        np.maximum(0, 100 - (pe - 10) * 2),
+        np.maximum(0, 100 - (pb - 1) * 20),
+        np.maximum(0, 100 - (ps - 1) * 15),
+        np.minimum(100, roe * 5),
+        np.minimum(100, margin * 5),
+        np.minimum(100, div * 20),
+    ])
+    with np.errstate(invalid='ignore'):
+        present = raw > 0
+    sub[~present] = np.nan
+    return sub
+
+
+def _weight_vector(weights):
+    if weights is None:
+        weights = VALUATION_WEIGHTS
+    if isinstance(weights, dict):
+        return np.array([weights.get(m, 0.0) for m in VALUATION_METRICS], dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    if weights.shape != (len(VALUATION_METRICS),):
+        raise ValueError(f"weights must have {len(VALUATION_METRICS)} entries ({', '.join(VALUATION_METRICS)})")
+    return weights
+
+
+def combine_subscores(sub, weights=None):
+    """Weighted mean of sub-scores per row, renormalized over the metrics present
+
+    Rows with no usable metric score 0. Accumulates one metric at a time in
+    the same order as calculate_valuation_score, so results match it exactly.
+    """
+    w = _weight_vector(weights)
+    present = ~np.isnan(sub)
+    score = np.zeros(sub.shape[0])
+    weight_total = np.zeros(sub.shape[0])
+    for j in range(sub.shape[1]):
+        if w[j] == 0:
+            continue
+        score += np.where(present[:, j], sub[:, j] * w[j], 0.0)
+        weight_total += np.where(present[:, j], w[j], 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(weight_total > 0, score / weight_total, 0.0)
+
+
+class Leaderboard:
+    """Best ``n`` rows seen so far by valuation score, kept in a bounded min-heap
+
+    Rows are scored one at a time as a scan delivers them (O(log n) each),
+    so a live top-N is available long before the scan finishes. Rows scoring
+    0 (no usable metric) are skipped, as in the results table; on equal
+    scores the row seen first ranks higher.
+    """
+
+    def __init__(self, n=10, score=calculate_valuation_score):
+        self.n = n
+        self.score = score
+        self.seen = 0
+        self._heap = []      # (score, -arrival, row); the root is the weakest of the current top n
+        self._arrival = {}   # ticker -> arrival, so an update keeps its place among equal scores
+
+    def __len__(self):
+        return len(self._heap)
+
+    def add(self, row):
+        self.seen += 1
+        self._arrival[row.get('Ticker')] = self.seen
+        self._push(row, self.seen)
+
+    def update(self, row):
+        """Re-score a ticker that was already added (e.g. a refetched row), replacing its entry
+
+        A ticker that falls back does not bring back rows already dropped
+        from the heap; it can only be overtaken by rows that arrive later.
+        """
+        ticker = row.get('Ticker')
+        if ticker not in self._arrival:
+            return self.add(row)
+        self._heap = [item for item in self._heap if item[2].get('Ticker') != ticker]
+        heapq.heapify(self._heap)
+        self._push(row, self._arrival[ticker])
+
+    def _push(self, row, arrival):
+        score = self.score(row)
+        if not score > 0:
+            return
+        item = (score, -arrival, row)
+        if len(self._heap) < self.n:
+            heapq.heappush(self._heap, item)
+        elif item[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, item)
+
+    def frame(self):
+        """Current top rows, best first, with a Valuation_Score column"""
+        ranked = sorted(self._heap, key=lambda item: item[:2], reverse=True)
+        return pd.DataFrame([{**row, 'Valuation_Score': score} for score, _, row in ranked])
+
+
+@timed('score.valuation')
+def score_valuation_frame(df, weights=None):
+    """Vectorized calculate_valuation_score over a whole DataFrame
+
+    ``weights`` is a dict keyed by metric name or a sequence in
+    VALUATION_METRICS order; defaults to VALUATION_WEIGHTS.
+    """
+    return pd.Series(combine_subscores(valuation_subscores(df), weights), index=df.index, name='Valuation_Score')
+
+
+# --------------------------
+# Six-factor framework score
+# --------------------------
+# The six framework factors for a whole scan frame at once, computed from
+# the already-fetched columns; the single-ticker analyzer
+# (pipeline.score_factors_auto) scores a one-row frame through the same
+# code. Each factor maps one column to 0-100 (inverted where lower is
+# better). "absolute" uses fixed bands, with a zero or missing input
+# replaced by the factor's default; "percentile" ranks across the universe
+# and "sector" within each Sector, scoring missing values a neutral 50.
+
+# factor -> (scan column, low, high, higher_is_better, default); margins and growth in %
+FRAMEWORK_FACTORS = {
+    'Customer_Value': ('Gross_Margin', 10, 70, True, 30),
+    'Unit_Economics': ('Operating_Margin', 5, 40, True, 20),
+    'TAM': ('Revenue_Growth', -10, 30, True, 10),
+    'Competition': ('PB_Ratio', 1, 15, False, 5),
+    'Risks': ('Beta', 0.5, 2.5, False, 1.2),
+    'Valuation_Score': ('PE_Ratio', 5, 60, False, 30),
+}
+
+NORMALIZATIONS = ('absolute', 'percentile', 'sector')
+
+
+def _percentile_scores(raw, groups=None):
+    """0-100 rank of each value within its column (and group); NaN stays NaN"""
+    frame = pd.DataFrame(raw)
+    if groups is None:
+        ranks, counts = frame.rank(), frame.count().to_numpy()[None, :]
+    else:
+        grouped = frame.groupby(np.asarray(groups), sort=False)
+        ranks, counts = grouped.rank(), grouped.transform('count').to_numpy()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        scores = (ranks.to_numpy() - 1) / (counts - 1) * 100
+    return np.where(counts > 1, scores, 50.0)
+
+
+def framework_factors(df, normalization='absolute'):
+    """Return an (n_rows, 6) DataFrame of 0-100 factor scores, columns in FRAMEWORK_FACTORS order"""
+    if normalization not in NORMALIZATIONS:
+        raise ValueError(f"normalization must be one of {', '.join(NORMALIZATIONS)}")
+    columns = [spec[0] for spec in FRAMEWORK_FACTORS.values()]
+    raw = df.reindex(columns=columns).apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+    higher_better = np.array([spec[3] for spec in FRAMEWORK_FACTORS.values()])
+    if normalization == 'absolute':
+        low = np.array([spec[1] for spec in FRAMEWORK_FACTORS.values()], dtype=float)
+        high = np.array([spec[2] for spec in FRAMEWORK_FACTORS.values()], dtype=float)
+        default = np.array([spec[4] for spec in FRAMEWORK_FACTORS.values()], dtype=float)
+        raw = np.where(np.isnan(raw) | (raw == 0), default, raw)
+        scores = np.clip((raw - low) / (high - low) * 100, 0, 100)
+    else:
+        groups = df['Sector'].fillna('N/A') if normalization == 'sector' and 'Sector' in df else None
+        scores = _percentile_scores(raw, groups)
+    scores = np.where(higher_better, scores, 100 - scores)
+    scores = np.where(np.isnan(raw), 50.0, scores)
+    return pd.DataFrame(scores, index=df.index, columns=list(FRAMEWORK_FACTORS))
+
+
+@timed('score.framework')
+def framework_scores(df, weights, normalization='absolute'):
+    """Six factor scores plus their weighted sum (Framework_Score) for every row
+
+    ``weights`` is the factor -> weight dict used by the single-ticker
+    analyzer (pipeline.weights).
+    """
+    factors = framework_factors(df, normalization)
+    w = np.array([weights.get(f, 0.0) for f in FRAMEWORK_FACTORS], dtype=float)
+    factors['Framework_Score'] = factors.to_numpy() @ w
+    return factors
+
+
+def rank_framework(df, weights, normalization='absolute', id_cols=('Ticker', 'Name', 'Sector')):
+    """Ranked table of identifier columns, factor scores and Framework_Score, best first"""
+    ids = df.reindex(columns=[c for c in id_cols if c in df])
+    return ids.join(framework_scores(df, weights, normalization)).sort_values(
+        'Framework_Score', ascending=False, ignore_index=True)
+
+
+# --------------------------
+# What-if weight tuning
+# --------------------------
+# After one scan the per-ticker sub-scores are fixed; only the weights
+# change. WeightTuner keeps both sub-score matrices in memory so a new set
+# of weights re-ranks the whole universe with matrix-vector products:
+# valuation is the renormalized mean (S @ w) / (P @ w) over the metrics
+# present, framework is F @ (w / sum w).
+
+
+class WeightTuner:
+    """Cached valuation and framework sub-score matrices for one scan frame
+
+    ``framework_weights`` (pipeline.weights) are the defaults rank changes
+    are measured against, next to VALUATION_WEIGHTS.
+    """
+
+    def __init__(self, df, framework_weights, normalization='absolute'):
+        self.df = df.reset_index(drop=True)
+        self.defaults = {'Valuation_Score': VALUATION_WEIGHTS, 'Framework_Score': dict(framework_weights)}
+        sub = valuation_subscores(self.df)
+        self.present = (~np.isnan(sub)).astype(float)
+        self.subscores = np.nan_to_num(sub, nan=0.0)
+        self.factors = framework_factors(self.df, normalization).to_numpy()
+        self._default_ranks = {}
+
+    def __len__(self):
+        return len(self.df)
+
+    def valuation_scores(self, weights=None):
+        """Valuation_Score for every row under ``weights`` (same as score_valuation_frame up to rounding)"""
+        w = _weight_vector(weights)
+        total = self.present @ w
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(total > 0, (self.subscores @ w) / total, 0.0)
+
+    def framework_scores(self, weights):
+        """Framework_Score for every row, with the factor weights rescaled to sum to 1"""
+        w = np.array([weights.get(f, 0.0) for f in FRAMEWORK_FACTORS], dtype=float)
+        total = w.sum()
+        return self.factors @ (w / total) if total > 0 else np.zeros(len(self.df))
+
+    def scores(self, kind, weights):
+        return self.valuation_scores(weights) if kind == 'Valuation_Score' else self.framework_scores(weights)
+
+    def default_ranks(self, kind):
+        """1-based rank of every row under the default weights (computed once per kind)"""
+        if kind not in self._default_ranks:
+            order = np.argsort(-self.scores(kind, self.defaults[kind]), kind='stable')
+            ranks = np.empty(len(order), dtype=int)
+            ranks[order] = np.arange(1, len(order) + 1)
+            self._default_ranks[kind] = ranks
+        return self._default_ranks[kind]
+
+
+def top_positions(scores, n=10):
+    """Positions of the ``n`` highest scores, best first, without sorting the rest"""
+    n = min(n, len(scores))
+    if n == 0:
+        return np.array([], dtype=int)
+    part = np.argpartition(-scores, n - 1)[:n]
+    return part[np.argsort(-scores[part], kind='stable')]
@@ -0,0 +1,139 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from metrics import timed
+
+# --------------------------
+# Screener indexes
+# --------------------------
+# Ad-hoc filters such as ``PE_Ratio < 15 and ROE > 20 and Sector ==
+# 'Industrials'`` over a cached scan. Each numeric metric is indexed once as
+# its sorted values plus the matching row positions, so a range condition is
+# two binary searches; each category value is a precomputed row bitmap.
+# A compound query ANDs the per-condition bitmaps and never touches the
+# rows themselves until the matches are materialized.
+
+NUMERIC_FIELDS = ('PE_Ratio', 'PB_Ratio', 'PS_Ratio', 'ROE', 'Profit_Margin', 'Dividend_Yield', 'Beta',
+                  'Market_Cap', 'Valuation_Score', 'Framework_Score')
+CATEGORY_FIELDS = ('Sector',)
+OPERATORS = ('<', '<=', '>', '>=', '==', '!=')
+SUFFIXES = {'': 1, 'k': 1e3, 'm': 1e6, 'b': 1e9, 't': 1e12}
+
+_CONDITION_RE = re.compile(
+    r"\s*([A-Za-z_]\w*)\s*(<=|>=|==|!=|<|>)\s*"
+    r"(?:'([^']*)'|\"([^\"]*)\"|([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)([kmbtKMBT]?))\s*"
+)
+_AND_RE = re.compile(r"and\b|&&?", re.IGNORECASE)
+
+
+def parse_query(text):
+    """``[(field, op, value), ...]`` from ``"PE_Ratio < 15 and Sector == 'Energy'"``
+
+    Conditions are joined with ``and``; numbers may carry a K/M/B/T suffix
+    (``Market_Cap > 10B``). Raises ValueError on anything else.
+    """
+    conditions, pos, text = [], 0, text.strip()
+    while pos < len(text):
+        match = _CONDITION_RE.match(text, pos)
+        if match is None:
+            raise ValueError(f"cannot parse condition at {text[pos:pos + 30]!r}")
+        field, op, single, double, number, suffix = match.groups()
+        if number is not None:
+            value = float(number) * SUFFIXES[suffix.lower()]
+        else:
+            value = single if single is not None else double
+        conditions.append((field, op, value))
+        pos = match.end()
+        if pos < len(text):
+            joiner = _AND_RE.match(text, pos)
+            if joiner is None:
+                raise ValueError(f"expected 'and' at {text[pos:pos + 30]!r}")
+            pos = joiner.end()
+            if pos == len(text) or text[pos:].isspace():
+                raise ValueError("expected a condition after 'and'")
+    return conditions
+
+
+class ScreenerIndex:
+    """Sorted per-metric indexes and per-category bitmaps over one scan frame"""
+
+    def __init__(self, df, numeric=NUMERIC_FIELDS, categories=CATEGORY_FIELDS):
+        self.df = df.reset_index(drop=True)
+        self.size = len(self.df)
+        self.order = {}    # field -> row positions sorted by value (NaN rows excluded)
+        self.values = {}   # field -> the sorted values themselves
+        self.present = {}  # field -> bool mask of rows that have a value
+        for field in numeric:
+            if field not in self.df:
+                continue
+            raw = pd.to_numeric(self.df[field], errors='coerce').to_numpy(dtype=float)
+            order = np.argsort(raw, kind='stable')
+            order = order[~np.isnan(raw[order])]
+            self.order[field], self.values[field], self.present[field] = order, raw[order], ~np.isnan(raw)
+        self.bitmaps = {}  # field -> {lower-cased value: bool mask}
+        for field in categories:
+            if field not in self.df:
+                continue
+            codes, uniques = pd.factorize(self.df[field].astype(str).str.strip().str.lower())
+            self.bitmaps[field] = {value: codes == i for i, value in enumerate(uniques)}
+        self._fields = {f.lower(): f for f in [*self.order, *self.bitmaps]}
+
+    @property
+    def fields(self):
+        return list(self.order) + list(self.bitmaps)
+
+    def categories(self, field):
+        """Distinct values of a category field, as they appear in the frame"""
+        return sorted(self.df[field].dropna().astype(str).str.strip().unique()) if field in self.bitmaps else []
+
+    def _mask(self, field, op, value):
+        canonical = self._fields.get(field.lower())
+        if canonical is None:
+            raise ValueError(f"unknown field {field!r}; filterable fields: {', '.join(self.fields)}")
+        if op not in OPERATORS:
+            raise ValueError(f"unsupported operator {op!r}")
+        if canonical in self.bitmaps:
+            if op not in ('==', '!='):
+                raise ValueError(f"{canonical} only supports == and !=")
+            hit = self.bitmaps[canonical].get(str(value).strip().lower())
+            mask = hit.copy() if hit is not None else np.zeros(self.size, dtype=bool)
+            return ~mask if op == '!=' else mask
+        if isinstance(value, str):
+            raise ValueError(f"{canonical} needs a number, got {value!r}")
+        values, order = self.values[canonical], self.order[canonical]
+        left, right = np.searchsorted(values, value, 'left'), np.searchsorted(values, value, 'right')
+        lo, hi = {'<': (0, left), '<=': (0, right), '>': (right, len(values)), '>=': (left, len(values)),
+                  '==': (left, right), '!=': (left, right)}[op]
+        mask = np.zeros(self.size, dtype=bool)
+        if op == '!=':
+            mask[order] = True   # rows without a value never match
+            mask[order[lo:hi]] = False
+        else:
+            mask[order[lo:hi]] = True
+        return mask
+
+    @timed('screener.query')
+    def positions(self, query, sort_by=None, ascending=True):
+        """Row positions matching ``query`` (text or parsed conditions), optionally ordered by a metric"""
+        conditions = parse_query(query) if isinstance(query, str) else list(query)
+        mask = np.ones(self.size, dtype=bool)
+        for condition in conditions:
+            mask &= self._mask(*condition)
+        if sort_by is None:
+            return np.flatnonzero(mask)
+        canonical = self._fields.get(sort_by.lower())
+        if canonical not in self.order:
+            raise ValueError(f"cannot sort by {sort_by!r}")
+        order = self.order[canonical] if ascending else self.order[canonical][::-1]
+        hits = order[mask[order]]   # already sorted; rows without a value go last
+        return np.concatenate([hits, np.flatnonzero(mask & ~self.present[canonical])])
+
+    def query(self, query, sort_by=None, ascending=True, limit=None):
+        """Matching rows of the indexed frame as a DataFrame"""
+        positions = self.positions(query, sort_by, ascending)
+        if limit is not None:
+            positions = positions[:limit]
+        return self.df.iloc[positions]
+
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from capm import capm_table, estimate_betas, required_return, rolling_betas
+
+
+def returns_panel(n_days=300, betas=(0.5, 1.0, 1.5, 2.0), seed=0, missing=0.05):
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0.0004, 0.01, n_days)
+    returns = market[:, None] * np.asarray(betas) + rng.normal(0, 0.004, (n_days, len(betas)))
+    returns[rng.random(returns.shape) < missing] = np.nan
+    return returns, market
+
+
+def ols_beta(r, m):
+    ok = np.isfinite(r) & np.isfinite(m)
+    return np.polyfit(m[ok], r[ok], 1)[0]
+
+
+def test_betas_match_per_ticker_ols():
+    returns, market = returns_panel()
+    expected = [ols_beta(returns[:, j], market) for j in range(returns.shape[1])]
+    np.testing.assert_allclose(estimate_betas(returns, market), expected, rtol=1e-9)
+
+
+def test_short_history_gives_nan():
+    returns, market = returns_panel(n_days=40)
+    assert np.isnan(estimate_betas(returns, market, min_obs=60)).all()
+
+
+def test_rolling_betas_match_windowed_regressions():
+    returns, market = returns_panel()
+    window = 63
+    rolling = rolling_betas(returns, market, window)
+    assert rolling.shape == returns.shape
+    assert np.isnan(rolling[:window - 1]).all()
+    for end in (window, 150, len(returns)):
+        np.testing.assert_allclose(rolling[end - 1], estimate_betas(returns[end - window:end], market[end - window:end],
+                                                                    min_obs=window // 2), rtol=1e-7)
+
+
+def closes_frame(returns, market, tickers=('AAA', 'BBB', 'CCC', 'DDD')):
+    prices = 100 * np.cumprod(1 + np.vstack([np.zeros((1, returns.shape[1] + 1)),
+                                            np.column_stack([returns, market])]), axis=0)
+    return pd.DataFrame(prices, columns=[*tickers, '^GSPC'],
+                        index=pd.bdate_range('2024-01-01', periods=len(prices)))
+
+
+def test_capm_table_window_uses_latest_rolling_beta():
+    returns, market = returns_panel(missing=0.0)
+    # Beta of the first ticker jumps from 0.5 to 1.8 over the last 63 days
+    returns[-63:, 0] = market[-63:] * 1.8
+    closes = closes_frame(returns, market)
+    full = capm_table(closes, lookback=252, window=0)
+    windowed = capm_table(closes, lookback=252, window=63)
+    assert windowed.loc['AAA', 'Beta_Est'] == pytest.approx(1.8, abs=1e-6)
+    assert full.loc['AAA', 'Beta_Est'] < 1.5
+    assert windowed.loc['AAA', 'Required_Return'] == pytest.approx(required_return(1.8))
+
+
+def test_capm_table_window_falls_back_to_lookback_beta():
+    returns, market = returns_panel(missing=0.0)
+    returns[-63:, 1] = np.nan   # no bars at all in the latest window
+    closes = closes_frame(returns, market)
+    full = capm_table(closes, lookback=252, window=0)
+    windowed = capm_table(closes, lookback=252, window=63)
+    assert np.isfinite(full.loc['BBB', 'Beta_Est'])
+    assert windowed.loc['BBB', 'Beta_Est'] == pytest.approx(full.loc['BBB', 'Beta_Est'])
@@ -0,0 +1,156 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from chatbot import FALLBACK_REPLY, ChatBackend, ResponseCache, build_prompt, normalize_question
+
+ANSWER = "P/E is the share price divided by earnings per share."
+
+
+class MockEndpoint(ThreadingHTTPServer):
+    """Local stand-in for the Inference API: streams SSE tokens, returns JSON or fails"""
+
+    daemon_threads = True
+
+    def __init__(self, mode="sse", first_token=0.0):
+        super().__init__(("127.0.0.1", 0), MockHandler)
+        self.mode = mode
+        self.first_token = first_token
+        self.connections = 0
+        self.payloads = []
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/models/mock"
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, content_type, data):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.payloads.append(payload)
+        time.sleep(self.server.first_token)
+        if self.server.mode == "error":
+            self._send(503, "application/json", b'{"error": "model is loading"}')
+        elif self.server.mode == "json" or not payload.get("stream"):
+            self._send(200, "application/json", json.dumps([{"generated_text": ANSWER}]).encode())
+        else:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            events = [{'token': {'text': w + " ", 'special': False}} for w in ANSWER.split()]
+            events.append({'token': {'text': "</s>", 'special': True}})
+            for event in events:
+                data = f"data: {json.dumps(event)}\n\n".encode()
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+
+
+@pytest.fixture
+def endpoint(request):
+    server = MockEndpoint(*getattr(request, 'param', ()))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def ask(text, history=()):
+    return [*history, {"role": "user", "content": text}]
+
+
+def test_streams_tokens_and_skips_special_ones(endpoint):
+    chunks = list(ChatBackend(url=endpoint.url).stream(ask("What does P/E mean?")))
+    assert len(chunks) == len(ANSWER.split())
+    assert "".join(chunks).strip() == ANSWER
+    assert endpoint.payloads[0]["stream"] is True
+
+
+@pytest.mark.parametrize('endpoint', [("json",)], indirect=True)
+def test_plain_json_reply(endpoint):
+    assert ChatBackend(url=endpoint.url).complete(ask("What does P/E mean?")) == ANSWER
+
+
+def test_connection_is_pooled_across_questions(endpoint):
+    backend = ChatBackend(url=endpoint.url)
+    for i in range(4):
+        assert backend.complete(ask(f"What does metric number {i} mean?")) == ANSWER
+    assert len(endpoint.payloads) == 4
+    assert endpoint.connections == 1
+
+
+def test_repeated_question_is_served_from_the_cache(endpoint):
+    backend = ChatBackend(url=endpoint.url)
+    backend.complete(ask("What does P/E mean?"))
+    job = backend.submit(ask("  what does p/e MEAN? "))
+    assert job.done and job.cached
+    assert job.reply == ANSWER
+    assert len(endpoint.payloads) == 1
+    assert backend.cache.hits == 1
+
+
+def test_short_follow_ups_are_not_cached(endpoint):
+    backend = ChatBackend(url=endpoint.url)
+    backend.complete(ask("and P/B?"))
+    backend.complete(ask("and P/B?"))
+    assert len(endpoint.payloads) == 2
+
+
+@pytest.mark.parametrize('endpoint', [("sse", 0.3)], indirect=True)
+def test_submit_returns_before_the_endpoint_answers(endpoint):
+    backend = ChatBackend(url=endpoint.url)
+    start = time.monotonic()
+    job = backend.submit(ask("What does ROE measure?"))
+    assert time.monotonic() - start < 0.1
+    assert not job.done
+    assert job.wait(5)
+    assert job.reply == ANSWER
+    assert job.first_token_at >= job.started_at
+
+
+@pytest.mark.parametrize('endpoint', [("error",)], indirect=True)
+def test_endpoint_error_is_reported_not_raised(endpoint):
+    backend = ChatBackend(url=endpoint.url)
+    job = backend.submit(ask("What does P/E mean?"))
+    assert job.wait(5)
+    assert job.error is not None
+    assert job.reply.startswith("Chat service error:")
+    assert backend.cache.get(normalize_question("What does P/E mean?")) is None
+
+
+def test_only_recent_turns_are_sent(endpoint):
+    history = []
+    for i in range(6):
+        history += [{"role": "user", "content": f"old question {i}"}, {"role": "assistant", "content": f"old answer {i}"}]
+    ChatBackend(url=endpoint.url, history_turns=2).complete(ask("What does P/E mean?", history))
+    prompt = endpoint.payloads[0]["inputs"]
+    assert "old question 5" in prompt and "old question 4" in prompt
+    assert "old question 3" not in prompt
+    assert prompt == build_prompt(ask("What does P/E mean?", history), 2)
+
+
+def test_empty_reply_falls_back():
+    cache = ResponseCache()
+    cache.put("what does p/e mean", "")
+    backend = ChatBackend(url="http://127.0.0.1:9/unused", cache=cache)
+    assert backend.submit(ask("What does P/E mean?")).reply == FALLBACK_REPLY
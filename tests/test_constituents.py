@@ -0,0 +1,128 @@
+import os
+import threading
+
+import pandas as pd
+import pytest
+
+import constituents
+from constituents import UNIVERSES, load_constituents, load_csv_universe, normalize_constituents
+from providers import DataProvider, set_provider
+
+FRESH = pd.DataFrame({'Ticker': ['NEW1', 'NEW2'], 'Name': ['New One', 'New Two'], 'Sector': 'Tech',
+                      'Sub_Industry': 'N/A'})
+
+
+class FakeLive(DataProvider):
+    """Live provider whose constituent scrape can be held open, failed or counted"""
+
+    live = True
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def constituents(self, universe):
+        self.calls += 1
+        self.release.wait(5)
+        if self.fail:
+            raise ConnectionError("offline")
+        return FRESH
+
+
+@pytest.fixture
+def provider():
+    live = FakeLive()
+    previous = set_provider(live)
+    yield live
+    set_provider(previous)
+
+
+def wait_for_refreshes():
+    for thread in threading.enumerate():
+        if thread.name.startswith("constituents-"):
+            thread.join(5)
+
+
+@pytest.mark.parametrize('universe', list(UNIVERSES))
+def test_bundled_seeds_are_normalized(universe):
+    seed = pd.read_csv(os.path.join(constituents.SEED_DIR, f"{universe}.csv"), keep_default_na=False)
+    assert list(seed.columns) == constituents.COLUMNS
+    assert seed['Ticker'].is_unique
+    assert seed.equals(normalize_constituents(seed))
+
+
+def test_missing_copy_serves_the_seed_without_waiting(provider, tmp_path):
+    provider.release.clear()   # the scrape hangs until released
+    table = load_constituents('sp500', store_dir=str(tmp_path))
+    assert len(table) > 400 and 'AAPL' in set(table['Ticker'])
+    provider.release.set()
+    wait_for_refreshes()
+    assert provider.calls == 1
+    assert load_constituents('sp500', store_dir=str(tmp_path))['Ticker'].tolist() == ['NEW1', 'NEW2']
+
+
+def test_offline_deployment_keeps_serving_the_seed(provider, tmp_path):
+    provider.fail = True
+    first = load_constituents('dow', store_dir=str(tmp_path))
+    wait_for_refreshes()
+    assert not os.listdir(tmp_path)
+    assert load_constituents('dow', store_dir=str(tmp_path)).equals(first)
+    wait_for_refreshes()
+    assert provider.calls == 2   # retried on the next read
+
+
+def test_fresh_copy_is_served_without_refreshing(provider, tmp_path):
+    FRESH.to_csv(tmp_path / "sp500.csv", index=False)
+    assert load_constituents('sp500', store_dir=str(tmp_path))['Ticker'].tolist() == ['NEW1', 'NEW2']
+    wait_for_refreshes()
+    assert provider.calls == 0
+
+
+def test_stale_copy_is_served_then_refreshed(provider, tmp_path):
+    path = tmp_path / "sp500.csv"
+    FRESH.assign(Ticker=['OLD1', 'OLD2']).to_csv(path, index=False)
+    os.utime(path, (0, 0))
+    assert load_constituents('sp500', store_dir=str(tmp_path))['Ticker'].tolist() == ['OLD1', 'OLD2']
+    wait_for_refreshes()
+    assert provider.calls == 1
+    assert load_constituents('sp500', store_dir=str(tmp_path))['Ticker'].tolist() == ['NEW1', 'NEW2']
+
+
+def test_concurrent_stale_reads_share_one_refresh(provider, tmp_path):
+    path = tmp_path / "sp500.csv"
+    FRESH.to_csv(path, index=False)
+    os.utime(path, (0, 0))
+    provider.release.clear()
+    for _ in range(5):
+        load_constituents('sp500', store_dir=str(tmp_path))
+    provider.release.set()
+    wait_for_refreshes()
+    assert provider.calls == 1
+
+
+def test_non_live_provider_without_a_copy_loads_synchronously(tmp_path):
+    class Recorded(DataProvider):
+        def constituents(self, universe):
+            return FRESH
+
+    previous = set_provider(Recorded())
+    try:
+        assert load_constituents('sp500', store_dir=str(tmp_path))['Ticker'].tolist() == ['NEW1', 'NEW2']
+        assert os.path.exists(tmp_path / "sp500.csv")
+    finally:
+        set_provider(previous)
+
+
+def test_unknown_universe_is_rejected():
+    with pytest.raises(ValueError, match="unknown universe"):
+        load_constituents('ftse')
+
+
+def test_user_csv_headers_and_tickers_are_normalized(tmp_path):
+    path = tmp_path / "mine.csv"
+    path.write_text("symbol,Company\nbrk.b,Berkshire\n aapl ,Apple\nAAPL,Apple again\n,Blank\n")
+    table = load_csv_universe(str(path))
+    assert table['Ticker'].tolist() == ['BRK-B', 'AAPL']
+    assert table['Name'].tolist() == ['Berkshire', 'Apple']
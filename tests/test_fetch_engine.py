@@ -0,0 +1,134 @@
+import threading
+import time
+
+import pytest
+
+from fetch_engine import fetch_many, untimed
+from throttle import AdaptiveRateLimiter, Throttle
+
+
+class FakeProvider:
+    """Local stand-in for fetch_stock_data: per-ticker latency, scripted failures and hangs
+
+    ``script`` maps a ticker to a list of outcomes for its successive calls:
+    'ok', 'none' (returns None), 'error' (raises) or 'hang' (sleeps ``hang``
+    seconds, then answers). Unscripted calls answer after ``latency``.
+    """
+
+    def __init__(self, latency=None, script=None, hang=2.0):
+        self.latency = latency or {}
+        self.script = {t: list(outcomes) for t, outcomes in (script or {}).items()}
+        self.hang = hang
+        self.calls = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, ticker):
+        with self._lock:
+            self.calls[ticker] = self.calls.get(ticker, 0) + 1
+            outcomes = self.script.get(ticker)
+            outcome = outcomes.pop(0) if outcomes else 'ok'
+        time.sleep(self.hang if outcome == 'hang' else self.latency.get(ticker, 0.0))
+        if outcome == 'error':
+            raise RuntimeError(f"simulated upstream error for {ticker}")
+        if outcome == 'none':
+            return None
+        return {'Ticker': ticker, 'Current_Price': 100.0}
+
+
+def collect(tickers, fetch, **kwargs):
+    kwargs.setdefault('backoff', 0.01)
+    return list(fetch_many(tickers, fetch, **kwargs))
+
+
+def test_empty_universe_yields_nothing():
+    assert collect([], FakeProvider()) == []
+
+
+def test_every_ticker_yielded_once_past_the_submit_window():
+    tickers = [f"T{i:04d}" for i in range(300)]
+    provider = FakeProvider()
+    results = collect(tickers, provider, workers=4)
+    assert sorted(t for t, _ in results) == tickers
+    assert all(data == {'Ticker': t, 'Current_Price': 100.0} for t, data in results)
+    assert sum(provider.calls.values()) == len(tickers)
+
+
+def test_results_stream_in_completion_order():
+    latency = {'SLOW': 0.4, 'MID': 0.2, 'FAST': 0.0}
+    results = collect(['SLOW', 'MID', 'FAST'], FakeProvider(latency), workers=3)
+    assert [t for t, _ in results] == ['FAST', 'MID', 'SLOW']
+
+
+def test_first_result_arrives_before_slow_tickers_finish():
+    provider = FakeProvider({'SLOW': 0.5})
+    start = time.monotonic()
+    stream = fetch_many(['SLOW', 'FAST'], provider, workers=2)
+    ticker, _ = next(stream)
+    assert ticker == 'FAST'
+    assert time.monotonic() - start < 0.4
+    assert [t for t, _ in stream] == ['SLOW']
+
+
+@pytest.mark.parametrize('failure', ['error', 'none'])
+def test_failures_are_retried_until_success(failure):
+    provider = FakeProvider(script={'AAA': [failure, failure, 'ok']})
+    results = collect(['AAA', 'BBB'], provider, retries=2)
+    assert dict(results)['AAA'] == {'Ticker': 'AAA', 'Current_Price': 100.0}
+    assert provider.calls == {'AAA': 3, 'BBB': 1}
+
+
+def test_ticker_yielded_as_none_after_exhausting_retries():
+    provider = FakeProvider(script={'BAD': ['error'] * 5})
+    results = collect(['BAD', 'OK'], provider, retries=2)
+    assert dict(results) == {'BAD': None, 'OK': {'Ticker': 'OK', 'Current_Price': 100.0}}
+    assert provider.calls['BAD'] == 3
+
+
+def test_retries_back_off_exponentially():
+    provider = FakeProvider(script={'AAA': ['error', 'error', 'ok']})
+    start = time.monotonic()
+    collect(['AAA'], provider, retries=2, backoff=0.1)
+    assert time.monotonic() - start >= 0.1 + 0.2
+
+
+def test_hung_attempt_is_abandoned_and_retried():
+    provider = FakeProvider(script={'HANG': ['hang', 'ok']}, hang=2.0)
+    start = time.monotonic()
+    results = collect(['HANG', 'OK'], provider, timeout=0.2, retries=1)
+    assert dict(results)['HANG'] == {'Ticker': 'HANG', 'Current_Price': 100.0}
+    assert provider.calls['HANG'] == 2
+    assert time.monotonic() - start < 1.5   # did not wait for the hung call
+
+
+def test_hung_ticker_without_retries_left_is_yielded_as_none():
+    provider = FakeProvider(script={'HANG': ['hang']}, hang=2.0)
+    start = time.monotonic()
+    results = collect(['HANG'], provider, timeout=0.2, retries=0)
+    assert results == [('HANG', None)]
+    assert time.monotonic() - start < 1.5
+
+
+def test_rate_limit_waits_do_not_count_against_the_timeout():
+    # 5 req/s with no burst: the last of 8 tickers waits ~1.4s for a token, far past the timeout
+    throttle = Throttle(AdaptiveRateLimiter(rate=5, burst=1, min_rate=5, max_rate=5))
+    provider = FakeProvider()
+    tickers = [f"T{i}" for i in range(8)]
+    results = collect(tickers, throttle.wrap(provider), workers=8, timeout=0.3, retries=2)
+    assert all(data is not None for _, data in results)
+    assert provider.calls == dict.fromkeys(tickers, 1)   # no attempt abandoned while queued for a token
+    assert throttle.stats()['delayed'] >= len(tickers) - 1
+
+
+def test_timeout_still_applies_after_the_token_is_granted():
+    throttle = Throttle(AdaptiveRateLimiter(rate=5, burst=1, min_rate=5, max_rate=5))
+    provider = FakeProvider(script={'HANG': ['hang', 'ok']}, hang=2.0)
+    start = time.monotonic()
+    results = collect(['HANG'], throttle.wrap(provider), timeout=0.2, retries=1)
+    assert dict(results)['HANG'] is not None
+    assert provider.calls['HANG'] == 2
+    assert time.monotonic() - start < 1.5
+
+
+def test_untimed_is_a_no_op_outside_fetch_many():
+    with untimed():
+        pass
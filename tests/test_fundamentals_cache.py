@@ -0,0 +1,74 @@
+import threading
+
+import pytest
+
+import fundamentals_cache
+from fundamentals_cache import FundamentalsCache
+
+INFO = {'longName': 'Alpha Corp', 'regularMarketPrice': 12.5, 'trailingPE': 14.0}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return FundamentalsCache(str(tmp_path / "fundamentals.sqlite"))
+
+
+def count_rows(cache):
+    return cache._connect().execute("SELECT COUNT(*) FROM info").fetchone()[0]
+
+
+def test_entry_count_is_kept_running(cache):
+    assert cache.stats()['entries'] == 0
+    cache.put('AAA', INFO)
+    cache.put('AAA', INFO)                        # replaces, does not add
+    cache.put('BBB', INFO, field_sets=['price'])
+    cache.put('BBB', INFO)
+    assert cache.stats()['entries'] == count_rows(cache) == 4
+    cache.clear()
+    assert cache.stats()['entries'] == 0
+
+
+def test_entry_count_tracks_evictions(tmp_path, monkeypatch):
+    monkeypatch.setattr(fundamentals_cache, 'EVICT_EVERY', 1)
+    cache = FundamentalsCache(str(tmp_path / "fundamentals.sqlite"), max_entries=6)
+    for i in range(10):
+        cache.put(f"T{i}", INFO)
+    assert cache.stats()['entries'] == count_rows(cache) <= 6
+
+
+def test_entry_count_starts_from_the_file(tmp_path):
+    path = str(tmp_path / "fundamentals.sqlite")
+    FundamentalsCache(path).put('AAA', INFO)
+    assert FundamentalsCache(path).stats()['entries'] == 2
+
+
+def test_stale_refreshes_run_on_a_bounded_pool(cache, monkeypatch):
+    monkeypatch.setattr(fundamentals_cache, 'REFRESH_WORKERS', 2)
+    monkeypatch.setattr(fundamentals_cache, '_refresh_pool', None)
+    for i in range(20):
+        cache.put(f"T{i}", INFO)
+    cache.ttls = {'price': -1, 'fundamentals': -1}   # everything is stale but servable
+
+    lock, running, peak, calls = threading.Lock(), [0], [0], []
+    release = threading.Event()
+
+    def loader(ticker):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            calls.append(ticker)
+        release.wait(5)
+        with lock:
+            running[0] -= 1
+        return dict(INFO, symbol=ticker)
+
+    threads_before = threading.active_count()
+    for _ in range(2):                            # the second pass finds every refresh in flight
+        for i in range(20):
+            assert cache.get_info(f"T{i}", loader)['longName'] == 'Alpha Corp'
+    assert threading.active_count() <= threads_before + 2
+    release.set()
+    fundamentals_cache._refresh_pool.shutdown(wait=True)
+    assert peak[0] <= 2
+    assert sorted(calls) == sorted(f"T{i}" for i in range(20))
+    assert cache.stats()['refreshes'] == 20
@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import incremental_scan
+from incremental_scan import incremental_rescan, load_scan, reprice, save_scan, stamp
+from providers import ReplayProvider, set_provider
+
+NOW = 1_000_000.0
+
+
+def scan_rows(tickers=('AAA', 'BBB', 'CCC'), fetched_at=NOW):
+    n = len(tickers)
+    return pd.DataFrame({
+        'Ticker': list(tickers),
+        'Name': [f"{t} Corp" for t in tickers],
+        'Current_Price': [100.0, 50.0, 20.0][:n],
+        'PE_Ratio': [20.0, 10.0, 8.0][:n],
+        'PB_Ratio': [4.0, 2.0, 1.0][:n],
+        'PS_Ratio': [5.0, 1.5, 0.5][:n],
+        'Market_Cap': [1e9, 5e8, 2e8][:n],
+        'Dividend_Yield': [1.0, 4.0, 0.0][:n],
+        'ROE': [25.0, 12.0, 9.0][:n],
+        'Profit_Margin': [20.0, 8.0, 3.0][:n],
+        'Valuation_Score': [60.0, 70.0, 80.0][:n],
+        'Framework_Score': [55.0, 65.0, 75.0][:n],
+        'MC_P50': [120.0, 45.0, 30.0][:n],
+        'MC_Prob_Undervalued': [60.0, 40.0, 90.0][:n],
+        'Fetched_At': fetched_at,
+    })
+
+
+def test_reprice_rescales_pe_and_yield():
+    out = reprice(scan_rows(), {'AAA': 110.0, 'BBB': 40.0})
+    assert out['Current_Price'].tolist() == [110.0, 40.0, 20.0]
+    np.testing.assert_allclose(out['PE_Ratio'], [22.0, 8.0, 8.0])
+    np.testing.assert_allclose(out['PB_Ratio'], [4.4, 1.6, 1.0])
+    np.testing.assert_allclose(out['Market_Cap'], [1.1e9, 4e8, 2e8])
+    np.testing.assert_allclose(out['Dividend_Yield'], [1.0 / 1.1, 5.0, 0.0])
+
+
+def test_reprice_carries_fundamentals_over():
+    previous = scan_rows()
+    out = reprice(previous, {'AAA': 110.0})
+    for col in ('Name', 'ROE', 'Profit_Margin', 'Fetched_At'):
+        assert out[col].tolist() == previous[col].tolist()
+
+
+def test_reprice_drops_columns_computed_from_the_old_price():
+    out = reprice(scan_rows(), {'AAA': 110.0})
+    assert not [c for c in out.columns if c.startswith('MC_')]
+    assert 'Valuation_Score' not in out and 'Framework_Score' not in out
+
+
+@pytest.mark.parametrize('price', [np.nan, 0.0, -5.0, 'n/a'])
+def test_reprice_keeps_rows_without_a_usable_price(price):
+    previous = scan_rows()
+    out = reprice(previous, {'AAA': price})
+    assert out.loc[0, 'Current_Price'] == 100.0
+    assert out.loc[0, 'PE_Ratio'] == 20.0
+
+
+def test_reprice_leaves_the_input_untouched():
+    previous = scan_rows()
+    reprice(previous, {'AAA': 200.0})
+    assert previous.equals(scan_rows())
+
+
+class Fetcher:
+    """Records which tickers were re-fetched or repriced"""
+
+    def __init__(self, prices=None, rows=None):
+        self.prices = prices or {}
+        self.rows = rows
+        self.priced, self.fetched = [], []
+
+    def fetch_prices(self, tickers):
+        self.priced.append(list(tickers))
+        return {t: p for t, p in self.prices.items() if t in tickers}
+
+    def fetch_rows(self, tickers):
+        self.fetched.append(list(tickers))
+        if self.rows is None:
+            return scan_rows(tickers).drop(columns=['Fetched_At', 'MC_P50', 'MC_Prob_Undervalued',
+                                                    'Valuation_Score', 'Framework_Score'])
+        return self.rows
+
+
+def test_fresh_rows_are_repriced_and_new_tickers_fetched():
+    fetcher = Fetcher(prices={'AAA': 110.0, 'BBB': 40.0})
+    out = incremental_rescan(scan_rows(('AAA', 'BBB')), ['AAA', 'BBB', 'NEW'], fetcher.fetch_prices,
+                             fetcher.fetch_rows, ttl=3600, now=NOW + 60)
+    assert fetcher.fetched == [['NEW']]
+    assert fetcher.priced == [['AAA', 'BBB']]
+    out = out.set_index('Ticker')
+    assert out.loc['AAA', 'PE_Ratio'] == pytest.approx(22.0)
+    assert out.loc['BBB', 'Dividend_Yield'] == pytest.approx(5.0)
+    assert out.loc['AAA', 'Fetched_At'] == NOW          # fundamentals carried over
+    assert out.loc['NEW', 'Fetched_At'] == NOW + 60
+    assert not [c for c in out.columns if c.startswith('MC_')]
+
+
+def test_expired_rows_are_refetched_and_departed_tickers_dropped():
+    previous = pd.concat([scan_rows(('AAA',), fetched_at=NOW - 7200), scan_rows(('BBB', 'GONE'), fetched_at=NOW)],
+                         ignore_index=True)
+    fetcher = Fetcher()
+    out = incremental_rescan(previous, ['AAA', 'BBB'], fetcher.fetch_prices, fetcher.fetch_rows,
+                             ttl=3600, now=NOW)
+    assert fetcher.fetched == [['AAA']]
+    assert sorted(out['Ticker']) == ['AAA', 'BBB']
+
+
+def test_expired_rows_that_fail_to_refetch_are_repriced():
+    previous = scan_rows(('AAA', 'BBB'), fetched_at=NOW - 7200)
+    fetcher = Fetcher(prices={'AAA': 110.0}, rows=pd.DataFrame())
+    out = incremental_rescan(previous, ['AAA', 'BBB'], fetcher.fetch_prices, fetcher.fetch_rows,
+                             ttl=3600, now=NOW)
+    assert sorted(out['Ticker']) == ['AAA', 'BBB']
+    assert out.set_index('Ticker').loc['AAA', 'Current_Price'] == 110.0
+
+
+def test_nothing_left_gives_an_empty_frame():
+    fetcher = Fetcher(rows=pd.DataFrame())
+    out = incremental_rescan(scan_rows(), ['NEW'], fetcher.fetch_prices, fetcher.fetch_rows, now=NOW)
+    assert out.empty and 'Ticker' in out
+
+
+def test_stamp_records_the_fetch_time():
+    assert stamp(scan_rows(), now=42.0)['Fetched_At'].eq(42.0).all()
+
+
+def test_save_and_load_scan_round_trip_per_provider(tmp_path, monkeypatch):
+    monkeypatch.setattr(incremental_scan, 'DEFAULT_DIR', str(tmp_path))
+    live = scan_rows()
+    save_scan(live, 'sp500')
+    pd.testing.assert_frame_equal(load_scan('sp500'), live)
+    assert load_scan('nasdaq100') is None
+
+    previous = set_provider(ReplayProvider(str(tmp_path / "rec")))
+    try:
+        assert load_scan('sp500') is None
+        save_scan(live.head(1), 'sp500')
+        assert len(load_scan('sp500')) == 1
+    finally:
+        set_provider(previous)
+    assert len(load_scan('sp500')) == 3
+
+
+def test_explicit_store_dir_round_trip(tmp_path):
+    save_scan(scan_rows(), 'dow', store_dir=str(tmp_path))
+    pd.testing.assert_frame_equal(load_scan('dow', store_dir=str(tmp_path)), scan_rows())
@@ -0,0 +1,158 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from price_history import FIELDS, HistoryStore, PricePanel
+
+DATES = pd.bdate_range('2024-01-01', periods=30)
+
+
+def bars(tickers, dates):
+    """yf.download-shaped frame (field x ticker columns) with Close = 100 + day number"""
+    columns = pd.MultiIndex.from_product([FIELDS, tickers])
+    values = np.tile(100.0 + DATES.get_indexer(dates)[:, None], (1, len(columns)))
+    return pd.DataFrame(values, index=dates, columns=columns)
+
+
+class FakeDownloader:
+    """Serves bars up to ``today``; tickers in ``empty`` come back with nothing"""
+
+    def __init__(self, today=20, empty=()):
+        self.today = today
+        self.empty = set(empty)
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, tickers, period=None, start=None):
+        self.calls.append((list(tickers), period or start))
+        self.release.wait(5)
+        tickers = [t for t in tickers if t not in self.empty]
+        dates = DATES[:self.today]
+        if start is not None:
+            dates = dates[dates >= pd.Timestamp(start)]
+        return bars(tickers, dates) if tickers else pd.DataFrame()
+
+
+@pytest.fixture
+def downloader():
+    return FakeDownloader()
+
+
+@pytest.fixture
+def store(downloader):
+    return HistoryStore(path=None, downloader=downloader, refresh_interval=60)
+
+
+def test_new_tickers_are_downloaded_once_in_batches(downloader):
+    store = HistoryStore(path=None, downloader=downloader, batch_size=2)
+    closes = store.get_panel(['AAA', 'BBB', 'CCC']).frame('Close')
+    assert list(closes.columns) == ['AAA', 'BBB', 'CCC']
+    assert len(closes) == 20
+    assert [tickers for tickers, _ in downloader.calls] == [['AAA', 'BBB'], ['CCC']]
+    store.get_panel(['AAA', 'CCC'])
+    assert len(downloader.calls) == 2
+
+
+def test_single_ticker_call_tops_up_only_that_ticker(store, downloader):
+    store.get_panel(['AAA', 'BBB', 'CCC'])
+    store._checked.clear()   # every ticker is due for a top-up
+    downloader.today, downloader.calls = 25, []
+    closes = store.get_panel(['BBB']).frame('Close')
+    assert downloader.calls == [(['BBB'], DATES[19].strftime("%Y-%m-%d"))]   # from its last cached bar
+    assert closes['BBB'].iloc[-1] == 124
+    assert np.isnan(store.panel.frame('Close')['AAA'].iloc[-1])          # untouched until requested
+
+
+def test_top_up_starts_from_each_tickers_own_last_bar(store, downloader):
+    store.get_panel(['AAA'])
+    downloader.today = 25
+    store._checked.clear()
+    store.get_panel(['BBB', 'AAA'])          # BBB is new; AAA is topped up from day 20
+    downloader.today, downloader.calls = 28, []
+    store._checked.clear()
+    closes = store.get_panel(['AAA', 'BBB']).frame('Close')
+    assert sorted(downloader.calls) == [(['AAA', 'BBB'], DATES[24].strftime("%Y-%m-%d"))]
+    assert not closes.isna().any().any()
+
+
+def test_top_up_happens_once_per_interval(store, downloader):
+    store.get_panel(['AAA'])
+    store.get_panel(['AAA'])
+    store.get_panel(['AAA'], refresh=True)
+    assert len(downloader.calls) == 1
+
+
+def test_empty_downloads_are_remembered(downloader):
+    downloader.empty = {'DEAD'}
+    store = HistoryStore(path=None, downloader=downloader, refresh_interval=60)
+    for _ in range(3):
+        closes = store.get_panel(['DEAD', 'AAA']).frame('Close')
+    assert len(downloader.calls) == 1
+    assert 'DEAD' in closes and closes['DEAD'].isna().all()
+    assert 'DEAD' not in store.panel
+    store._empty['DEAD'] -= 120              # the interval has passed: retried once
+    store.get_panel(['DEAD'])
+    assert downloader.calls[-1][0] == ['DEAD']
+
+
+def test_downloads_do_not_block_readers_of_other_tickers(store, downloader):
+    store.get_panel(['AAA'])
+    downloader.release.clear()               # the next download hangs
+    slow = threading.Thread(target=store.get_panel, args=(['NEW'],))
+    slow.start()
+    try:
+        reader = threading.Thread(target=store.get_panel, args=(['AAA'],))
+        reader.start()
+        reader.join(1)
+        assert not reader.is_alive()
+    finally:
+        downloader.release.set()
+        slow.join(5)
+
+
+def test_concurrent_callers_share_one_download(store, downloader):
+    downloader.release.clear()
+    results = {}
+
+    def get(name):
+        results[name] = store.get_panel(['NEW']).frame('Close')
+
+    threads = [threading.Thread(target=get, args=(i,)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    downloader.release.set()
+    for thread in threads:
+        thread.join(5)
+    assert len(downloader.calls) == 1
+    assert all(len(closes) == 20 and closes['NEW'].notna().all() for closes in results.values())
+
+
+def test_failed_download_is_retried(store, downloader):
+    def offline(tickers, **kwargs):
+        raise ConnectionError("offline")
+
+    store.downloader = offline
+    with pytest.raises(ConnectionError):
+        store.get_panel(['AAA'])
+    store.downloader = downloader
+    assert store.get_panel(['AAA']).frame('Close')['AAA'].notna().all()
+
+
+def test_panel_persists_and_reloads(tmp_path, downloader):
+    path = str(tmp_path / "panel.npz")
+    HistoryStore(path=path, downloader=downloader).get_panel(['AAA', 'BBB'])
+    downloader.calls = []
+    reloaded = HistoryStore(path=path, downloader=downloader)
+    assert reloaded.panel.tickers == ['AAA', 'BBB']
+    reloaded.get_panel(['AAA'], refresh=False)
+    assert downloader.calls == []
+
+
+def test_last_bars_skip_trailing_gaps():
+    panel = PricePanel.from_download(bars(['AAA', 'BBB'], DATES[:5]), ['AAA', 'BBB'])
+    panel.values[FIELDS.index('Close'), 3:, 1] = np.nan
+    panel.values[FIELDS.index('Close'), :, 0] = np.nan
+    assert panel.last_bars(['AAA', 'BBB']) == {'AAA': None, 'BBB': DATES[2]}
@@ -0,0 +1,170 @@
+import os
+import time
+
+import pandas as pd
+import pytest
+
+import constituents
+import incremental_scan
+import pipeline
+import scan
+import scheduler
+from fundamentals_cache import FundamentalsCache
+from providers import (DataProvider, RecordingNotFound, RecordingProvider, ReplayProvider, YahooProvider,
+                       provider_dir, set_provider)
+
+INFO = {'longName': 'Alpha Corp', 'regularMarketPrice': 12.5, 'trailingPE': 14.0}
+
+
+class FakeLive(DataProvider):
+    """Live provider stand-in that counts upstream calls"""
+
+    label = "fake live feed"
+    live = True
+
+    def __init__(self):
+        self.calls = 0
+
+    def info(self, ticker):
+        self.calls += 1
+        return dict(INFO, symbol=ticker)
+
+    def constituents(self, universe):
+        return pd.DataFrame({'Ticker': ['AAA', 'BBB'], 'Name': ['Alpha', 'Beta'], 'Sector': 'Tech',
+                             'Sub_Industry': 'N/A'})
+
+
+@pytest.fixture
+def live_dirs(tmp_path, monkeypatch):
+    """Point every on-disk cache at tmp_path and restore the process-wide provider afterwards"""
+    monkeypatch.setattr(pipeline, '_fundamentals_cache', FundamentalsCache(str(tmp_path / "fundamentals.sqlite")))
+    monkeypatch.setattr(pipeline, '_offline_history', (None, None))
+    monkeypatch.setattr(incremental_scan, 'DEFAULT_DIR', str(tmp_path / "scans"))
+    monkeypatch.setattr(scheduler, 'DEFAULT_DIR', str(tmp_path / "snapshots"))
+    monkeypatch.setattr(constituents, 'DEFAULT_DIR', str(tmp_path / "constituents"))
+    previous = set_provider(FakeLive())
+    yield tmp_path
+    set_provider(previous)
+
+
+def test_only_yahoo_is_live(tmp_path):
+    assert YahooProvider().live
+    assert not RecordingProvider(YahooProvider(), str(tmp_path)).live
+    assert not ReplayProvider(str(tmp_path)).live
+
+
+def test_provider_dir_namespaces_non_live_providers(tmp_path):
+    root = str(tmp_path / "scans")
+    assert provider_dir(root, FakeLive()) == root
+    replay_a, replay_b = ReplayProvider(str(tmp_path / "a")), ReplayProvider(str(tmp_path / "b"))
+    assert provider_dir(root, replay_a) != provider_dir(root, replay_b)   # one namespace per recording
+    assert provider_dir(root, replay_a) == provider_dir(root, ReplayProvider(str(tmp_path / "a")))
+    assert os.path.dirname(provider_dir(root, replay_a)) == root
+    assert provider_dir(root, DataProvider()) == os.path.join(root, "dataprovider")
+
+
+def test_replay_never_reads_the_live_fundamentals_cache(live_dirs):
+    assert pipeline.fetch_info('AAA')['longName'] == 'Alpha Corp'   # now in the live cache
+    set_provider(ReplayProvider(str(live_dirs / "empty-recording")))
+    with pytest.raises(RecordingNotFound):
+        pipeline.fetch_info('AAA')
+
+
+def test_recording_reaches_upstream_on_every_call_and_replays_with_latency(live_dirs):
+    live = FakeLive()
+    recordings = str(live_dirs / "rec")
+    set_provider(RecordingProvider(live, recordings))
+    pipeline.fetch_info('AAA')
+    pipeline.fetch_info('AAA')
+    assert live.calls == 2   # not served from a cache, so the recording is complete
+
+    replay = ReplayProvider(recordings, latency=0.05)
+    set_provider(replay)
+    start = time.monotonic()
+    assert pipeline.fetch_info('AAA') == dict(INFO, symbol='AAA')
+    assert pipeline.fetch_info('AAA') == dict(INFO, symbol='AAA')
+    assert time.monotonic() - start >= 0.1   # every call paid the replay latency
+    assert pipeline.get_fundamentals_cache().stats()['entries'] == 0
+
+
+def test_non_live_history_panel_is_in_memory_per_provider(live_dirs):
+    live_store = pipeline._history_store
+    replay = ReplayProvider(str(live_dirs / "rec"))
+    set_provider(replay)
+    store = pipeline.get_history_store()
+    assert store.path is None
+    assert pipeline.get_history_store() is store
+    set_provider(ReplayProvider(str(live_dirs / "rec")))
+    assert pipeline.get_history_store() is not store
+    assert pipeline._history_store is live_store
+
+
+def test_saved_scans_are_kept_per_provider(live_dirs):
+    live_rows = pd.DataFrame({'Ticker': ['AAA'], 'Valuation_Score': [70.0]})
+    incremental_scan.save_scan(live_rows, 'sp500')
+    set_provider(ReplayProvider(str(live_dirs / "rec")))
+    assert incremental_scan.load_scan('sp500') is None
+    incremental_scan.save_scan(live_rows.assign(Valuation_Score=10.0), 'sp500')
+    assert incremental_scan.load_scan('sp500')['Valuation_Score'].iloc[0] == 10.0
+    set_provider(FakeLive())
+    assert incremental_scan.load_scan('sp500')['Valuation_Score'].iloc[0] == 70.0
+
+
+def test_snapshots_of_non_live_providers_stay_out_of_the_live_store(live_dirs):
+    set_provider(ReplayProvider(str(live_dirs / "rec")))
+    scheduler.SnapshotStore().publish('sp500', pd.DataFrame({'Ticker': ['AAA']}))
+    set_provider(FakeLive())
+    assert scheduler.SnapshotStore().latest('sp500') == (None, None)
+
+
+def test_constituents_are_stored_per_provider(live_dirs):
+    live = FakeLive()
+    set_provider(RecordingProvider(live, str(live_dirs / "rec")))
+    constituents.load_constituents('sp500')
+    assert not os.path.exists(os.path.join(constituents.DEFAULT_DIR, "sp500.csv"))
+    set_provider(ReplayProvider(str(live_dirs / "rec")))
+    assert constituents.load_constituents('sp500')['Ticker'].tolist() == ['AAA', 'BBB']
+    assert len(os.listdir(constituents.DEFAULT_DIR)) == 2   # record-<id>/ and replay-<id>/
+
+
+def test_scan_cli_refuses_to_publish_replayed_data(live_dirs, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        scan.main(['--provider', 'replay', '--recordings', str(live_dirs / "rec"), '--publish'])
+    assert exit_info.value.code == 2
+    assert "--publish only publishes live data" in capsys.readouterr().err
+
+
+class QuoteOnly(FakeLive):
+    """Provider whose ``.info`` has no regularMarketPrice; its quote comes from currentPrice"""
+
+    rate_limited = True
+
+    def __init__(self, fail_quote=False):
+        super().__init__()
+        self.fail_quote = fail_quote
+        self.quotes = 0
+
+    def info(self, ticker):
+        self.calls += 1
+        return {'longName': 'Alpha Corp', 'currentPrice': 42.0}
+
+    def quote(self, ticker):
+        self.quotes += 1
+        if self.fail_quote:
+            raise ConnectionError("quote endpoint down")
+        return super().quote(ticker)
+
+
+def test_current_price_comes_from_the_provider_quote_through_the_throttle(live_dirs, monkeypatch):
+    provider = QuoteOnly()
+    set_provider(provider)
+    throttled = []
+    monkeypatch.setattr(pipeline._throttle, 'call', lambda method, *args: throttled.append(method) or method(*args))
+    assert pipeline.fetch_current_price('AAA', {'longName': 'Alpha Corp'}) == 42.0
+    assert provider.quotes == 1 and len(throttled) == 1
+
+
+def test_current_price_falls_back_to_the_info_price_when_the_quote_fails(live_dirs):
+    set_provider(QuoteOnly(fail_quote=True))
+    assert pipeline.fetch_current_price('AAA', INFO) == 12.5
+    assert pipeline.fetch_current_price('AAA', {'longName': 'Alpha Corp'}) is None
@@ -0,0 +1,100 @@
+import os
+
+import pytest
+
+import retrieval
+from retrieval import FrameworkIndex, tokenize
+
+FRAMEWORK_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resources", "framework.txt")
+
+
+@pytest.fixture(scope="module")
+def index():
+    with open(FRAMEWORK_PATH, encoding="utf-8") as f:
+        return FrameworkIndex.build(f.read())
+
+
+@pytest.mark.parametrize('question, section', [
+    ("What is total addressable market?", "Chapter Three"),
+    ("What does P/E mean?", "Chapter Six"),
+    ("How do I evaluate unit economics?", "Chapter Two"),
+    ("What is Net Promoter Score?", "Chapter One"),
+    ("What is the dividend yield?", "Chapter Six"),
+])
+def test_book_questions_are_answered_locally(index, question, section):
+    answer, hits = index.answer(question)
+    assert answer is not None
+    assert hits[0]['section'].startswith(section)
+    assert section in answer
+
+
+@pytest.mark.parametrize('question', [
+    "How is the valuation score calculated?",   # about the app; matched a Net Promoter Score passage
+    "What is the price of Apple?",              # live data; matched an iPhone revenue passage
+    "How do I run a scan in this app?",
+    "Who is the CEO of Tesla?",
+    "Should I buy Tesla stock?",
+    "How are the framework weights used?",
+])
+def test_app_live_data_and_advice_questions_go_remote(index, question):
+    answer, hits = index.answer(question)
+    assert answer is None
+    assert hits   # still handed to the remote model as grounding
+
+
+@pytest.mark.parametrize('question', ["What is risk?", "What is growth?", "What is the market?"])
+def test_weak_matches_go_remote_despite_full_term_coverage(index, question):
+    answer, hits = index.answer(question)
+    assert hits[0]['confidence'] == 1.0
+    assert hits[0]['score'] < retrieval.MIN_SCORE
+    assert answer is None
+
+
+def test_thresholds_are_configurable(index):
+    assert index.answer("What is risk?", min_score=0.0)[0] is not None
+    assert index.answer("What does P/E mean?", threshold=1.01)[0] is None
+
+
+def test_unknown_words_find_nothing(index):
+    assert index.search("xyzzy plugh") == []
+    assert index.answer("xyzzy plugh") == (None, [])
+
+
+def test_tokenize_drops_stopwords_and_plurals():
+    assert tokenize("What do the margins mean for P/E ratios?") == ["margin", "p/e", "ratio"]
+
+
+def test_index_round_trips_through_disk(index, tmp_path):
+    path = str(tmp_path / "index.npz")
+    index.save(path)
+    loaded = FrameworkIndex.load(path)
+    assert loaded.passages == index.passages
+    assert loaded.source_hash == index.source_hash
+    assert (loaded.scores("free cash flow") == index.scores("free cash flow")).all()
+
+
+def test_load_or_build_rebuilds_when_the_source_changes(tmp_path):
+    source, path = tmp_path / "book.txt", str(tmp_path / "index.npz")
+    source.write_text("Chapter One: The Customer\nCustomers love low churn.\n", encoding="utf-8")
+    first = FrameworkIndex.load_or_build(str(source), path)
+    source.write_text("Chapter One: The Customer\nCustomers hate high prices.\n", encoding="utf-8")
+    second = FrameworkIndex.load_or_build(str(source), path)
+    assert first.source_hash != second.source_hash
+    assert "prices" in second.passages[0]
+
+
+def test_default_index_path_is_anchored_on_the_module():
+    if os.getenv("FRAMEWORK_INDEX_PATH"):
+        pytest.skip("FRAMEWORK_INDEX_PATH overrides the default")
+    assert os.path.isabs(retrieval.INDEX_PATH)
+    assert os.path.dirname(os.path.dirname(retrieval.INDEX_PATH)) == os.path.dirname(os.path.abspath(retrieval.__file__))
+
+
+def test_save_writes_through_a_per_process_temp_file(index, tmp_path, monkeypatch):
+    path = str(tmp_path / "index.npz")
+    written = []
+    real_replace = os.replace
+    monkeypatch.setattr(retrieval.os, 'replace', lambda src, dst: (written.append(src), real_replace(src, dst)))
+    index.save(path)
+    assert written == [f"{path}.{os.getpid()}.tmp.npz"]
+    assert os.listdir(tmp_path) == ["index.npz"]
@@ -0,0 +1,336 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipeline import fetch_stock_data, score_factors_auto
+from scoring import (FRAMEWORK_FACTORS, NORMALIZATIONS, VALUATION_METRICS, VALUATION_WEIGHTS, Leaderboard,
+                     WeightTuner, calculate_valuation_score, combine_subscores, framework_factors, framework_scores,
+                     score_valuation_frame, top_positions, valuation_subscores)
+
+NAN = np.nan
+
+
+def rowwise(df):
+    """The reference: calculate_valuation_score applied row by row"""
+    return df.apply(calculate_valuation_score, axis=1).to_numpy(dtype=float)
+
+
+def row(**values):
+    return dict(dict.fromkeys(VALUATION_METRICS, NAN), **values)
+
+
+def random_fundamentals(n, seed=0, missing=0.2):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'PE_Ratio': rng.lognormal(3.0, 0.6, n) * rng.choice([1, -1], n, p=[0.85, 0.15]),
+        'PB_Ratio': rng.normal(2.0, 2.0, n),
+        'PS_Ratio': rng.lognormal(1.0, 0.9, n),
+        'ROE': rng.normal(15, 15, n),
+        'Profit_Margin': rng.normal(10, 12, n),
+        'Dividend_Yield': np.where(rng.random(n) < 0.4, 0.0, rng.gamma(2.0, 1.2, n)),
+    })
+    for col in VALUATION_METRICS:
+        df.loc[rng.random(n) < missing, col] = NAN
+    return df
+
+
+def test_matches_rowwise_on_random_fundamentals():
+    df = random_fundamentals(2000)
+    assert np.array_equal(score_valuation_frame(df).to_numpy(), rowwise(df))
+
+
+@pytest.mark.parametrize('values', [
+    row(),                                                     # every metric missing
+    dict.fromkeys(VALUATION_METRICS, 0.0),                     # every metric zero
+    dict.fromkeys(VALUATION_METRICS, -3.0),                    # every metric negative
+    row(ROE=12.0),                                             # a single metric present
+    row(Dividend_Yield=8.0),
+    dict(dict.fromkeys(VALUATION_METRICS, -1.0), PB_Ratio=0.5),
+    row(PE_Ratio=0.0, PB_Ratio=-2.0, PS_Ratio=1.5, ROE=NAN, Profit_Margin=40.0),
+    row(PE_Ratio=500.0, PB_Ratio=50.0, PS_Ratio=30.0),        # sub-scores clipped at 0
+    row(ROE=90.0, Profit_Margin=60.0, Dividend_Yield=12.0),    # sub-scores clipped at 100
+    dict(PE_Ratio=15.0, PB_Ratio=2.0, PS_Ratio=3.0, ROE=18.0, Profit_Margin=12.0, Dividend_Yield=2.5),
+], ids=['all-nan', 'all-zero', 'all-negative', 'roe-only', 'dividend-only', 'pb-only',
+        'mixed', 'clip-low', 'clip-high', 'complete'])
+def test_matches_rowwise_on_edge_cases(values):
+    df = pd.DataFrame([values])
+    assert np.array_equal(score_valuation_frame(df).to_numpy(), rowwise(df))
+
+
+def test_no_usable_metric_scores_zero():
+    df = pd.DataFrame([row(), dict.fromkeys(VALUATION_METRICS, 0.0), dict.fromkeys(VALUATION_METRICS, -1.0)])
+    assert score_valuation_frame(df).tolist() == [0.0, 0.0, 0.0]
+
+
+def test_none_values_from_yahoo_count_as_missing():
+    df = pd.DataFrame([row(PE_Ratio=None, PB_Ratio=1.5, ROE=None), row(PE_Ratio=12.0, Dividend_Yield=None)],
+                      dtype=object)
+    assert np.array_equal(score_valuation_frame(df).to_numpy(), rowwise(df))
+
+
+def test_missing_columns_score_like_all_nan_columns():
+    df = random_fundamentals(200, seed=1)
+    partial = df.drop(columns=['PS_Ratio', 'Dividend_Yield'])
+    expected = rowwise(partial.reindex(columns=list(VALUATION_METRICS)))
+    assert np.array_equal(score_valuation_frame(partial).to_numpy(), expected)
+
+
+def test_empty_frame():
+    scores = score_valuation_frame(pd.DataFrame(columns=list(VALUATION_METRICS)))
+    assert len(scores) == 0
+
+
+def test_keeps_index_and_name():
+    df = random_fundamentals(5).set_axis(list('abcde'))
+    scores = score_valuation_frame(df)
+    assert list(scores.index) == list('abcde')
+    assert scores.name == 'Valuation_Score'
+
+
+def test_weights_as_dict_or_sequence():
+    df = random_fundamentals(300, seed=2)
+    as_sequence = [VALUATION_WEIGHTS[m] for m in VALUATION_METRICS]
+    assert np.array_equal(score_valuation_frame(df, VALUATION_WEIGHTS), score_valuation_frame(df))
+    assert np.array_equal(score_valuation_frame(df, as_sequence), score_valuation_frame(df))
+
+
+def test_scaling_the_weights_does_not_change_scores():
+    df = random_fundamentals(300, seed=3)
+    doubled = {m: 2 * w for m, w in VALUATION_WEIGHTS.items()}
+    assert np.allclose(score_valuation_frame(df, doubled), score_valuation_frame(df), rtol=0, atol=1e-12)
+
+
+def test_custom_weights_renormalize_over_present_metrics():
+    sub = np.array([[80.0, NAN, 40.0, NAN, NAN, NAN]])
+    weights = [1.0, 5.0, 3.0, 0.0, 0.0, 0.0]
+    assert combine_subscores(sub, weights)[0] == pytest.approx((80 * 1 + 40 * 3) / 4)
+
+
+def test_zero_weight_metric_is_ignored():
+    df = pd.DataFrame([row(PE_Ratio=15.0, ROE=10.0)])
+    weights = dict(VALUATION_WEIGHTS, ROE=0.0)
+    assert score_valuation_frame(df, weights).iloc[0] == pytest.approx(90.0)
+
+
+def test_wrong_weight_length_raises():
+    with pytest.raises(ValueError):
+        score_valuation_frame(random_fundamentals(3), [0.5, 0.5])
+
+
+def scan_stream(n, seed=0):
+    """Rows as a scan delivers them, one dict per ticker"""
+    df = random_fundamentals(n, seed=seed)
+    df.insert(0, 'Ticker', [f"T{i:04d}" for i in range(n)])
+    return df
+
+
+def expected_top(df, n):
+    scored = df.assign(Valuation_Score=score_valuation_frame(df))
+    return scored[scored['Valuation_Score'] > 0].nlargest(n, 'Valuation_Score', keep='first')
+
+
+@pytest.mark.parametrize('n', [1, 10, 50])
+def test_leaderboard_matches_nlargest(n):
+    df = scan_stream(1000, seed=7)
+    board = Leaderboard(n)
+    for record in df.to_dict('records'):
+        board.add(record)
+    top = board.frame()
+    expected = expected_top(df, n)
+    assert top['Ticker'].tolist() == expected['Ticker'].tolist()
+    np.testing.assert_array_equal(top['Valuation_Score'], expected['Valuation_Score'])
+    assert board.seen == 1000
+
+
+def test_leaderboard_skips_rows_without_a_usable_metric():
+    board = Leaderboard(5)
+    for ticker, values in [('NONE', row()), ('ZERO', dict.fromkeys(VALUATION_METRICS, 0.0)),
+                           ('NEG', dict.fromkeys(VALUATION_METRICS, -1.0)), ('OK', row(ROE=12.0))]:
+        board.add(dict(values, Ticker=ticker))
+    assert board.frame()['Ticker'].tolist() == ['OK']
+    assert len(board) == 1 and board.seen == 4
+
+
+def test_leaderboard_ties_keep_the_first_seen_row():
+    board = Leaderboard(2)
+    for ticker in ('A', 'B', 'C'):
+        board.add(row(Ticker=ticker, ROE=12.0))
+    board.add(row(Ticker='D', ROE=15.0))
+    assert board.frame()['Ticker'].tolist() == ['D', 'A']
+
+
+def test_leaderboard_update_replaces_an_existing_ticker():
+    board = Leaderboard(3)
+    for ticker, roe in [('A', 10.0), ('B', 12.0), ('C', 14.0), ('D', 16.0)]:
+        board.add(row(Ticker=ticker, ROE=roe))
+    assert board.frame()['Ticker'].tolist() == ['D', 'C', 'B']
+    board.update(row(Ticker='B', ROE=30.0))                  # refetched with a better score
+    assert board.frame()['Ticker'].tolist() == ['B', 'D', 'C']
+    board.update(row(Ticker='D', ROE=NAN))                   # refetched with nothing usable
+    assert board.frame()['Ticker'].tolist() == ['B', 'C']
+    board.update(row(Ticker='C', ROE=30.0))                  # ties with B again: B arrived first
+    assert board.frame()['Ticker'].tolist() == ['B', 'C']
+    assert board.seen == 4
+
+
+def test_leaderboard_update_of_a_new_ticker_adds_it():
+    board = Leaderboard(3)
+    board.update(row(Ticker='A', ROE=12.0))
+    assert board.frame()['Ticker'].tolist() == ['A'] and board.seen == 1
+
+
+def test_subscores_nan_where_metric_unusable():
+    sub = valuation_subscores(pd.DataFrame([row(PE_Ratio=-5.0, PB_Ratio=0.0, PS_Ratio=2.0)]))
+    assert np.isnan(sub[0, [0, 1, 3, 4, 5]]).all()
+    assert sub[0, 2] == pytest.approx(85.0)
+
+
+# --------------------------
+# Six-factor framework: analyzer vs scan parity
+# --------------------------
+
+INFO_KEYS = ('grossMargins', 'operatingMargins', 'revenueGrowth', 'priceToBook', 'beta', 'trailingPE')
+
+
+def analyzer_reference(info):
+    """The analyzer's original formula: ``value or default`` into fixed bands, for keys that are present"""
+    def band(value, low, high):
+        return max(0, min(100, (value - low) / (high - low) * 100))
+
+    return {
+        'Customer_Value': band(info['grossMargins'] or 0.3, 0.1, 0.7),
+        'Unit_Economics': band(info['operatingMargins'] or 0.2, 0.05, 0.4),
+        'TAM': band(info['revenueGrowth'] or 0.1, -0.1, 0.3),
+        'Competition': 100 - band(info['priceToBook'] or 5, 1, 15),
+        'Risks': 100 - band(info['beta'] or 1.2, 0.5, 2.5),
+        'Valuation_Score': 100 - band(info['trailingPE'] or 30, 5, 60),
+    }
+
+
+def random_infos(n, seed=0):
+    rng = np.random.default_rng(seed)
+    infos = []
+    for _ in range(n):
+        info = {
+            'longName': 'Test Corp',
+            'grossMargins': rng.uniform(-0.2, 0.9),
+            'operatingMargins': rng.uniform(-0.3, 0.6),
+            'revenueGrowth': rng.uniform(-0.3, 0.6),
+            'priceToBook': rng.uniform(-2, 25),
+            'beta': rng.uniform(-0.5, 3.0),
+            'trailingPE': rng.uniform(-20, 90),
+        }
+        for key in INFO_KEYS:
+            draw = rng.random()
+            if draw < 0.15:
+                info[key] = None
+            elif draw < 0.3:
+                info[key] = 0
+        infos.append(info)
+    return infos
+
+
+def scan_factors(infos):
+    """Factor scores the way a universe scan computes them: fetch_stock_data rows, one frame"""
+    return framework_factors(pd.DataFrame([fetch_stock_data('T', info) for info in infos]))
+
+
+@pytest.mark.parametrize('info, factor, expected', [
+    ({'grossMargins': 0}, 'Customer_Value', 33.3),
+    ({'trailingPE': None}, 'Valuation_Score', 54.5),
+    ({'operatingMargins': None}, 'Unit_Economics', 42.9),
+    ({'beta': 0}, 'Risks', 65.0),
+    ({'priceToBook': None}, 'Competition', 71.4),
+    ({'revenueGrowth': 0}, 'TAM', 50.0),
+])
+def test_zero_or_none_inputs_fall_back_to_the_analyzer_defaults(info, factor, expected):
+    info = dict(info, longName='Test Corp')
+    assert score_factors_auto('T', info)[factor] == expected
+    assert scan_factors([info])[factor].iloc[0] == pytest.approx(expected, abs=0.05)
+
+
+def test_analyzer_matches_its_original_formula():
+    for info in random_infos(300, seed=4):
+        expected = analyzer_reference(info)
+        got = score_factors_auto('T', info)
+        assert got == pytest.approx({k: round(v, 1) for k, v in expected.items()}, abs=1e-9)
+
+
+def test_scan_and_analyzer_agree_on_every_ticker():
+    infos = random_infos(500, seed=5)
+    scan = scan_factors(infos)
+    for i, info in enumerate(infos):
+        assert score_factors_auto('T', info) == {f: round(float(v), 1) for f, v in scan.iloc[i].items()}
+
+
+def test_missing_keys_score_like_none():
+    bare = {'longName': 'Test Corp'}
+    assert score_factors_auto('T', bare) == score_factors_auto('T', dict(bare, **dict.fromkeys(INFO_KEYS)))
+
+
+def test_estimated_beta_fills_a_missing_reported_beta():
+    info = {'longName': 'Test Corp', 'beta': None}
+    assert score_factors_auto('T', info, beta_estimate=2.5)['Risks'] == 0.0
+    assert score_factors_auto('T', dict(info, beta=0.5), beta_estimate=2.5)['Risks'] == 100.0
+
+
+def test_framework_score_is_the_weighted_sum_of_factors():
+    weights = dict(zip(FRAMEWORK_FACTORS, [0.1, 0.2, 0.1, 0.2, 0.1, 0.3]))
+    df = pd.DataFrame([fetch_stock_data('T', info) for info in random_infos(50, seed=6)])
+    scores = framework_scores(df, weights)
+    np.testing.assert_allclose(scores['Framework_Score'], framework_factors(df).to_numpy() @ list(weights.values()))
+
+
+@pytest.mark.parametrize('normalization', ['percentile', 'sector'])
+def test_ranking_modes_score_missing_values_neutral(normalization):
+    df = pd.DataFrame({'Gross_Margin': [10.0, 50.0, NAN], 'PE_Ratio': [5.0, 40.0, 20.0], 'Sector': 'Tech'})
+    factors = framework_factors(df, normalization)
+    assert factors['Customer_Value'].tolist() == [0.0, 100.0, 50.0]
+    assert factors['Valuation_Score'].tolist() == [100.0, 0.0, 50.0]
+
+
+# --------------------------
+# What-if weight tuning: cached matrices vs rescoring the frame
+# --------------------------
+
+def tuning_frame(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return random_fundamentals(n, seed=seed).assign(
+        Gross_Margin=rng.uniform(10, 70, n), Operating_Margin=rng.normal(15, 10, n),
+        Revenue_Growth=rng.normal(8, 12, n), Beta=rng.uniform(0.4, 2.2, n),
+        Sector=rng.choice(['Tech', 'Energy', 'Industrials'], n))
+
+
+def random_weights(rng, names):
+    return dict(zip(names, rng.uniform(0, 1, len(names))))
+
+
+@pytest.mark.parametrize('normalization', NORMALIZATIONS)
+def test_tuner_matches_rescoring_the_frame(normalization):
+    df = tuning_frame(1000, seed=8)
+    tuner = WeightTuner(df, dict(zip(FRAMEWORK_FACTORS, [1 / 6] * 6)), normalization)
+    rng = np.random.default_rng(9)
+    np.testing.assert_allclose(tuner.valuation_scores(), score_valuation_frame(df), rtol=0, atol=1e-9)
+    for _ in range(5):
+        w = random_weights(rng, VALUATION_METRICS)
+        np.testing.assert_allclose(tuner.valuation_scores(w), score_valuation_frame(df, w), rtol=0, atol=1e-9)
+        fw = random_weights(rng, FRAMEWORK_FACTORS)
+        total = sum(fw.values())
+        expected = framework_scores(df, {k: v / total for k, v in fw.items()}, normalization)['Framework_Score']
+        np.testing.assert_allclose(tuner.framework_scores(fw), expected, rtol=0, atol=1e-9)
+
+
+def test_tuner_scores_zero_when_every_weight_is_zero():
+    tuner = WeightTuner(tuning_frame(50), dict.fromkeys(FRAMEWORK_FACTORS, 1.0))
+    assert not tuner.valuation_scores(dict.fromkeys(VALUATION_METRICS, 0.0)).any()
+    assert not tuner.framework_scores(dict.fromkeys(FRAMEWORK_FACTORS, 0.0)).any()
+
+
+def test_default_ranks_and_top_positions_follow_a_stable_sort():
+    df = tuning_frame(500, seed=10)
+    tuner = WeightTuner(df, dict.fromkeys(FRAMEWORK_FACTORS, 1.0))
+    scores = tuner.scores('Valuation_Score', VALUATION_WEIGHTS)
+    order = np.argsort(-scores, kind='stable')
+    assert top_positions(scores, 10).tolist() == order[:10].tolist()
+    assert tuner.default_ranks('Valuation_Score')[order].tolist() == list(range(1, 501))
+    assert len(top_positions(scores[:3], 10)) == 3 and len(top_positions(scores[:0], 10)) == 0
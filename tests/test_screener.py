@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from screener import NUMERIC_FIELDS, ScreenerIndex, parse_query
+
+NAN = np.nan
+SECTORS = ['Energy', 'Industrials', 'Technology', 'Health Care']
+
+
+def scan_frame(n, seed=0, missing=0.15):
+    """A scan-shaped frame with NaN gaps, repeated values (for ties) and a Sector column"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({field: rng.integers(0, 40, n).astype(float) for field in NUMERIC_FIELDS})
+    df['Market_Cap'] = rng.choice([5e8, 2e9, 1e10, 3e11, 2e12], n)
+    for field in NUMERIC_FIELDS:
+        df.loc[rng.random(n) < missing, field] = NAN
+    df.insert(0, 'Ticker', [f"T{i:04d}" for i in range(n)])
+    df['Sector'] = rng.choice(SECTORS, n)
+    return df
+
+
+@pytest.fixture
+def small():
+    return ScreenerIndex(pd.DataFrame({
+        'Ticker': ['A', 'B', 'C', 'D', 'E'],
+        'Sector': ['Energy', 'energy ', 'Technology', 'Industrials', 'Energy'],
+        'PE_Ratio': [10.0, NAN, 25.0, 15.0, 10.0],
+        'Market_Cap': [5e8, 2e10, 3e12, 1.5e6, NAN],
+    }))
+
+
+def tickers(index, query, sort_by=None, ascending=True):
+    return index.df['Ticker'].iloc[index.positions(query, sort_by, ascending)].tolist()
+
+
+@pytest.mark.parametrize('text, value', [('10k', 1e4), ('1.5M', 1.5e6), ('10B', 1e10), ('3t', 3e12), ('2.5e3', 2500.0),
+                                         ('-4', -4.0), ('.5', 0.5)])
+def test_number_suffixes(text, value):
+    assert parse_query(f"Market_Cap >= {text}") == [('Market_Cap', '>=', value)]
+
+
+def test_parses_joined_conditions_and_quoted_strings():
+    assert parse_query("PE_Ratio<15 AND Sector == 'Energy' && ROE>=20 & Sector != \"Health Care\"") == [
+        ('PE_Ratio', '<', 15.0), ('Sector', '==', 'Energy'), ('ROE', '>=', 20.0), ('Sector', '!=', 'Health Care')]
+    assert parse_query("   ") == []
+
+
+@pytest.mark.parametrize('query', ["PE_Ratio < ", "PE_Ratio ~ 15", "PE_Ratio < 15 or ROE > 20",
+                                   "PE_Ratio < 15 ROE > 20", "< 15", "PE_Ratio < 15x", "Sector == 'Energy",
+                                   "PE_Ratio < 15 and"])
+def test_malformed_queries_raise(query):
+    with pytest.raises(ValueError):
+        parse_query(query)
+
+
+def test_suffixed_numbers_filter_market_cap(small):
+    assert tickers(small, "Market_Cap > 10B") == ['B', 'C']
+    assert tickers(small, "Market_Cap <= 1.5M") == ['D']
+
+
+def test_not_equal_excludes_rows_without_a_value(small):
+    assert tickers(small, "PE_Ratio != 10") == ['C', 'D']
+    assert tickers(small, "Market_Cap != 0") == ['A', 'B', 'C', 'D']
+
+
+def test_sector_matches_case_and_whitespace_insensitively(small):
+    assert tickers(small, "Sector == 'ENERGY'") == ['A', 'B', 'E']
+    assert tickers(small, "sector != 'energy'") == ['C', 'D']
+    assert tickers(small, "Sector == 'Utilities'") == []
+
+
+def test_sort_puts_rows_without_a_value_last(small):
+    assert tickers(small, "", 'PE_Ratio') == ['A', 'E', 'D', 'C', 'B']
+    assert tickers(small, "", 'PE_Ratio', ascending=False) == ['C', 'D', 'E', 'A', 'B']
+    assert tickers(small, "Sector == 'energy'", 'Market_Cap', ascending=False) == ['B', 'A', 'E']
+
+
+@pytest.mark.parametrize('query, message', [
+    ("Volume > 5", "unknown field"),
+    ("Sector < 'Energy'", "only supports == and !="),
+    ("PE_Ratio < 'cheap'", "needs a number"),
+])
+def test_invalid_conditions_raise(small, query, message):
+    with pytest.raises(ValueError, match=message):
+        small.positions(query)
+
+
+def test_unknown_operator_and_sort_field_raise(small):
+    with pytest.raises(ValueError, match="unsupported operator"):
+        small._mask('PE_Ratio', '=~', 1.0)
+    with pytest.raises(ValueError, match="cannot sort"):
+        small.positions("", 'Sector')
+
+
+def random_conditions(rng, k):
+    conditions = []
+    for _ in range(k):
+        if rng.random() < 0.25:
+            conditions.append(('Sector', str(rng.choice(['==', '!='])), str(rng.choice(SECTORS))))
+        else:
+            field = str(rng.choice(NUMERIC_FIELDS))
+            value = float(rng.choice([5e8, 1e10, 2e12])) if field == 'Market_Cap' else float(rng.integers(0, 40))
+            conditions.append((field, str(rng.choice(['<', '<=', '>', '>=', '==', '!='])), value))
+    return conditions
+
+
+def pandas_query(conditions):
+    """The same filter for DataFrame.query; ``!=`` there keeps NaN rows, so they are excluded explicitly"""
+    parts = []
+    for field, op, value in conditions:
+        parts.append(f"{field} {op} {value!r}")
+        if op == '!=' and field != 'Sector':
+            parts.append(f"{field} == {field}")
+    return " and ".join(parts)
+
+
+def test_matches_dataframe_query_on_random_frames():
+    df = scan_frame(2000, seed=1)
+    index = ScreenerIndex(df)
+    rng = np.random.default_rng(2)
+    for _ in range(200):
+        conditions = random_conditions(rng, int(rng.integers(1, 4)))
+        expected = df.query(pandas_query(conditions)).index.to_numpy()
+        np.testing.assert_array_equal(index.positions(conditions), expected)
+        text = " and ".join(f"{f} {op} {v!r}" for f, op, v in conditions)
+        np.testing.assert_array_equal(index.positions(text), expected)
+
+
+@pytest.mark.parametrize('ascending', [True, False])
+def test_sorted_matches_follow_the_metric(ascending):
+    df = scan_frame(500, seed=3)
+    index = ScreenerIndex(df)
+    positions = index.positions("Sector == 'Energy' and ROE >= 5", 'PE_Ratio', ascending)
+    expected = df.query("Sector == 'Energy' and ROE >= 5")
+    assert sorted(positions) == expected.index.tolist()
+    ordered = df['PE_Ratio'].to_numpy()[positions]
+    present = ordered[~np.isnan(ordered)]
+    assert np.isnan(ordered[len(present):]).all()
+    assert np.array_equal(present, np.sort(present) if ascending else np.sort(present)[::-1])
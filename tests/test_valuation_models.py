@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from valuation_models import (DEFAULT_GROWTHS, DEFAULT_RATES, DEFAULT_TERMINAL_GROWTH, DEFAULT_YEARS,
+                              capm_rate_grid, scenario_grid, two_stage_factor, valuation_bands)
+
+
+def brute_force_factor(r, g, years=DEFAULT_YEARS, terminal_growth=DEFAULT_TERMINAL_GROWTH):
+    """Two-stage present value of 1 unit of cash flow, one year at a time"""
+    if r <= terminal_growth:
+        return np.nan
+    value, flow = 0.0, 1.0
+    for year in range(1, years + 1):
+        flow *= 1 + g
+        value += flow / (1 + r) ** year
+    return value + flow * (1 + terminal_growth) / (r - terminal_growth) / (1 + r) ** years
+
+
+def brute_force_grid(rates, growths, years=DEFAULT_YEARS, terminal_growth=DEFAULT_TERMINAL_GROWTH):
+    rates = np.asarray(rates, dtype=float)
+    out = np.empty(rates.shape + (len(growths),))
+    for idx in np.ndindex(rates.shape):
+        for k, g in enumerate(growths):
+            out[idx + (k,)] = brute_force_factor(rates[idx], g, years, terminal_growth)
+    return out
+
+
+def test_shared_grid_matches_brute_force():
+    factor = two_stage_factor(DEFAULT_RATES, DEFAULT_GROWTHS)
+    assert factor.shape == (len(DEFAULT_RATES), len(DEFAULT_GROWTHS))
+    np.testing.assert_allclose(factor, brute_force_grid(DEFAULT_RATES, DEFAULT_GROWTHS), rtol=1e-12)
+
+
+def test_single_known_value():
+    assert two_stage_factor([[0.06]], [0.03])[0, 0, 0] == pytest.approx(29.96, abs=0.005)
+
+
+def test_per_ticker_grid_matches_one_dimensional_calls():
+    rates = capm_rate_grid([0.06, 0.09, np.nan, 0.045])
+    factor = two_stage_factor(rates, DEFAULT_GROWTHS)
+    assert factor.shape == rates.shape + (len(DEFAULT_GROWTHS),)
+    for i, row_rates in enumerate(rates):
+        np.testing.assert_allclose(factor[i], two_stage_factor(row_rates, DEFAULT_GROWTHS), rtol=1e-12)
+    np.testing.assert_allclose(factor, brute_force_grid(rates, DEFAULT_GROWTHS), rtol=1e-12)
+
+
+@pytest.mark.parametrize('growths, years', [((0.02, 0.08), 5), ((0.0, 0.03, 0.06), 10), (DEFAULT_GROWTHS, 3)])
+def test_growth_count_independent_of_years(growths, years):
+    rates = np.array([[0.05, 0.07, 0.09], [0.06, 0.08, 0.10]])
+    factor = two_stage_factor(rates, growths, years)
+    assert factor.shape == (2, 3, len(growths))
+    np.testing.assert_allclose(factor, brute_force_grid(rates, growths, years), rtol=1e-12)
+
+
+def test_nan_where_rate_does_not_exceed_terminal_growth():
+    factor = two_stage_factor([0.02, DEFAULT_TERMINAL_GROWTH, 0.05], DEFAULT_GROWTHS)
+    assert np.isnan(factor[:2]).all()
+    assert np.isfinite(factor[2]).all()
+
+
+def test_capm_bands_use_each_tickers_rates():
+    df = pd.DataFrame({'Current_Price': [100.0], 'Dividend_Rate': [0.0], 'FCF': [4e9],
+                       'Shares_Outstanding': [1e9], 'Total_Cash': [0.0], 'Total_Debt': [0.0]})
+    rates = capm_rate_grid([0.06])
+    bands = valuation_bands(df, rates=rates)
+    expected = 4.0 * brute_force_grid(rates[0], DEFAULT_GROWTHS)
+    assert bands['DCF_Low'].iloc[0] == pytest.approx(np.nanmin(expected))
+    assert bands['DCF_High'].iloc[0] == pytest.approx(np.nanmax(expected))
+    assert bands['DCF_Mid'].iloc[0] == pytest.approx(np.nanmedian(expected))
+    assert np.isnan(bands['DDM_Mid'].iloc[0])   # no dividend
+
+
+def test_scenario_grid_shapes_for_shared_and_per_ticker_rates():
+    df = pd.DataFrame({'Current_Price': [50.0, 80.0], 'Dividend_Rate': [2.0, 1.0], 'FCF': [1e9, 2e9],
+                       'Shares_Outstanding': [1e8, 2e8], 'Total_Cash': [1e9, 0.0], 'Total_Debt': [0.0, 5e8]})
+    ddm, dcf = scenario_grid(df, growths=(0.01, 0.04))
+    assert ddm.shape == dcf.shape == (2, len(DEFAULT_RATES), 2)
+    per_ticker = capm_rate_grid([0.07, 0.05])
+    ddm2, _ = scenario_grid(df, rates=per_ticker, growths=(0.01, 0.04))
+    np.testing.assert_allclose(ddm2[1], 1.0 * brute_force_grid(per_ticker[1], (0.01, 0.04)), rtol=1e-12)
@@ -0,0 +1,210 @@
+import os
+import threading
+import time
+
+from fetch_engine import untimed
+
+# --------------------------
+# Upstream throttle (rate limiter + circuit breaker)
+# --------------------------
+# Every Yahoo request in the process goes through one Throttle, so scans,
+# the background scheduler and every Streamlit session share a single
+# request budget. The token bucket adapts with AIMD: each success adds a
+# little rate, each 429/timeout halves it. Consecutive throttling errors
+# open a circuit breaker that fails calls fast until a cooldown passes,
+# then lets one probe through. Counters feed the app's sidebar and the CLI.
+# Waiting for a token is not counted against fetch_many's per-attempt
+# timeout, so a cut rate never turns queued attempts into abandoned ones.
+
+INITIAL_RATE = float(os.getenv("YAHOO_RATE", "8"))      # requests per second
+MIN_RATE = 0.5
+MAX_RATE = float(os.getenv("YAHOO_MAX_RATE", "40"))
+BURST = 16
+ADDITIVE_STEP = 0.5        # req/s added per success
+BACKOFF_FACTOR = 0.5       # rate multiplier per throttling event
+BACKOFF_INTERVAL = 1.0     # at most one rate cut per interval (concurrent 429s are one event)
+FAILURE_THRESHOLD = 5      # consecutive throttling errors that open the breaker
+COOLDOWN = 30.0            # seconds the breaker stays open, doubled on a failed probe
+MAX_COOLDOWN = 300.0
+
+THROTTLE_MARKERS = ("429", "too many requests", "rate limit", "ratelimit", "timed out", "timeout")
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling upstream while the breaker is open"""
+
+
+def is_throttle_error(exc):
+    """True for rate-limit responses and timeouts (yfinance surfaces these in several shapes)"""
+    if isinstance(exc, TimeoutError):
+        return True
+    text = f"{type(exc).__name__} {exc}".lower()
+    return any(marker in text for marker in THROTTLE_MARKERS)
+
+
+class AdaptiveRateLimiter:
+    """Thread-safe token bucket whose rate follows AIMD on observed outcomes"""
+
+    def __init__(self, rate=INITIAL_RATE, burst=BURST, min_rate=MIN_RATE, max_rate=MAX_RATE, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._last_cut = float("-inf")
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout=None):
+        """Take one token, sleeping as needed; returns seconds waited (None on timeout)"""
+        start = self._clock()
+        slept = False
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return now - start if slept else 0.0
+                wait = (1 - self._tokens) / self.rate
+            if timeout is not None and now + wait - start > timeout:
+                return None
+            time.sleep(wait)
+            slept = True
+
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + ADDITIVE_STEP)
+
+    def on_throttle(self):
+        with self._lock:
+            now = self._clock()
+            if now - self._last_cut >= BACKOFF_INTERVAL:
+                self.rate = max(self.min_rate, self.rate * BACKOFF_FACTOR)
+                self._tokens = min(self._tokens, 0.0)
+                self._last_cut = now
+
+
+class CircuitBreaker:
+    """closed -> open after consecutive failures -> half-open probe after a cooldown"""
+
+    def __init__(self, threshold=FAILURE_THRESHOLD, cooldown=COOLDOWN, max_cooldown=MAX_COOLDOWN,
+                 clock=time.monotonic):
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._clock = clock
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and self._clock() - self._opened_at >= self.cooldown:
+                self.state = "half-open"
+            if self.state == "half-open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def remaining(self):
+        """Seconds until the breaker lets a probe through (0 when closed)"""
+        with self._lock:
+            if self.state == "closed":
+                return 0.0
+            return max(0.0, self.cooldown - (self._clock() - self._opened_at))
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self._failures = 0
+            self._probing = False
+            self.cooldown = self.base_cooldown
+
+    def record_failure(self):
+        with self._lock:
+            if self.state == "half-open":
+                self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+                self._open()
+                return
+            self._failures += 1
+            if self._failures >= self.threshold:
+                self._open()
+
+    def _open(self):
+        self.state = "open"
+        self._opened_at = self._clock()
+        self._probing = False
+
+
+class Throttle:
+    """Rate limiter + circuit breaker + counters around every upstream call"""
+
+    def __init__(self, limiter=None, breaker=None):
+        self.limiter = limiter or AdaptiveRateLimiter()
+        self.breaker = breaker or CircuitBreaker()
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(
+            ('requests', 'succeeded', 'failed', 'throttled', 'delayed', 'short_circuited', 'retried', 'dropped'), 0)
+        self.wait_time = 0.0
+
+    def count(self, name, n=1):
+        with self._lock:
+            self._counters[name] += n
+
+    def call(self, fn, *args, **kwargs):
+        """Call ``fn`` under the shared budget; raises CircuitOpenError while the breaker is open"""
+        if not self.breaker.allow():
+            self.count('short_circuited')
+            raise CircuitOpenError(f"upstream circuit open, retry in {self.breaker.remaining():.0f}s")
+        with untimed():
+            waited = self.limiter.acquire()
+        with self._lock:
+            self._counters['requests'] += 1
+            if waited:
+                self._counters['delayed'] += 1
+                self.wait_time += waited
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            if is_throttle_error(e):
+                self.count('throttled')
+                self.limiter.on_throttle()
+                self.breaker.record_failure()
+            else:
+                self.count('failed')
+                self.breaker.record_success()   # upstream answered; the request itself was bad
+            raise
+        self.count('succeeded')
+        self.limiter.on_success()
+        self.breaker.record_success()
+        return result
+
+    def wrap(self, fn):
+        """``fn`` with every call routed through this throttle"""
+        def throttled(*args, **kwargs):
+            return self.call(fn, *args, **kwargs)
+        throttled.__name__ = getattr(fn, '__name__', 'throttled')
+        return throttled
+
+    def wait_for_circuit(self, max_wait):
+        """Sleep until the breaker would admit a probe, at most ``max_wait`` seconds"""
+        time.sleep(min(max_wait, self.breaker.remaining()))
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats['wait_time'] = self.wait_time
+        stats['rate'] = self.limiter.rate
+        stats['circuit'] = self.breaker.state
+        return stats
@@ -0,0 +1,44 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+# --------------------------
+# Single-fetch ticker snapshot
+# --------------------------
+# One analysis click used to build yf.Ticker(...) three times (price, history,
+# factor scores). A snapshot fetches .info and price history once, in
+# parallel, and every downstream consumer reads from it.
+
+
+class TickerSnapshot:
+    """Info dict and price history for one ticker, fetched once and shared"""
+
+    def __init__(self, ticker, info=None, history=None, info_error=None, history_error=None):
+        self.ticker = ticker
+        self.info = info or {}
+        self.history = history if history is not None else pd.DataFrame()
+        self.info_error = info_error
+        self.history_error = history_error
+
+    @classmethod
+    def fetch(cls, ticker, period, info_loader, history_loader):
+        """Fetch info and history concurrently
+
+        ``info_loader(ticker)`` returns the .info dict and
+        ``history_loader(ticker, period)`` returns an OHLCV DataFrame.
+        Errors are recorded on the snapshot instead of raised so one failed
+        half does not discard the other.
+        """
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            info_future = pool.submit(info_loader, ticker)
+            history_future = pool.submit(history_loader, ticker, period)
+        info, info_error = _result(info_future)
+        history, history_error = _result(history_future)
+        return cls(ticker, info, history, info_error, history_error)
+
+
+def _result(future):
+    try:
+        return future.result(), None
+    except Exception as e:
+        return None, e
@@ -0,0 +1,112 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+# --------------------------
+# DCF / DDM scenario grid
+# --------------------------
+# Intrinsic value per share under a grid of required returns and growth
+# rates, for every ticker at once. Both models are two-stage: cash flows
+# grow at g for ``years`` years, then at ``terminal_growth`` forever, all
+# discounted at r. The value is linear in the starting cash flow, so the
+# whole (tickers x rates x growth) grid is one broadcast multiply.
+
+DEFAULT_RATES = (0.04, 0.05, 0.06, 0.07, 0.08)     # required return, per the framework's 4-8% range
+DEFAULT_GROWTHS = (0.00, 0.03, 0.06, 0.09, 0.12)   # stage-one growth
+DEFAULT_YEARS = 5
+DEFAULT_TERMINAL_GROWTH = 0.025
+RATE_OFFSETS = (-0.01, -0.005, 0.0, 0.005, 0.01)   # scenario spread around a CAPM required return
+
+VALUATION_INPUTS = ('Current_Price', 'Dividend_Rate', 'FCF', 'Shares_Outstanding', 'Total_Cash', 'Total_Debt')
+
+
+def two_stage_factor(rates, growths, years=DEFAULT_YEARS, terminal_growth=DEFAULT_TERMINAL_GROWTH):
+    """Present value of 1 unit of current cash flow, shape rates.shape + (len(growths),)
+
+    ``rates`` is 1-D for a shared grid or (n_tickers, n_rates) for per-ticker
+    rates. NaN where the required return does not exceed the terminal
+    growth rate.
+    """
+    r = np.asarray(rates, dtype=float)[..., None, None]
+    g = np.asarray(growths, dtype=float)[:, None]
+    t = np.arange(1, years + 1, dtype=float)
+    stage_one = (((1 + g) / (1 + r)) ** t).sum(axis=-1)   # over the years, whatever the rate grid's rank
+    r, g = r[..., 0], g[..., 0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terminal = (1 + g) ** years * (1 + terminal_growth) / ((r - terminal_growth) * (1 + r) ** years)
+    return np.where(r > terminal_growth, stage_one + terminal, np.nan)
+
+
+def _per_share(df):
+    cols = df.reindex(columns=list(VALUATION_INPUTS)).apply(pd.to_numeric, errors='coerce')
+    shares = cols['Shares_Outstanding'].to_numpy(dtype=float)
+    shares = np.where(shares > 0, shares, np.nan)
+    dividend = cols['Dividend_Rate'].to_numpy(dtype=float)
+    fcf = cols['FCF'].to_numpy(dtype=float) / shares
+    net_cash = (cols['Total_Cash'].fillna(0).to_numpy(dtype=float)
+                - cols['Total_Debt'].fillna(0).to_numpy(dtype=float)) / shares
+    return (np.where(dividend > 0, dividend, np.nan),
+            np.where(fcf > 0, fcf, np.nan),
+            np.nan_to_num(net_cash),
+            cols['Current_Price'].to_numpy(dtype=float))
+
+
+def scenario_grid(df, rates=DEFAULT_RATES, growths=DEFAULT_GROWTHS, years=DEFAULT_YEARS,
+                  terminal_growth=DEFAULT_TERMINAL_GROWTH):
+    """DDM and DCF values per share for every row and scenario
+
+    Returns ``(ddm, dcf)``, each of shape (len(df), n_rates, len(growths)).
+    ``rates`` is a shared 1-D grid or a (len(df), n_rates) per-ticker grid
+    (see capm_rate_grid). DDM starts from the annual dividend (Dividend_Rate); DCF starts from
+    free cash flow per share and adds net cash per share. Rows without a
+    positive dividend / free cash flow are NaN.
+    """
+    factor = two_stage_factor(rates, growths, years, terminal_growth)
+    if factor.ndim == 2:
+        factor = factor[None]
+    dividend, fcf, net_cash, _ = _per_share(df)
+    ddm = dividend[:, None, None] * factor
+    dcf = fcf[:, None, None] * factor + net_cash[:, None, None]
+    return ddm, dcf
+
+
+def capm_rate_grid(required_returns, offsets=RATE_OFFSETS, fallback=DEFAULT_RATES):
+    """Per-ticker discount-rate grid centred on each CAPM required return
+
+    Rows without a required return fall back to the shared default grid.
+    """
+    required = np.asarray(required_returns, dtype=float)[:, None]
+    grid = required + np.asarray(offsets, dtype=float)[None, :]
+    fallback = np.broadcast_to(np.asarray(fallback, dtype=float), grid.shape)
+    return np.where(np.isfinite(required), grid, fallback)
+
+
+def valuation_bands(df, rates=DEFAULT_RATES, growths=DEFAULT_GROWTHS, years=DEFAULT_YEARS,
+                    terminal_growth=DEFAULT_TERMINAL_GROWTH):
+    """Low / median / high intrinsic value across the grid, with upside vs market price
+
+    Returns a DataFrame indexed like ``df`` with DCF_Low, DCF_Mid, DCF_High,
+    DDM_Low, DDM_Mid, DDM_High and DCF_Upside (DCF_Mid / price - 1, in %).
+    """
+    ddm, dcf = scenario_grid(df, rates, growths, years, terminal_growth)
+    price = _per_share(df)[3]
+    n = len(df)
+    out = {}
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # all-NaN rows lack the model's inputs
+        for name, grid in (('DCF', dcf.reshape(n, -1)), ('DDM', ddm.reshape(n, -1))):
+            out[f'{name}_Low'] = np.nanmin(grid, axis=1)
+            out[f'{name}_Mid'] = np.nanmedian(grid, axis=1)
+            out[f'{name}_High'] = np.nanmax(grid, axis=1)
+        out['DCF_Upside'] = (out['DCF_Mid'] / np.where(price > 0, price, np.nan) - 1) * 100
+    return pd.DataFrame(out, index=df.index)
+
+
+def scenario_table(row, model='DCF', rates=DEFAULT_RATES, growths=DEFAULT_GROWTHS, years=DEFAULT_YEARS,
+                   terminal_growth=DEFAULT_TERMINAL_GROWTH):
+    """Rates x growth grid of one model for a single row (Series or dict), as a labelled DataFrame"""
+    ddm, dcf = scenario_grid(pd.DataFrame([dict(row)]), rates, growths, years, terminal_growth)
+    grid = (dcf if model == 'DCF' else ddm)[0]
+    return pd.DataFrame(grid, index=[f"r={r:.1%}" for r in rates], columns=[f"g={g:.1%}" for g in growths])
+